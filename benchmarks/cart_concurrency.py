@@ -0,0 +1,113 @@
+"""
+Параллельные изменения одной позиции корзины.
+
+Много корутин, каждая в своей сессии и транзакции, добавляют одну и ту же
+позицию в корзину пользователя, затем одновременно выставляют количество.
+Проверяется, что ни один запрос не упал на uq_cart_item_unique, сумма
+добавлений не потерялась, а итоговое количество — одно из выставленных.
+
+Работает с БД из настроек приложения (.env) и меняет корзину указанного
+пользователя: позиция удаляется до и после прогона.
+
+Запуск:
+    python benchmarks/cart_concurrency.py --user-id 1 --product-id P1 --variant-id V1
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import select
+
+from leaf_flow.infrastructure.db.models.cart import CartItem
+from leaf_flow.infrastructure.db.repositories.cart import (
+    CartReaderRepository, CartWriterRepository
+)
+from leaf_flow.infrastructure.db.repositories.product import ProductRepository
+from leaf_flow.infrastructure.db.session import AsyncSessionLocal
+
+
+async def timed(call) -> tuple[float, Exception | None]:
+    started = time.perf_counter()
+    try:
+        async with AsyncSessionLocal() as session:
+            await call(CartWriterRepository(session))
+            await session.commit()
+    except Exception as e:
+        return (time.perf_counter() - started) * 1000, e
+    return (time.perf_counter() - started) * 1000, None
+
+
+def report(title: str, results: list[tuple[float, Exception | None]]) -> None:
+    timings = sorted(timing for timing, _ in results)
+    errors = [error for _, error in results if error is not None]
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(
+        f"{title:<14} {len(results):>6} {len(errors):>7} "
+        f"{statistics.median(timings):>9.2f} {p95:>9.2f}"
+    )
+    for error in errors[:3]:
+        print(f"    {type(error).__name__}: {error}")
+
+
+async def quantity(cart_id: int, product_id: str, variant_id: str) -> int | None:
+    async with AsyncSessionLocal() as session:
+        return await session.scalar(
+            select(CartItem.quantity).where(
+                CartItem.cart_id == cart_id,
+                CartItem.product_id == product_id,
+                CartItem.variant_id == variant_id,
+            )
+        )
+
+
+async def main(user_id: int, product_id: str, variant_id: str, workers: int) -> None:
+    async with AsyncSessionLocal() as session:
+        variant = await ProductRepository(session).get_for_product_variant(
+            product_id, variant_id
+        )
+        if variant is None:
+            raise SystemExit("variant not found or inactive")
+        cart = await CartReaderRepository(session).get_cart_by_user(user_id)
+        writer = CartWriterRepository(session)
+        if cart is None:
+            cart = await writer.create_cart(user_id)
+        await writer.remove_item(cart.id, product_id, variant_id)
+        await session.commit()
+
+    print(f"{'operation':<14} {'calls':>6} {'errors':>7} {'p50, ms':>9} {'p95, ms':>9}")
+
+    adds = await asyncio.gather(*(
+        timed(lambda w: w.upsert_item(cart.id, product_id, variant_id, 1, variant.price))
+        for _ in range(workers)
+    ))
+    report("upsert_item", adds)
+    added = await quantity(cart.id, product_id, variant_id)
+    succeeded = sum(1 for _, error in adds if error is None)
+    print(f"quantity after adds: {added} (expected {succeeded})")
+
+    values = range(1, workers + 1)
+    sets = await asyncio.gather(*(
+        timed(lambda w, value=value: w.set_quantity(cart.id, product_id, variant_id, value))
+        for value in values
+    ))
+    report("set_quantity", sets)
+    final = await quantity(cart.id, product_id, variant_id)
+    print(f"quantity after sets: {final} (one of 1..{workers}: {final in values})")
+
+    removes = await asyncio.gather(*(
+        timed(lambda w: w.remove_item(cart.id, product_id, variant_id))
+        for _ in range(workers)
+    ))
+    report("remove_item", removes)
+    print(f"removed: {await quantity(cart.id, product_id, variant_id) is None}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--user-id", type=int, required=True)
+    parser.add_argument("--product-id", required=True)
+    parser.add_argument("--variant-id", required=True)
+    parser.add_argument("--workers", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.user_id, args.product_id, args.variant_id, args.workers))
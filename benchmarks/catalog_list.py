@@ -0,0 +1,63 @@
+"""
+Сравнение реализаций списка продуктов: orm (selectinload), json_agg и core.
+
+Работает с БД из настроек приложения (.env), данные не меняет.
+
+Запуск:
+    python benchmarks/catalog_list.py --rounds 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from leaf_flow.application.dto.catalog import ProductListQuery
+from leaf_flow.infrastructure.db.repositories.product import ProductRepository
+from leaf_flow.infrastructure.db.repositories.product_json import ProductJsonAggRepository
+from leaf_flow.infrastructure.db.repositories.product_core import ProductCoreRepository
+from leaf_flow.infrastructure.db.session import AsyncSessionLocal
+
+REPOSITORIES: dict[str, type[ProductRepository]] = {
+    "orm": ProductRepository,
+    "json_agg": ProductJsonAggRepository,
+    "core": ProductCoreRepository,
+}
+
+QUERIES = {
+    "first page + total": ProductListQuery(limit=20),
+    "offset 100 + total": ProductListQuery(limit=20, offset=100),
+    "page of 100, no total": ProductListQuery(limit=100, with_total=False),
+    "search + relevance": ProductListQuery(search="чай", sort="relevance", limit=20),
+}
+
+
+async def measure(
+    repository: type[ProductRepository],
+    query: ProductListQuery,
+    rounds: int,
+) -> list[float]:
+    timings: list[float] = []
+    async with AsyncSessionLocal() as session:
+        repo = repository(session)
+        await repo.get_list_products(query)  # прогрев соединения и кэша планов
+        for _ in range(rounds):
+            session.expunge_all()
+            started = time.perf_counter()
+            await repo.get_list_products(query)
+            timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+async def main(rounds: int) -> None:
+    print(f"{'query':<24} {'reader':<10} {'p50, ms':>9} {'p95, ms':>9}")
+    for title, query in QUERIES.items():
+        for name, repository in REPOSITORIES.items():
+            timings = sorted(await measure(repository, query, rounds))
+            p95 = timings[int(len(timings) * 0.95) - 1]
+            print(f"{title:<24} {name:<10} {statistics.median(timings):>9.2f} {p95:>9.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=100)
+    asyncio.run(main(parser.parse_args().rounds))
@@ -0,0 +1,159 @@
+"""
+Поиск по каталогу: полнотекстовый (search_vector + pg_trgm) против прежнего ILIKE.
+
+Для каждого размера каталога в сессии создаётся временная таблица products
+(LIKE products INCLUDING ALL — с генерируемым search_vector и индексами),
+которая перекрывает настоящую, и заполняется синтетическими продуктами.
+Транзакция откатывается: данные БД не меняются. Нужна БД из настроек
+приложения (.env) с расширением pg_trgm.
+
+Замеряется то, чем отличаются пути: счётчик и первая страница по названию
+с фильтром поиска.
+
+Запуск:
+    python benchmarks/catalog_search.py --sizes 1000 10000 100000 --rounds 50
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import ColumnElement, Integer, String, bindparam, func, or_, select, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from leaf_flow.infrastructure.db.models.product import Product
+from leaf_flow.infrastructure.db.repositories.product import _search_condition
+from leaf_flow.infrastructure.db.session import AsyncSessionLocal
+
+NAMES = [
+    "Улун", "Пуэр", "Сенча", "Габа", "Матча", "Ройбуш",
+    "Те Гуань Инь", "Да Хун Пао", "Лапсанг", "Ассам", "Дарджилинг", "Бай Хао",
+]
+QUALIFIERS = [
+    "молочный", "выдержанный", "горный", "дикий", "весенний",
+    "осенний", "копчёный", "цветочный", "медовый",
+]
+TAGS = ["зелёный", "чёрный", "белый", "красный", "шу", "шэн", "травяной"]
+DESCRIPTION = (
+    "Листья собраны вручную на плантациях высокогорья и бережно обработаны. "
+    "Настой прозрачный, с долгим послевкусием и нотами сухофруктов, мёда и "
+    "цветов. Заваривать водой 85–95 °C, первые проливы короткие. "
+) * 4
+
+# (название, поисковая строка) — строка приводится к нижнему регистру, как в API
+SEARCHES = [
+    ("word", "пуэр"),
+    ("word form", "выдержанного"),
+    ("two words", "молочный улун"),
+    ("tag", "шэн"),
+    ("description", "послевкусием"),
+    ("typo", "дарджилин"),
+]
+
+_FILL = text(
+    """
+    INSERT INTO products (
+        id, name, description, category_slug, tags, image, product_type_code
+    )
+    SELECT
+        'bench-' || i,
+        (:names)[1 + i % cardinality(:names)] || ' '
+            || (:qualifiers)[1 + (i / 7) % cardinality(:qualifiers)] || ' №' || i,
+        :description,
+        'bench',
+        ARRAY[(:tags)[1 + (i / 3) % cardinality(:tags)]],
+        'bench.jpg',
+        'bench'
+    FROM generate_series(1, :size) AS i
+    """
+).bindparams(
+    bindparam("names", type_=ARRAY(String)),
+    bindparam("qualifiers", type_=ARRAY(String)),
+    bindparam("tags", type_=ARRAY(String)),
+    bindparam("description", type_=String),
+    bindparam("size", type_=Integer),
+)
+
+
+def _ilike_condition(search: str) -> ColumnElement[bool]:
+    """Фильтр поиска до перехода на полнотекстовый индекс."""
+    pattern = f"%{search}%"
+    return or_(
+        Product.name.ilike(pattern),
+        Product.description.ilike(pattern),
+        Product.tags.contains([search]),
+    )
+
+
+CONDITIONS = {
+    "fts": _search_condition,
+    "ilike": _ilike_condition,
+}
+
+
+async def fill(session: AsyncSession, size: int) -> None:
+    await session.execute(text("DROP TABLE IF EXISTS pg_temp.products"))
+    # Временная таблица в pg_temp находится раньше public: запросы модели
+    # Product идут в неё. Внешние ключи LIKE не копирует
+    await session.execute(text("CREATE TEMP TABLE products (LIKE public.products INCLUDING ALL)"))
+    await session.execute(
+        _FILL,
+        {
+            "names": NAMES,
+            "qualifiers": QUALIFIERS,
+            "tags": TAGS,
+            "description": DESCRIPTION,
+            "size": size,
+        },
+    )
+    await session.execute(text("ANALYZE pg_temp.products"))
+
+
+async def measure(
+    session: AsyncSession,
+    condition: ColumnElement[bool],
+    rounds: int,
+) -> tuple[list[float], int]:
+    total_stmt = select(func.count()).select_from(Product).where(condition)
+    page_stmt = (
+        select(Product.id, Product.name)
+        .where(condition)
+        .order_by(Product.name, Product.id)
+        .limit(20)
+    )
+    total = await session.scalar(total_stmt)  # прогрев кэша планов
+    timings: list[float] = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        await session.scalar(total_stmt)
+        await session.execute(page_stmt)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings, total or 0
+
+
+async def main(sizes: list[int], rounds: int) -> None:
+    print(f"{'products':>9} {'search':<12} {'path':<6} {'found':>7} {'p50, ms':>9} {'p95, ms':>9}")
+    async with AsyncSessionLocal() as session:
+        try:
+            for size in sizes:
+                await fill(session, size)
+                for title, search in SEARCHES:
+                    for name, condition in CONDITIONS.items():
+                        timings, found = await measure(session, condition(search), rounds)
+                        timings.sort()
+                        p95 = timings[int(len(timings) * 0.95) - 1]
+                        print(
+                            f"{size:>9} {title:<12} {name:<6} {found:>7} "
+                            f"{statistics.median(timings):>9.2f} {p95:>9.2f}"
+                        )
+        finally:
+            await session.rollback()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.rounds))
@@ -0,0 +1,375 @@
+"""
+Стоимость маппинга одной сущности: ORM-объекты против строк-кортежей.
+
+Без флага --db сравниваются только мапперы на синтетических данных:
+инструментированные модели против строк (namedtuple, как Row по доступу
+к полям). С --db — полные пути чтения репозиториев orm и core на БД
+из настроек приложения (.env), данные не меняются.
+
+Запуск:
+    python benchmarks/mappers.py --rounds 2000
+    python benchmarks/mappers.py --db --rounds 200 --user-id 1
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from collections import namedtuple
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Awaitable, Callable
+
+from leaf_flow.application.dto.catalog import ProductListQuery
+from leaf_flow.infrastructure.db.mappers.cart import (
+    map_cart_items_to_entities, map_cart_item_rows_to_detail
+)
+from leaf_flow.infrastructure.db.mappers.order import (
+    map_order_model_to_entity, map_order_row_to_entity
+)
+from leaf_flow.infrastructure.db.mappers.product import (
+    map_product_model_to_entity, map_product_detail_model_to_entity
+)
+from leaf_flow.infrastructure.db.mappers.product_rows import (
+    map_variant_row_to_entity,
+    map_image_rows_to_entities,
+    map_brew_profile_row_to_entity,
+    map_attribute_rows_to_entities,
+    map_product_row_to_entity,
+    map_product_detail_row_to_entity
+)
+from leaf_flow.infrastructure.db.models.cart import CartItem
+from leaf_flow.infrastructure.db.models.order import (
+    Order, OrderItem, DeliveryMethodEnum, OrderStatusEnum
+)
+from leaf_flow.infrastructure.db.models.product import (
+    Product, ProductVariant, ProductImage, ProductImageVariant, ProductBrewProfile,
+    ProductAttribute, ProductAttributeValue, AttributeKind, UIHint, ImageVariant, ImageFormat
+)
+
+NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+VARIANTS, IMAGES, IMAGE_VARIANTS, BREW_PROFILES, ATTRIBUTES, VALUES = 3, 3, 4, 2, 4, 2
+CART_ITEMS, ORDER_ITEMS = 10, 5
+
+ProductRow = namedtuple(
+    "ProductRow",
+    "id name description category_slug tags image product_type_code "
+    "is_active created_at updated_at sort_order min_price max_price",
+)
+VariantRow = namedtuple(
+    "VariantRow",
+    "id product_id weight price is_active created_at updated_at sort_order",
+)
+ImageRow = namedtuple(
+    "ImageRow",
+    "id product_id title image_url is_active sort_order "
+    "variant_id variant format storage_key width height byte_size",
+)
+BrewProfileRow = namedtuple(
+    "BrewProfileRow",
+    "id product_id method teaware temperature brew_time weight note "
+    "sort_order is_active created_at updated_at",
+)
+AttributeRow = namedtuple(
+    "AttributeRow",
+    "product_id id attribute_id name slug sort_order is_active attribute_code "
+    "attribute_name attribute_description attribute_sort_order attribute_is_active "
+    "attribute_created_at attribute_kind attribute_ui_hint",
+)
+CartItemRow = namedtuple(
+    "CartItemRow",
+    "product_id variant_id quantity price product_name image variant_weight",
+)
+OrderRow = namedtuple(
+    "OrderRow",
+    "id customer_name phone user_id delivery total address comment status created_at",
+)
+OrderItemRow = namedtuple(
+    "OrderItemRow",
+    "order_id product_id variant_id quantity price total product_name image variant_weight",
+)
+
+
+def _variant_model(pid: str, n: int) -> ProductVariant:
+    return ProductVariant(
+        id=f"{pid}-v{n}", product_id=pid, weight=f"{n * 50} г", price=Decimal("450.00"),
+        is_active=True, created_at=NOW, updated_at=NOW, sort_order=n,
+    )
+
+
+def _image_models(pid: str) -> list[ProductImage]:
+    return [
+        ProductImage(
+            id=n, product_id=pid, title="фото", image_url=None, is_active=True, sort_order=n,
+            variants=[
+                ProductImageVariant(
+                    id=n * 10 + k, product_image_id=n, variant=ImageVariant.md,
+                    format=ImageFormat.webp, storage_key=f"{pid}/{n}/{k}.webp",
+                    width=800, height=800, byte_size=40_000,
+                )
+                for k in range(IMAGE_VARIANTS)
+            ],
+        )
+        for n in range(IMAGES)
+    ]
+
+
+def product_model(pid: str) -> Product:
+    attributes = [
+        ProductAttribute(
+            id=a, code=f"attr{a}", name="Атрибут", description="", sort_order=a,
+            is_active=True, created_at=NOW, kind=AttributeKind.single, ui_hint=UIHint.chips,
+        )
+        for a in range(ATTRIBUTES)
+    ]
+    values = [
+        ProductAttributeValue(
+            id=a * 10 + n, attribute_id=a, attribute=attribute, name="Значение",
+            slug=f"value{n}", sort_order=n, is_active=True,
+        )
+        for a, attribute in enumerate(attributes)
+        for n in range(VALUES)
+    ]
+    return Product(
+        id=pid, name="Да Хун Пао", description="Утёсный улун", category_slug="oolong",
+        tags=["утёсный", "улун"], image="p.jpg", product_type_code="tea",
+        is_active=True, created_at=NOW, updated_at=NOW, sort_order=0,
+        min_price=Decimal("450.00"), max_price=Decimal("1350.00"),
+        variants=[_variant_model(pid, n) for n in range(VARIANTS)],
+        images=_image_models(pid),
+        brew_profiles=[
+            ProductBrewProfile(
+                id=n, product_id=pid, method="гунфу", teaware="гайвань",
+                temperature="95°C", brew_time="10 с", weight="7 г", note=None,
+                sort_order=n, is_active=True, created_at=NOW, updated_at=NOW,
+            )
+            for n in range(BREW_PROFILES)
+        ],
+        attribute_values=values,
+    )
+
+
+def product_rows(pid: str) -> dict[str, Any]:
+    return {
+        "product": ProductRow(
+            pid, "Да Хун Пао", "Утёсный улун", "oolong", ["утёсный", "улун"], "p.jpg",
+            "tea", True, NOW, NOW, 0, Decimal("450.00"), Decimal("1350.00"),
+        ),
+        "variants": [
+            VariantRow(f"{pid}-v{n}", pid, f"{n * 50} г", Decimal("450.00"), True, NOW, NOW, n)
+            for n in range(VARIANTS)
+        ],
+        "images": [
+            ImageRow(
+                n, pid, "фото", None, True, n, n * 10 + k, ImageVariant.md,
+                ImageFormat.webp, f"{pid}/{n}/{k}.webp", 800, 800, 40_000,
+            )
+            for n in range(IMAGES)
+            for k in range(IMAGE_VARIANTS)
+        ],
+        "brew_profiles": [
+            BrewProfileRow(
+                n, pid, "гунфу", "гайвань", "95°C", "10 с", "7 г", None, n, True, NOW, NOW
+            )
+            for n in range(BREW_PROFILES)
+        ],
+        "attributes": [
+            AttributeRow(
+                pid, a * 10 + n, a, "Значение", f"value{n}", n, True, f"attr{a}",
+                "Атрибут", "", a, True, NOW, AttributeKind.single, UIHint.chips,
+            )
+            for a in range(ATTRIBUTES)
+            for n in range(VALUES)
+        ],
+    }
+
+
+def map_list_rows(rows: dict[str, Any]):
+    return map_product_row_to_entity(
+        rows["product"],
+        [map_variant_row_to_entity(v) for v in rows["variants"]],
+        map_image_rows_to_entities(rows["images"]),
+    )
+
+
+def map_detail_rows(rows: dict[str, Any]):
+    return map_product_detail_row_to_entity(
+        rows["product"],
+        [map_variant_row_to_entity(v) for v in rows["variants"]],
+        [map_brew_profile_row_to_entity(p) for p in rows["brew_profiles"]],
+        map_attribute_rows_to_entities(rows["attributes"]),
+        map_image_rows_to_entities(rows["images"]),
+    )
+
+
+def cart_models() -> list[CartItem]:
+    items = []
+    for n in range(CART_ITEMS):
+        product = product_model(f"p{n}")
+        items.append(
+            CartItem(
+                id=n, cart_id=1, product_id=product.id, variant_id=product.variants[0].id,
+                quantity=2, price=Decimal("450.00"), product=product, variant=product.variants[0],
+            )
+        )
+    return items
+
+
+def cart_rows() -> tuple[list[CartItemRow], dict[str, list[ImageRow]]]:
+    rows = [
+        CartItemRow(f"p{n}", f"p{n}-v0", 2, Decimal("450.00"), "Да Хун Пао", "p.jpg", "0 г")
+        for n in range(CART_ITEMS)
+    ]
+    return rows, {f"p{n}": product_rows(f"p{n}")["images"] for n in range(CART_ITEMS)}
+
+
+def map_cart_rows(rows: list[CartItemRow], image_rows: dict[str, list[ImageRow]]):
+    # изображения маппятся вместе с позициями, как в load_images
+    images = {pid: map_image_rows_to_entities(group) for pid, group in image_rows.items()}
+    return map_cart_item_rows_to_detail(rows, images)
+
+
+def order_model() -> Order:
+    products = [product_model(f"p{n}") for n in range(ORDER_ITEMS)]
+    return Order(
+        id="LF-1", customer_name="Иван", phone="+79990000000", user_id=1,
+        delivery=DeliveryMethodEnum.courier, total=Decimal("4500.00"), address="Москва",
+        comment=None, status=OrderStatusEnum.created, created_at=NOW,
+        items=[
+            OrderItem(
+                id=n, order_id="LF-1", product_id=p.id, variant_id=p.variants[0].id,
+                quantity=2, price=Decimal("450.00"), total=Decimal("900.00"),
+                product=p, variant=p.variants[0],
+            )
+            for n, p in enumerate(products)
+        ],
+    )
+
+
+def order_rows() -> tuple[OrderRow, list[OrderItemRow]]:
+    return (
+        OrderRow(
+            "LF-1", "Иван", "+79990000000", 1, DeliveryMethodEnum.courier,
+            Decimal("4500.00"), "Москва", None, OrderStatusEnum.created, NOW,
+        ),
+        [
+            OrderItemRow(
+                "LF-1", f"p{n}", f"p{n}-v0", 2, Decimal("450.00"), Decimal("900.00"),
+                "Да Хун Пао", "p.jpg", "0 г",
+            )
+            for n in range(ORDER_ITEMS)
+        ],
+    )
+
+
+def per_call_us(fn: Callable[[], Any], rounds: int) -> float:
+    fn()
+    started = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - started) / rounds * 1_000_000
+
+
+def run_mappers(rounds: int) -> None:
+    product, rows = product_model("p0"), product_rows("p0")
+    cart, (cart_item_rows, cart_image_rows) = cart_models(), cart_rows()
+    order, (order_row, order_item_rows) = order_model(), order_rows()
+
+    cases = {
+        "product (list)": (
+            lambda: map_product_model_to_entity(product),
+            lambda: map_list_rows(rows),
+            1,
+        ),
+        "product (detail)": (
+            lambda: map_product_detail_model_to_entity(product),
+            lambda: map_detail_rows(rows),
+            1,
+        ),
+        "cart item": (
+            lambda: map_cart_items_to_entities(cart),
+            lambda: map_cart_rows(cart_item_rows, cart_image_rows),
+            CART_ITEMS,
+        ),
+        "order": (
+            lambda: map_order_model_to_entity(order),
+            lambda: map_order_row_to_entity(order_row, order_item_rows),
+            1,
+        ),
+    }
+
+    print(f"{'entity':<18} {'orm, µs':>9} {'rows, µs':>9} {'speedup':>8}")
+    for title, (orm, core, entities) in cases.items():
+        orm_us = per_call_us(orm, rounds) / entities
+        core_us = per_call_us(core, rounds) / entities
+        print(f"{title:<18} {orm_us:>9.2f} {core_us:>9.2f} {orm_us / core_us:>7.1f}x")
+
+
+async def run_db(rounds: int, user_id: int | None) -> None:
+    from leaf_flow.infrastructure.db.repositories.cart import CartReaderRepository
+    from leaf_flow.infrastructure.db.repositories.cart_core import CartCoreReaderRepository
+    from leaf_flow.infrastructure.db.repositories.order import OrderReaderRepository
+    from leaf_flow.infrastructure.db.repositories.order_core import OrderCoreReaderRepository
+    from leaf_flow.infrastructure.db.repositories.product import ProductRepository
+    from leaf_flow.infrastructure.db.repositories.product_core import ProductCoreRepository
+    from leaf_flow.infrastructure.db.session import AsyncSessionLocal
+
+    query = ProductListQuery(limit=50, with_total=False)
+    async with AsyncSessionLocal() as session:
+        page = await ProductRepository(session).get_list_products(query)
+        product_ids = [product.id for product in page.items]
+
+    async def measure(
+        read: Callable[[Any], Awaitable[int]],
+        repository: type,
+    ) -> float:
+        timings: list[float] = []
+        async with AsyncSessionLocal() as session:
+            repo = repository(session)
+            await read(repo)  # прогрев соединения и кэша планов
+            for _ in range(rounds):
+                session.expunge_all()
+                started = time.perf_counter()
+                entities = await read(repo)
+                timings.append((time.perf_counter() - started) * 1_000_000 / max(entities, 1))
+        return statistics.median(timings)
+
+    async def product_list(repo) -> int:
+        return len((await repo.get_list_products(query)).items)
+
+    async def product_details(repo) -> int:
+        return len(await repo.get_details(product_ids))
+
+    async def cart_items(repo) -> int:
+        return len((await repo.get_cart_items_by_user(user_id)).items)
+
+    async def orders(repo) -> int:
+        return len(await repo.list_orders_by_user(user_id, 20, 0))
+
+    cases = [
+        ("product (list)", product_list, ProductRepository, ProductCoreRepository),
+        ("product (detail)", product_details, ProductRepository, ProductCoreRepository),
+    ]
+    if user_id is not None:
+        cases += [
+            ("cart item", cart_items, CartReaderRepository, CartCoreReaderRepository),
+            ("order", orders, OrderReaderRepository, OrderCoreReaderRepository),
+        ]
+
+    print(f"{'entity':<18} {'orm, µs':>9} {'core, µs':>9} {'speedup':>8}")
+    for title, read, orm, core in cases:
+        orm_us = await measure(read, orm)
+        core_us = await measure(read, core)
+        print(f"{title:<18} {orm_us:>9.1f} {core_us:>9.1f} {orm_us / core_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=1000)
+    parser.add_argument("--db", action="store_true", help="читать через репозитории из БД")
+    parser.add_argument("--user-id", type=int, help="пользователь для корзины и заказов")
+    args = parser.parse_args()
+
+    if args.db:
+        asyncio.run(run_db(args.rounds, args.user_id))
+    else:
+        run_mappers(args.rounds)
@@ -14,6 +14,9 @@ from leaf_flow.infrastructure.db.models.order import Order, OrderStatusEnum, Del
 from leaf_flow.infrastructure.db.models.cart import Cart, CartItem  # noqa: F401
 from leaf_flow.infrastructure.db.models.review import ExternalReview, PlatformEnum  # noqa: F401
 from leaf_flow.infrastructure.db.models.outbox import OutboxMessage, OutboxEventType  # noqa: F401
+from leaf_flow.infrastructure.db.models.catalog import (  # noqa: F401
+    CatalogProductDocument, CatalogChange, ProductSimilarity, ProductPair, ProductStats
+)
 
 config = context.config
 
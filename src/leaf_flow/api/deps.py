@@ -1,8 +1,16 @@
-from fastapi import Depends, Header, HTTPException, Security, status, Request
+import math
+
+from fastapi import Depends, Header, HTTPException, Query, Security, status, Request
 from typing import Annotated, Optional
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from redis import Redis
 
+from leaf_flow.application.ports.catalog_cache import CatalogCache
+from leaf_flow.application.ports.catalog_index import SuggestIndex
+from leaf_flow.application.ports.popularity import PopularityCounters
+from leaf_flow.infrastructure.cache.catalog import catalog_cache
+from leaf_flow.infrastructure.cache.popularity import popularity_counters
+from leaf_flow.infrastructure.catalog.suggest import suggest_index
 from leaf_flow.infrastructure.db.admin_uow import AdminUoW, get_admin_uow
 from leaf_flow.infrastructure.db.uow import UoW, get_uow
 from leaf_flow.infrastructure.externals.s3.storage import S3ObjectStorage
@@ -35,6 +43,91 @@ def get_celery():
     return celery_client
 
 
+def get_catalog_cache() -> CatalogCache:
+    return catalog_cache
+
+
+def get_suggest_index() -> SuggestIndex:
+    return suggest_index
+
+
+def get_popularity_counters() -> PopularityCounters:
+    return popularity_counters
+
+
+def get_visitor_id(
+    request: Request,
+    authorization: Annotated[Optional[str], Header(alias="Authorization")] = None,
+) -> str:
+    """
+    Идентификатор посетителя для уникальных счётчиков.
+
+    Пользователь по sub токена (без запроса в БД), аноним — по IP клиента
+    из X-Real-IP (его выставляет nginx, клиент подделать не может).
+    """
+    if authorization and authorization.lower().startswith("bearer "):
+        try:
+            sub = decode_access_token(authorization.split(" ", 1)[1]).get("sub")
+        except Exception:
+            sub = None
+        if sub:
+            return f"u:{sub}"
+    real_ip = request.headers.get("X-Real-IP")
+    if real_ip:
+        return f"ip:{real_ip.strip()}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+# Client Hints, от которых зависит выбор варианта изображения (для Vary)
+IMAGE_HINT_HEADERS = "Sec-CH-Width, Width, Sec-CH-DPR, DPR"
+# Сырые параметры ширины: в ключ кэша идёт итог get_image_width, а не они
+IMAGE_HINT_PARAMS = frozenset({"imageWidth", "dpr"})
+_IMAGE_WIDTH_STEP = 64
+_IMAGE_WIDTH_MAX = 4096
+
+
+def _hint(request: Request, *names: str) -> float | None:
+    for name in names:
+        raw = request.headers.get(name)
+        if raw:
+            try:
+                value = float(raw)
+            except ValueError:
+                return None
+            return value if 0 < value < math.inf else None
+    return None
+
+
+def get_image_width(
+    request: Request,
+    image_width: int | None = Query(
+        None,
+        alias="imageWidth",
+        ge=1,
+        le=_IMAGE_WIDTH_MAX,
+        description=(
+            "Ширина изображения на экране в CSS-пикселях: вернуть один подходящий "
+            "вариант на изображение (вместо всех) и srcset"
+        ),
+    ),
+    dpr: float | None = Query(None, gt=0, le=4, description="Плотность пикселей экрана"),
+) -> int | None:
+    """
+    Нужная ширина варианта в физических пикселях или None (все варианты).
+
+    imageWidth умножается на dpr (или заголовок Sec-CH-DPR/DPR);
+    заголовок Sec-CH-Width/Width уже в физических пикселях.
+    Ширина округляется вверх до 64 px, чтобы близкие ширины делили кэш.
+    """
+    if image_width is not None:
+        width = image_width * (dpr or _hint(request, "Sec-CH-DPR", "DPR") or 1.0)
+    else:
+        width = _hint(request, "Sec-CH-Width", "Width")
+    if width is None:
+        return None
+    return min(math.ceil(width / _IMAGE_WIDTH_STEP) * _IMAGE_WIDTH_STEP, _IMAGE_WIDTH_MAX)
+
+
 async def get_current_user(
     authorization: Annotated[Optional[str],
     Header(alias="Authorization")] = None,
@@ -0,0 +1,45 @@
+"""
+Разреженные наборы полей ответа: ?fields=id,name,min_price.
+
+Имена — поля верхнего уровня схемы ответа (для списков — схемы элемента).
+Сериализуются только перечисленные поля; по набору же решается,
+какие колонки и связи читать из БД (например, без images не грузятся изображения).
+"""
+from pydantic import BaseModel
+
+FIELDS_DESCRIPTION = "Поля ответа через запятую; по умолчанию — все"
+
+
+def parse_fields(raw: str | None, schema: type[BaseModel]) -> frozenset[str] | None:
+    """
+    Набор полей из query-параметра; None — все поля.
+
+    Raises:
+        ValueError: INVALID_FIELDS, если набор пуст или в нём есть поле не из схемы.
+    """
+    if raw is None:
+        return None
+    fields = frozenset(name.strip() for name in raw.split(",") if name.strip())
+    if not fields or not fields <= schema.model_fields.keys():
+        raise ValueError("INVALID_FIELDS")
+    return fields
+
+
+def include_items(envelope: type[BaseModel], fields: frozenset[str] | None) -> dict | None:
+    """include для model_dump: поля конверта списка целиком, элементов items — по fields."""
+    if fields is None:
+        return None
+    return {
+        **{name: True for name in envelope.model_fields if name != "items"},
+        "items": {"__all__": set(fields)},
+    }
+
+
+def source_names(schema: type[BaseModel], fields: frozenset[str] | None) -> tuple[str, ...] | None:
+    """Атрибуты источника (validation_alias) для полей fields, по алфавиту; None — все."""
+    if fields is None:
+        return None
+    return tuple(sorted(
+        alias if isinstance(alias := schema.model_fields[name].validation_alias, str) else name
+        for name in fields
+    ))
@@ -0,0 +1,112 @@
+"""
+Готовые JSON-ответы с ETag для публичных эндпоинтов каталога.
+
+В кэше каталога хранится уже закодированное тело ответа и его хэш:
+повторный запрос отдаёт байты как есть, а запрос с совпавшим
+If-None-Match получает 304 — без обращения к БД и без Pydantic.
+"""
+import hashlib
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Collection
+
+from fastapi import Request, Response, status
+from fastapi.dependencies.utils import get_flat_dependant
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from pydantic.main import IncEx
+
+from leaf_flow.application.ports.catalog_cache import CatalogCache
+
+# Клиент может хранить ответ, но обязан перепроверять его по ETag
+_CACHE_CONTROL = "no-cache"
+
+
+@dataclass(frozen=True, slots=True)
+class EncodedResponse:
+    body: bytes
+    etag: str
+
+
+def encode_response(model: BaseModel, include: IncEx | None = None) -> EncodedResponse:
+    # Сериализатор pydantic-core (Rust) — без промежуточного jsonable_encoder
+    body = model.model_dump_json(include=include).encode()
+    digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+    return EncodedResponse(body=body, etag=f'"{digest}"')
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match сравнивается слабо: W/"x" совпадает с "x"
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def json_response(request: Request, encoded: EncodedResponse) -> Response:
+    headers = {"ETag": encoded.etag, "Cache-Control": _CACHE_CONTROL}
+    if _etag_matches(request.headers.get("if-none-match"), encoded.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(
+        content=encoded.body,
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+# Объявленные query-параметры эндпоинта (с зависимостями) по маршруту
+_declared_params: dict[str, frozenset[str]] = {}
+
+
+def _route_params(request: Request) -> frozenset[str]:
+    route: APIRoute = request.scope["route"]
+    params = _declared_params.get(route.unique_id)
+    if params is None:
+        dependant = get_flat_dependant(route.dependant, skip_repeats=True)
+        params = _declared_params[route.unique_id] = frozenset(
+            param.alias for param in dependant.query_params
+        )
+    return params
+
+
+def _response_key(request: Request, extra: tuple, exclude: Collection[str]) -> str:
+    # Необъявленные параметры на ответ не влияют: иначе ?x=<случайное>
+    # обходит кэш и плодит в нём записи
+    declared = _route_params(request)
+    params = "&".join(
+        f"{name}={value}"
+        for name, value in sorted(request.query_params.multi_items())
+        if name in declared and name not in exclude
+    )
+    return f"http:{request.url.path}?{params}#{extra}"
+
+
+async def cached_json_response(
+    request: Request,
+    cache: CatalogCache,
+    build: Callable[[], Awaitable[BaseModel]],
+    *key_parts: object,
+    include: IncEx | None = None,
+    exclude_params: Collection[str] = (),
+) -> Response:
+    """
+    Отдать закэшированный ответ или собрать, закодировать и закэшировать новый.
+
+    key_parts дополняют ключ (путь и отсортированные объявленные query-параметры)
+    тем, от чего ещё зависит ответ, — например, поколениями индексов.
+    include сужает сериализуемые поля (он следует из query-параметров,
+    поэтому в ключ уже входит).
+    exclude_params — query-параметры, которые в ключ не входят, потому что
+    их итоговое значение уже передано в key_parts.
+    """
+    key = _response_key(request, key_parts, exclude_params)
+    encoded, generation = await cache.get(key)
+
+    if encoded is None:
+        encoded = encode_response(await build(), include)
+        await cache.set(key, encoded, generation)
+
+    return json_response(request, encoded)
@@ -6,6 +6,7 @@ from leaf_flow.api.v1.admin.routers.categories import router as categories_route
 from leaf_flow.api.v1.admin.routers.orders import router as orders_router
 from leaf_flow.api.v1.admin.routers.reviews import router as reviews_router
 from leaf_flow.api.v1.admin.routers.users import router as users_router
+from leaf_flow.api.v1.admin.routers.cache import router as cache_router
 
 __all__ = [
     "catalog_router",
@@ -14,4 +15,5 @@ __all__ = [
     "orders_router",
     "reviews_router",
     "users_router",
+    "cache_router",
 ]
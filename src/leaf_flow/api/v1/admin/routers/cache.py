@@ -0,0 +1,19 @@
+"""Роутеры для наблюдения за кэшами в Admin API."""
+
+from fastapi import APIRouter, Depends
+
+from leaf_flow.api.deps import get_catalog_cache, require_admin_auth
+from leaf_flow.api.v1.admin.schemas.cache import CacheStatsDetail
+from leaf_flow.application.ports.catalog_cache import CatalogCache
+
+
+router = APIRouter(prefix="/admin/cache", tags=["admin-cache"])
+
+
+@router.get("/catalog", response_model=CacheStatsDetail)
+async def get_catalog_cache_stats(
+    _: None = Depends(require_admin_auth),
+    cache: CatalogCache = Depends(get_catalog_cache),
+) -> CacheStatsDetail:
+    """Счётчики кэша каталога (hit/miss/eviction) воркера, обработавшего запрос."""
+    return CacheStatsDetail.model_validate(cache.stats(), from_attributes=True)
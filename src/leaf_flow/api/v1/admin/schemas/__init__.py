@@ -49,6 +49,7 @@ from leaf_flow.api.v1.admin.schemas.attribute import (
     AttributeValueDetail,
     ProductAttributeValuesUpdate,
 )
+from leaf_flow.api.v1.admin.schemas.cache import CacheStatsDetail
 
 __all__ = [
     "ProductImage",
@@ -85,4 +86,5 @@ __all__ = [
     "AttributeDetail",
     "AttributeValueDetail",
     "ProductAttributeValuesUpdate",
+    "CacheStatsDetail",
 ]
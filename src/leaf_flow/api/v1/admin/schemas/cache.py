@@ -0,0 +1,19 @@
+"""Схемы для статистики кэшей в Admin API."""
+
+from pydantic import BaseModel, ConfigDict
+
+
+class CacheStatsDetail(BaseModel):
+    """Счётчики кэша текущего воркера."""
+
+    local_hits: int
+    redis_hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    redis_errors: int
+    local_size: int
+    local_maxsize: int
+    generation: int
+
+    model_config = ConfigDict(from_attributes=True)
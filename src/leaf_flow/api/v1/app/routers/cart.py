@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
 from pydantic import BaseModel
 
-from leaf_flow.api.deps import get_current_user, uow_dep
+from leaf_flow.api.deps import get_current_user, get_popularity_counters, uow_dep
 from leaf_flow.api.v1.app.schemas.cart import CartSchema, CartItemInput, UpdateQuantityRequest
+from leaf_flow.api.v1.app.schemas.catalog import Product, RelatedProductsResponse
+from leaf_flow.application.ports.popularity import PopularityCounters
+from leaf_flow.config import settings
 from leaf_flow.domain.entities.user import UserEntity
 from leaf_flow.infrastructure.db.uow import UoW
 from leaf_flow.services import cart_service
@@ -20,6 +23,19 @@ async def get_cart(
     return CartSchema.model_validate(cart, from_attributes=True)
 
 
+@router.get("/suggestions", response_model=RelatedProductsResponse)
+async def get_suggestions(
+    limit: int = Query(6, ge=1, le=settings.BOUGHT_TOGETHER_K),
+    user: UserEntity = Depends(get_current_user),
+    uow: UoW = Depends(uow_dep)
+) -> RelatedProductsResponse:
+    """Продукты, которые часто покупают вместе с содержимым корзины."""
+    products = await cart_service.get_suggestions(user.id, uow, limit)
+    return RelatedProductsResponse(
+        items=[Product.model_validate(product, from_attributes=True) for product in products]
+    )
+
+
 @router.delete("", status_code=204)
 async def clear_cart(
     user: UserEntity = Depends(get_current_user),
@@ -32,8 +48,10 @@ async def clear_cart(
 @router.post("/items", response_model=CartSchema)
 async def add_item(
     payload: CartItemInput,
+    background_tasks: BackgroundTasks,
     user: UserEntity = Depends(get_current_user),
-    uow: UoW = Depends(uow_dep)
+    uow: UoW = Depends(uow_dep),
+    counters: PopularityCounters = Depends(get_popularity_counters),
 ) -> CartSchema:
     try:
         cart = await cart_service.add_item(
@@ -45,6 +63,7 @@ async def add_item(
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    background_tasks.add_task(counters.record_add_to_cart, payload.productId, f"u:{user.id}")
     return CartSchema.model_validate(cart, from_attributes=True)
 
 
@@ -1,63 +1,382 @@
-from fastapi import APIRouter, Depends, Query, HTTPException, status, Path
+from decimal import Decimal
+from typing import AsyncIterator
 
-from leaf_flow.api.deps import uow_dep
+from fastapi import (
+    APIRouter, BackgroundTasks, Depends, Query, HTTPException, status, Path, Request, Response
+)
+from fastapi.responses import StreamingResponse
+
+from leaf_flow.api.deps import (
+    IMAGE_HINT_HEADERS, IMAGE_HINT_PARAMS, get_image_width, get_popularity_counters,
+    get_suggest_index, get_visitor_id, uow_dep
+)
+from leaf_flow.api.fields import FIELDS_DESCRIPTION, include_items, parse_fields, source_names
+from leaf_flow.api.responses import cached_json_response, encode_response, json_response
 from leaf_flow.api.v1.app.schemas.catalog import (
     Category, Product, CategoryListResponse,
-    ProductListResponse, ProductDetail
+    ProductListResponse, ProductDetail, FacetOut, ProductBatchResponse,
+    CatalogChangesResponse, SuggestResponse, SuggestionOut, RelatedProductsResponse
 )
+from leaf_flow.application.dto.catalog import ProductListQuery, ProductSort
+from leaf_flow.application.ports.catalog_index import SuggestIndex
+from leaf_flow.application.ports.popularity import PopularityCounters
+from leaf_flow.config import settings
+from leaf_flow.infrastructure.catalog.suggest import MAX_SUGGESTIONS
 from leaf_flow.infrastructure.db.uow import UoW
 from leaf_flow.services import catalog_service
+from leaf_flow.services.popularity_service import popularity_version
 
 
 router = APIRouter(prefix="/catalog", tags=["catalog"])
 
 
-@router.get("/categories", response_model=CategoryListResponse)
-async def list_categories(uow: UoW = Depends(uow_dep)) -> CategoryListResponse:
-    categories = await catalog_service.list_categories(uow)
-    return CategoryListResponse(
-        items=[
-            Category.model_validate(category, from_attributes=True)
-            for category in categories
-        ]
-    )
+@router.get(
+    "/categories",
+    response_model=CategoryListResponse,
+    responses={304: {"description": "Not modified"}},
+)
+async def list_categories(request: Request, uow: UoW = Depends(uow_dep)) -> Response:
+    async def build() -> CategoryListResponse:
+        categories = await catalog_service.list_categories(uow)
+        return CategoryListResponse(
+            items=[
+                Category.model_validate(category, from_attributes=True)
+                for category in categories
+            ]
+        )
+
+    return await cached_json_response(request, uow.catalog_cache, build)
 
 
-@router.get("/products", response_model=ProductListResponse)
+@router.get(
+    "/products",
+    response_model=ProductListResponse,
+    responses={304: {"description": "Not modified"}},
+)
 async def list_products(
+    request: Request,
     category: str | None = Query(None),
     search: str | None = Query(None),
+    attr: list[str] = Query(
+        [],
+        description="Фильтр code:slug; значения одного атрибута — ИЛИ, разных — И",
+    ),
+    price_min: Decimal | None = Query(
+        None, alias="priceMin", ge=0,
+        description="Есть активный вариант не дешевле (по максимальной цене продукта)",
+    ),
+    price_max: Decimal | None = Query(
+        None, alias="priceMax", ge=0,
+        description="Есть активный вариант не дороже (по минимальной цене продукта)",
+    ),
+    sort: ProductSort = Query(
+        "name",
+        description=(
+            "relevance — по релевантности поиска (имеет смысл вместе с search); "
+            "price_asc — по минимальной цене, price_desc — по максимальной; "
+            "popular — по популярности (посетители и добавления в корзину "
+            "с затуханием во времени)"
+        ),
+    ),
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(
+        None,
+        description="Токен keyset-пагинации из nextCursor; пустое значение — первая страница",
+    ),
+    with_total: bool | None = Query(
+        None,
+        alias="withTotal",
+        description="Считать total (по умолчанию только в режиме offset)",
+    ),
+    with_facets: bool = Query(
+        False,
+        alias="withFacets",
+        description="Вернуть счётчики значений атрибутов для текущих фильтров",
+    ),
+    fields: str | None = Query(
+        None, description=f"{FIELDS_DESCRIPTION} (поля элемента items)"
+    ),
+    image_width: int | None = Depends(get_image_width),
     uow: UoW = Depends(uow_dep),
-) -> ProductListResponse:
-    total, items = await catalog_service.list_products(
-        uow, category, search, limit, offset
+) -> Response:
+    try:
+        selected = parse_fields(fields, Product)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if cursor is not None and offset:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="CURSOR_WITH_OFFSET"
+        )
+    if with_total is None:
+        with_total = cursor is None
+
+    async def build() -> ProductListResponse:
+        try:
+            query = ProductListQuery(
+                category_slug=category,
+                search=search,
+                attributes=catalog_service.parse_attribute_filters(attr),
+                price_min=price_min,
+                price_max=price_max,
+                sort=sort,
+                limit=limit,
+                offset=offset,
+                after=catalog_service.decode_cursor(cursor, sort) if cursor else None,
+                with_total=with_total,
+                with_facets=with_facets,
+                with_variants=selected is None or "variants" in selected,
+                with_images=selected is None or "images" in selected,
+                columns=source_names(Product, selected),
+            )
+            page = await catalog_service.list_products(uow, query)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        return ProductListResponse(
+            total=page.total,
+            items=[
+                Product.model_validate(product, from_attributes=True)
+                for product in catalog_service.fit_images(page.items, image_width)
+            ],
+            nextCursor=(
+                catalog_service.encode_cursor(sort, page.next_after)
+                if page.next_after is not None else None
+            ),
+            facets=(
+                [FacetOut.model_validate(facet, from_attributes=True) for facet in page.facets]
+                if page.facets is not None else None
+            ),
+        )
+
+    # Ответ зависит и от индексов фасетов/синонимов, которые догоняют
+    # поколение каталога с задержкой, от популярности (для sort=popular)
+    # и от ширины из заголовков
+    response = await cached_json_response(
+        request,
+        uow.catalog_cache,
+        build,
+        uow.facet_index.generation,
+        uow.synonym_index.generation,
+        popularity_version() if sort == "popular" else None,
+        image_width,
+        include=include_items(ProductListResponse, selected),
+        exclude_params=IMAGE_HINT_PARAMS,
     )
-    return ProductListResponse(
-        total=total,
-        items=[
-            Product.model_validate(product, from_attributes=True)
-            for product in items
-        ],
+    response.headers["Vary"] = IMAGE_HINT_HEADERS
+    return response
+
+
+@router.get(
+    "/suggest",
+    response_model=SuggestResponse,
+    responses={304: {"description": "Not modified"}},
+)
+async def suggest(
+    request: Request,
+    q: str = Query(..., max_length=100, description="Начало любого слова подсказки"),
+    limit: int = Query(10, ge=1, le=MAX_SUGGESTIONS),
+    suggest_index: SuggestIndex = Depends(get_suggest_index),
+) -> Response:
+    # Только in-memory индекс воркера — без сессии БД и кэша
+    suggestions = suggest_index.suggest(q, limit)
+    return json_response(
+        request,
+        encode_response(
+            SuggestResponse(
+                items=[
+                    SuggestionOut.model_validate(suggestion, from_attributes=True)
+                    for suggestion in suggestions
+                ]
+            )
+        ),
+    )
+
+
+@router.get(
+    "/products:batch",
+    response_model=ProductBatchResponse,
+    responses={304: {"description": "Not modified"}},
+)
+async def get_products_batch(
+    request: Request,
+    ids: str = Query(
+        ...,
+        description=f"Id продуктов через запятую, до {settings.CATALOG_BATCH_MAX_IDS} штук",
+    ),
+    uow: UoW = Depends(uow_dep),
+) -> Response:
+    try:
+        product_ids = catalog_service.parse_product_ids(ids)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    # Карточки кэшируются поштучно внутри сервиса: ответ на произвольный
+    # набор id в кэш не кладётся, ETag считается по телу
+    products = await catalog_service.get_products(uow, product_ids)
+    found = {product.id for product in products}
+    return json_response(
+        request,
+        encode_response(
+            ProductBatchResponse(
+                items=[
+                    ProductDetail.model_validate(product, from_attributes=True)
+                    for product in products
+                ],
+                missing=[product_id for product_id in product_ids if product_id not in found],
+            )
+        ),
+    )
+
+
+@router.get(
+    "/products:export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def export_products(uow: UoW = Depends(uow_dep)) -> StreamingResponse:
+    """Все активные продукты в формате списка, по одному JSON-объекту на строку."""
+    async def lines() -> AsyncIterator[bytes]:
+        async for batch in catalog_service.stream_products(uow):
+            # одна запись в сокет на пачку, а не на продукт
+            yield b"".join(
+                Product.model_validate(product, from_attributes=True)
+                .model_dump_json().encode() + b"\n"
+                for product in batch
+            )
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.get(
+    "/changes",
+    response_model=CatalogChangesResponse,
+    responses={304: {"description": "Not modified"}},
+)
+async def list_changes(
+    request: Request,
+    since: int = Query(
+        0, ge=0,
+        description="version из предыдущего ответа; 0 — весь журнал",
+    ),
+    limit: int = Query(200, ge=1, le=500),
+    uow: UoW = Depends(uow_dep),
+) -> Response:
+    changes = await catalog_service.get_changes(uow, since, limit)
+    return json_response(
+        request,
+        encode_response(
+            CatalogChangesResponse(
+                version=changes.version,
+                hasMore=changes.has_more,
+                upserted=[
+                    ProductDetail.model_validate(product, from_attributes=True)
+                    for product in changes.upserted
+                ],
+                deleted=list(changes.deleted),
+            )
+        ),
     )
 
 
 @router.get(
     "/products/{productId}",
     response_model=ProductDetail,
-    responses={404: {"description": "Not found"}},
+    responses={304: {"description": "Not modified"}, 404: {"description": "Not found"}},
 )
 async def get_product(
+    request: Request,
+    background_tasks: BackgroundTasks,
     product_id: str = Path(..., alias="productId"),
+    uow: UoW = Depends(uow_dep),
+    counters: PopularityCounters = Depends(get_popularity_counters),
+    visitor: str = Depends(get_visitor_id),
+    fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
+    image_width: int | None = Depends(get_image_width),
+) -> Response:
+    try:
+        selected = parse_fields(fields, ProductDetail)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    async def build() -> ProductDetail:
+        product = await catalog_service.get_product(uow, product_id)
+
+        if not product:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Product not found"
+            )
+
+        [product] = catalog_service.fit_images([product], image_width)
+        return ProductDetail.model_validate(product, from_attributes=True)
+
+    # Карточка целиком читается из read-модели одним запросом и кэшируется
+    # общей с products:batch — поля сужаются только при сериализации
+    response = await cached_json_response(
+        request, uow.catalog_cache, build, image_width,
+        include=selected, exclude_params=IMAGE_HINT_PARAMS,
+    )
+    response.headers["Vary"] = IMAGE_HINT_HEADERS
+    # Просмотр засчитывается только найденной карточке (200 или 304):
+    # 404 выше уходит исключением. Счётчик пишется после отправки ответа
+    # и не задерживает карточку
+    if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+        background_tasks.add_task(counters.record_view, product_id, visitor)
+    return response
+
+
+@router.get(
+    "/products/{productId}/similar",
+    response_model=RelatedProductsResponse,
+    responses={304: {"description": "Not modified"}},
+)
+async def list_similar_products(
+    request: Request,
+    product_id: str = Path(..., alias="productId"),
+    limit: int = Query(6, ge=1, le=settings.SIMILAR_PRODUCTS_K),
+    image_width: int | None = Depends(get_image_width),
     uow: UoW = Depends(uow_dep)
-) -> ProductDetail:
-    product = await catalog_service.get_product(uow, product_id)
+) -> Response:
+    async def build() -> RelatedProductsResponse:
+        products = await catalog_service.get_similar_products(uow, product_id, limit)
+        return RelatedProductsResponse(
+            items=[
+                Product.model_validate(product, from_attributes=True)
+                for product in catalog_service.fit_images(products, image_width)
+            ]
+        )
 
-    if not product:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Product not found"
+    response = await cached_json_response(
+        request, uow.catalog_cache, build, image_width, exclude_params=IMAGE_HINT_PARAMS
+    )
+    response.headers["Vary"] = IMAGE_HINT_HEADERS
+    return response
+
+
+@router.get(
+    "/products/{productId}/bought-together",
+    response_model=RelatedProductsResponse,
+    responses={304: {"description": "Not modified"}},
+)
+async def list_bought_together(
+    request: Request,
+    product_id: str = Path(..., alias="productId"),
+    limit: int = Query(6, ge=1, le=settings.BOUGHT_TOGETHER_K),
+    image_width: int | None = Depends(get_image_width),
+    uow: UoW = Depends(uow_dep)
+) -> Response:
+    async def build() -> RelatedProductsResponse:
+        products = await catalog_service.get_bought_together(uow, product_id, limit)
+        return RelatedProductsResponse(
+            items=[
+                Product.model_validate(product, from_attributes=True)
+                for product in catalog_service.fit_images(products, image_width)
+            ]
         )
 
-    return ProductDetail.model_validate(product, from_attributes=True)
+    response = await cached_json_response(
+        request, uow.catalog_cache, build, image_width, exclude_params=IMAGE_HINT_PARAMS
+    )
+    response.headers["Vary"] = IMAGE_HINT_HEADERS
+    return response
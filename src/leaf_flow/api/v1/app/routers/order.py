@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Response, status
+from pydantic import TypeAdapter
 
 from leaf_flow.api.deps import get_current_user, uow_dep
+from leaf_flow.api.fields import FIELDS_DESCRIPTION, parse_fields
 from leaf_flow.api.v1.app.schemas.order import (
     OrderRequest, OrderSummary, OrderDetails,
     OrderListItem, OrderItemDetails
@@ -12,6 +14,8 @@ from leaf_flow.services import order_service
 
 router = APIRouter(prefix="/orders", tags=["orders"])
 
+_order_list_adapter = TypeAdapter(list[OrderListItem])
+
 @router.post("", response_model=OrderSummary, status_code=201)
 async def create_order(
     payload: OrderRequest,
@@ -50,12 +54,21 @@ async def create_order(
 async def list_orders(
     limit: int = Query(10, ge=1, le=50),
     offset: int = Query(0, ge=0),
+    fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
     user: UserEntity = Depends(get_current_user),
     uow: UoW = Depends(uow_dep)
-) -> list[OrderListItem]:
+) -> Response:
     """Получение списка заказов текущего пользователя."""
-    orders = await order_service.list_orders_for_user(user.id, limit, offset, uow)
-    return [
+    try:
+        selected = parse_fields(fields, OrderListItem)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Позиции в элементе списка не отдаются — и не читаются
+    orders = await order_service.list_orders_for_user(
+        user.id, limit, offset, uow, with_items=False
+    )
+    items = [
         OrderListItem(
             orderId=order.id,
             customerName=order.customer_name,
@@ -66,15 +79,29 @@ async def list_orders(
         )
         for order in orders
     ]
+    return Response(
+        content=_order_list_adapter.dump_json(
+            items, include={"__all__": set(selected)} if selected else None
+        ),
+        media_type="application/json",
+    )
 
 
 @router.get("/{orderId}", response_model=OrderDetails)
 async def get_order(
     order_id: str = Path(..., alias="orderId"),
+    fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
     user: UserEntity = Depends(get_current_user),
     uow: UoW = Depends(uow_dep),
-) -> OrderDetails:
-    order = await order_service.get_order(order_id, uow)
+) -> Response:
+    try:
+        selected = parse_fields(fields, OrderDetails)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    order = await order_service.get_order(
+        order_id, uow, with_items=selected is None or "items" in selected
+    )
 
     if not order:
         raise HTTPException(
@@ -87,8 +114,8 @@ async def get_order(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied"
         )
-    
-    return OrderDetails(
+
+    details = OrderDetails(
         orderId=order.id,
         customerName=order.customer_name,
         deliveryMethod=order.delivery,
@@ -110,3 +137,7 @@ async def get_order(
         status=order.status,
         createdAt=order.created_at,
     )
+    return Response(
+        content=details.model_dump_json(include=selected),
+        media_type="application/json",
+    )
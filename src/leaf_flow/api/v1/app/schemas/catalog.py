@@ -9,6 +9,7 @@ UIHint = Literal["chips", "radio", "toggle", "scale"]
 ImageVariant = Literal["original", "thumb", "md", "lg"]
 ImageFormat = Literal["jpg", "jpeg", "png", "webp"]
 ProductCategory = str
+SuggestionKind = Literal["category", "attribute", "product", "tag"]
 
 
 class BrewProfileOut(BaseModel):
@@ -87,6 +88,7 @@ class ProductImage(BaseModel):
     variants: list[ProductImageVariant]
     # Устарело
     image_url: str | None = None
+    srcset: str | None = None
 
     model_config = ConfigDict(from_attributes=True, populate_by_name=True)
 
@@ -114,6 +116,8 @@ class ProductDetail(BaseModel):
 class Category(BaseModel):
     id: str = Field(validation_alias="slug")
     label: str
+    # Число активных продуктов; 0 — категорию можно скрыть
+    product_count: int = 0
 
     model_config = ConfigDict(from_attributes=True, populate_by_name=True)
 
@@ -138,6 +142,9 @@ class Product(BaseModel):
     updated_at: datetime
     sort_order: int
     images: List[ProductImage]
+    # Диапазон цен активных вариантов; None — активных вариантов нет
+    min_price: Decimal | None = None
+    max_price: Decimal | None = None
 
     model_config = ConfigDict(from_attributes=True, populate_by_name=True)
 
@@ -146,6 +153,61 @@ class CategoryListResponse(BaseModel):
     items: List[Category]
 
 
+class FacetValueOut(BaseModel):
+    slug: str
+    name: str
+    count: int
+    selected: bool
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class FacetOut(BaseModel):
+    code: str
+    name: str
+    values: List[FacetValueOut]
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class ProductListResponse(BaseModel):
-    total: int
+    # None в режиме курсора, если total не запрошен явно
+    total: int | None
     items: List[Product]
+    nextCursor: str | None = None
+    # Только при withFacets=true
+    facets: List[FacetOut] | None = None
+
+
+class RelatedProductsResponse(BaseModel):
+    # От самой сильной связи
+    items: List[Product]
+
+
+class ProductBatchResponse(BaseModel):
+    # В порядке ids из запроса
+    items: List[ProductDetail]
+    # Не найденные или неактивные id
+    missing: List[str]
+
+
+class CatalogChangesResponse(BaseModel):
+    # Передать как since в следующем запросе
+    version: int
+    # Есть ещё изменения после version — запросить сразу
+    hasMore: bool
+    upserted: List[ProductDetail]
+    # Удалённые или снятые с продажи продукты
+    deleted: List[str]
+
+
+class SuggestionOut(BaseModel):
+    kind: SuggestionKind
+    title: str
+    # category — slug, attribute — фильтр code:slug, product — id, tag — тег
+    value: str
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SuggestResponse(BaseModel):
+    items: List[SuggestionOut]
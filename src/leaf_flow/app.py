@@ -22,26 +22,37 @@ from leaf_flow.api.v1.admin.routers.categories import router as admin_categories
 from leaf_flow.api.v1.admin.routers.orders import router as admin_orders_router
 from leaf_flow.api.v1.admin.routers.reviews import router as admin_reviews_router
 from leaf_flow.api.v1.admin.routers.users import router as admin_users_router
+from leaf_flow.api.v1.admin.routers.cache import router as admin_cache_router
 from leaf_flow.config import settings
+from leaf_flow.infrastructure.externals.redis.client import create_redis, set_redis
+from leaf_flow.infrastructure.cache.catalog import catalog_cache
+from leaf_flow.infrastructure.catalog.facets import facet_index
+from leaf_flow.infrastructure.catalog.synonyms import synonym_index
+from leaf_flow.infrastructure.catalog.suggest import suggest_index
+from leaf_flow.infrastructure.catalog.refresher import CatalogIndexRefresher
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     redis: Redis | None = None
+    refresher = CatalogIndexRefresher(
+        facet_index=facet_index,
+        synonym_index=synonym_index,
+        suggest_index=suggest_index,
+        catalog_cache=catalog_cache,
+        poll_interval=settings.CATALOG_INDEX_REFRESH_INTERVAL,
+        rebuild_interval=settings.CATALOG_INDEX_REBUILD_INTERVAL,
+    )
     try:
-        redis = Redis(
-            host=settings.REDIS_HOST,
-            port=settings.REDIS_PORT,
-            db=0,
-            socket_timeout=5,
-            socket_connect_timeout=5,
-            health_check_interval=30,
-            # decode_responses=True,
-        )
+        redis = create_redis()
         await redis.ping()
         app.state.redis = redis
+        set_redis(redis)
+        await refresher.start()
         yield
     finally:
+        await refresher.stop()
+        set_redis(None)
         if redis is not None:
             await redis.aclose()
 
@@ -83,6 +94,7 @@ def create_app() -> FastAPI:
     api_v1.include_router(admin_orders_router)
     api_v1.include_router(admin_reviews_router)
     api_v1.include_router(admin_users_router)
+    api_v1.include_router(admin_cache_router)
 
     app.include_router(api_v1)
     return app
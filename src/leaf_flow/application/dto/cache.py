@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    local_hits: int
+    redis_hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    redis_errors: int
+    local_size: int
+    local_maxsize: int
+    generation: int
@@ -0,0 +1,199 @@
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Literal, Sequence
+
+from leaf_flow.domain.entities.product import (
+    ProductDetailEntity, ProductEntity, ProductImageEntity
+)
+
+ProductSort = Literal["name", "relevance", "price_asc", "price_desc", "popular"]
+
+
+@dataclass(frozen=True, slots=True)
+class ProductListQuery:
+    """
+    Параметры выборки публичного списка продуктов.
+
+    Если задан after, используется keyset-пагинация (offset игнорируется):
+    after — значения ключа сортировки последнего элемента предыдущей страницы.
+    Сортировка relevance без search равносильна сортировке по названию.
+    attributes — пары (код атрибута, slug значения): значения одного
+    атрибута объединяются по ИЛИ, разные атрибуты — по И.
+    price_min/price_max — продукт подходит, если диапазон цен его активных
+    вариантов пересекается с заданным. Сортировки по цене: price_asc —
+    по минимальной цене, price_desc — по максимальной; продукты без
+    активных вариантов идут в конце. popular — по затухающей популярности,
+    продукты без активности в конце. with_variants/with_images=False —
+    связи не читаются, и у продуктов пустые списки (разреженный ответ).
+    columns — атрибуты продукта, нужные ответу (None — все): прочие
+    скалярные колонки не читаются, и у продуктов в них пустые значения.
+    """
+    category_slug: str | None = None
+    search: str | None = None
+    attributes: tuple[tuple[str, str], ...] = ()
+    price_min: Decimal | None = None
+    price_max: Decimal | None = None
+    sort: ProductSort = "name"
+    limit: int = 20
+    offset: int = 0
+    after: tuple | None = None
+    with_total: bool = True
+    with_facets: bool = False
+    with_variants: bool = True
+    with_images: bool = True
+    columns: tuple[str, ...] | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class ProductPage:
+    """
+    Страница списка продуктов.
+
+    total равен None, если подсчёт не запрашивался; next_after — ключ
+    сортировки последнего элемента, если за страницей есть продолжение.
+    """
+    total: int | None
+    items: Sequence[ProductEntity]
+    next_after: tuple | None = None
+    facets: Sequence["Facet"] | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class FacetValue:
+    slug: str
+    name: str
+    count: int
+    selected: bool
+
+
+@dataclass(frozen=True, slots=True)
+class Facet:
+    """Счётчики значений атрибута для текущего набора фильтров."""
+    code: str
+    name: str
+    values: Sequence[FacetValue]
+
+
+@dataclass(frozen=True, slots=True)
+class ProductFacetSource:
+    """Данные продукта, из которых строится индекс фасетов."""
+    product_id: str
+    category_slug: str
+    is_active: bool
+    attribute_value_ids: frozenset[int]
+
+
+@dataclass(frozen=True, slots=True)
+class AttributeValueSynonym:
+    """Фраза, которой в поисковом запросе можно назвать значение атрибута."""
+    attribute_code: str
+    value_slug: str
+    phrase: str
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogDocumentsReport:
+    """Результат сверки read-модели каталога с основными таблицами."""
+    checked: int
+    missing: Sequence[str]
+    orphaned: Sequence[str]
+    stale: Sequence[str]
+
+    @property
+    def ok(self) -> bool:
+        return not (self.missing or self.orphaned or self.stale)
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogChangeLogPage:
+    """Продукты, изменённые после версии, в порядке их последнего изменения."""
+    product_ids: Sequence[str]
+    # Версия последнего изменения в выборке (since, если изменений нет)
+    version: int
+    has_more: bool
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogChanges:
+    version: int
+    has_more: bool
+    upserted: Sequence[ProductDetailEntity]
+    # Удалённые или деактивированные продукты
+    deleted: Sequence[str]
+
+
+SuggestionKind = Literal["category", "attribute", "product", "tag"]
+
+
+@dataclass(frozen=True, slots=True)
+class Suggestion:
+    """Подсказка поисковой строки."""
+    kind: SuggestionKind
+    title: str
+    # slug категории, code:slug значения атрибута, id продукта или тег
+    value: str
+
+
+@dataclass(frozen=True, slots=True)
+class SuggestionSource:
+    """Подсказка и фразы, по началу любого слова которых она находится."""
+    suggestion: Suggestion
+    phrases: Sequence[str]
+
+
+@dataclass(frozen=True, slots=True)
+class ProductFeatures:
+    """Признаки продукта, по которым ищутся похожие."""
+    product_id: str
+    attribute_value_ids: frozenset[int]
+    tags: frozenset[str]
+
+
+@dataclass(frozen=True, slots=True)
+class ProductNeighbour:
+    product_id: str
+    # Косинусная близость, (0, 1]
+    score: float
+
+
+@dataclass(frozen=True, slots=True)
+class ProductPairScore:
+    """Продукт, который покупают вместе с другим, и сила связи."""
+    product_id: str
+    # Заказов с обоими продуктами
+    support: int
+    # Доля заказов исходного продукта, где есть и этот
+    confidence: float
+    # Во сколько раз чаще, чем среди всех заказов
+    lift: float
+
+
+@dataclass(frozen=True, slots=True)
+class ProductStatsDelta:
+    """Прирост счётчиков продукта за интервал сброса."""
+    product_id: str
+    views: int
+    add_to_carts: int
+    visitors: int
+    # Вклад интервала в популярность, в лог-шкале (None — нулевой)
+    popularity: float | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class ProductDisplay:
+    """
+    Данные продукта для строк корзины и заказа — общие для всех
+    пользователей: название, главное и активные изображения, вес каждого
+    варианта. Заказы показывают и снятые с продажи продукты, корзина — нет.
+    """
+    name: str
+    image: str
+    is_active: bool
+    images: list[ProductImageEntity]
+    # variant_id → вес, все варианты
+    weights: dict[str, str]
+    active_variant_ids: frozenset[str]
+
+    def sells(self, variant_id: str) -> bool:
+        """Продукт и вариант в продаже (позиция может быть в корзине)."""
+        return self.is_active and variant_id in self.active_variant_ids
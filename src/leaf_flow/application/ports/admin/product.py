@@ -1,4 +1,4 @@
-from typing import Protocol, Sequence
+from typing import Collection, Protocol, Sequence
 
 from leaf_flow.domain.entities.product import ProductDetailEntity
 
@@ -38,3 +38,7 @@ class AdminProductWriter(Protocol):
     async def delete(self, product_id: str) -> None: ...
 
     async def set_active(self, product_id: str, is_active: bool) -> None: ...
+
+    async def refresh_price_range(self, product_ids: Collection[str]) -> None:
+        """Пересчитать min_price/max_price по активным вариантам."""
+        ...
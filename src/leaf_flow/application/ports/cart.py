@@ -5,6 +5,11 @@ from leaf_flow.domain.entities.cart import CartDetailEntity, CartEntity, CartIte
 
 
 class CartWriter(Protocol):
+    """
+    Изменения позиций возвращают позиции корзины после изменения
+    в порядке добавления — без данных продукта (их даёт ProductDisplayReader).
+    """
+
     async def create_cart(self, user_id: int) -> CartEntity:
         ...
 
@@ -17,14 +22,14 @@ class CartWriter(Protocol):
         variant_id: str,
         quantity: int,
         price: Decimal
-    ) -> CartItemEntity:
+    ) -> list[CartItemEntity]:
         ...
 
     async def replace_items(
         self,
         cart_id: int,
         items: list[tuple[str, str, int, Decimal]]
-    ) -> None:
+    ) -> list[CartItemEntity]:
         ...
 
     async def set_quantity(
@@ -33,7 +38,8 @@ class CartWriter(Protocol):
         product_id: str,
         variant_id: str,
         quantity: int
-    ) -> CartItemEntity | None:
+    ) -> list[CartItemEntity] | None:
+        """None — позиции в корзине нет."""
         ...
 
     async def remove_item(
@@ -41,7 +47,7 @@ class CartWriter(Protocol):
         cart_id: int,
         product_id: str,
         variant_id: str
-    ) -> None:
+    ) -> list[CartItemEntity]:
         ...
 
     async def delete_by_user_id(self, user_id: int) -> bool:
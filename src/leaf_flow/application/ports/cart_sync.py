@@ -0,0 +1,17 @@
+from typing import Protocol
+
+
+class CartSynchronizer(Protocol):
+    """
+    Порт записи корзин из быстрого хранилища в БД.
+
+    Для корзин, которые и так живут в БД, — пустая реализация.
+    """
+
+    async def sync(self, user_id: int) -> None:
+        """Записать корзину пользователя в текущей транзакции (перед заказом)."""
+        ...
+
+    async def sync_dirty(self, limit: int) -> int:
+        """Записать и закоммитить до limit изменённых корзин; вернуть их число."""
+        ...
@@ -0,0 +1,38 @@
+from typing import Any, Iterable, Mapping, Protocol, Sequence
+
+from leaf_flow.application.dto.cache import CacheStats
+
+
+class CatalogCache(Protocol):
+    """Порт кэша чтения каталога."""
+
+    async def get(self, key: str) -> tuple[Any | None, int | None]:
+        """
+        Значение и поколение каталога, в котором его искали
+        (None — кэш сейчас не используется).
+        """
+        ...
+
+    async def set(self, key: str, value: Any, generation: int | None) -> None:
+        """Сохранить, только если поколение с момента get не сменилось."""
+        ...
+
+    async def get_many(self, keys: Sequence[str]) -> tuple[dict[str, Any], int | None]:
+        """Найденные значения по ключам (промахов в них нет) и поколение чтения."""
+        ...
+
+    async def set_many(self, values: Mapping[str, Any], generation: int | None) -> None:
+        ...
+
+    async def invalidate(self, product_ids: Iterable[str]) -> None:
+        ...
+
+    async def changes_since(self, generation: int) -> tuple[int, frozenset[str] | None]:
+        """
+        Текущее поколение и продукты, изменённые после generation
+        (None — журнал не покрывает интервал, нужна полная перестройка).
+        """
+        ...
+
+    def stats(self) -> CacheStats:
+        ...
@@ -0,0 +1,19 @@
+from typing import Collection, Protocol
+
+from leaf_flow.application.dto.catalog import CatalogChangeLogPage
+
+
+class CatalogChangeLogReader(Protocol):
+    """Порт чтения журнала изменений каталога."""
+
+    async def list_since(self, version: int, limit: int) -> CatalogChangeLogPage:
+        """Не больше limit продуктов, изменённых после version."""
+        ...
+
+
+class CatalogChangeLogWriter(Protocol):
+    """Порт записи журнала изменений каталога."""
+
+    async def record(self, product_ids: Collection[str]) -> None:
+        """Записать изменения в текущей транзакции."""
+        ...
@@ -0,0 +1,30 @@
+from typing import Collection, Protocol, Sequence
+
+from leaf_flow.domain.entities.product import ProductDetailEntity
+
+
+class CatalogDocumentReader(Protocol):
+    """Порт чтения read-модели каталога (документы карточек продуктов)."""
+
+    async def get(self, product_id: str) -> ProductDetailEntity | None:
+        ...
+
+    async def get_many(
+        self,
+        product_ids: Collection[str]
+    ) -> dict[str, ProductDetailEntity]:
+        ...
+
+    async def list_product_ids(self) -> set[str]:
+        ...
+
+
+class CatalogDocumentWriter(Protocol):
+    """Порт записи read-модели каталога."""
+
+    async def upsert(self, products: Sequence[ProductDetailEntity]) -> None:
+        ...
+
+    async def delete(self, product_ids: Collection[str]) -> int:
+        """Удалить документы; возвращает число удалённых."""
+        ...
@@ -0,0 +1,86 @@
+from typing import Collection, Protocol, Sequence
+
+from leaf_flow.application.dto.catalog import (
+    AttributeValueSynonym, Facet, ProductFacetSource, Suggestion, SuggestionSource
+)
+from leaf_flow.domain.entities.product import ProductAttributesEntity
+
+
+class CatalogIndexReader(Protocol):
+    """Источник данных для in-memory индексов каталога."""
+
+    async def list_facet_attributes(self) -> Sequence[ProductAttributesEntity]:
+        """Активные атрибуты с активными значениями."""
+        ...
+
+    async def list_product_facets(
+        self,
+        product_ids: Collection[str] | None = None
+    ) -> Sequence[ProductFacetSource]:
+        """
+        Привязки продуктов к значениям атрибутов.
+
+        Без product_ids — все активные продукты; с product_ids — указанные
+        (в том числе неактивные), удалённые продукты в ответ не попадают.
+        """
+        ...
+
+    async def list_value_synonyms(self) -> Sequence[AttributeValueSynonym]:
+        """Синонимы и названия активных значений атрибутов."""
+        ...
+
+    async def list_suggestion_sources(self) -> Sequence[SuggestionSource]:
+        """
+        Подсказки поиска: категории, активные значения атрибутов (с синонимами),
+        названия и теги активных продуктов.
+        """
+        ...
+
+
+class FacetIndex(Protocol):
+    """Порт индекса фасетов каталога."""
+
+    # Поколение каталога, до которого обновлён индекс (None — ещё не построен)
+    generation: int | None
+
+    def match(
+        self,
+        category_slug: str | None,
+        attributes: Sequence[tuple[str, str]],
+    ) -> list[str]:
+        """id активных продуктов, подходящих под фильтры по атрибутам."""
+        ...
+
+    def facets(
+        self,
+        category_slug: str | None,
+        attributes: Sequence[tuple[str, str]],
+        product_ids: Collection[str] | None = None,
+    ) -> list[Facet]:
+        """
+        Счётчики значений для текущего набора фильтров.
+
+        product_ids дополнительно ограничивает множество продуктов
+        (например, результатом полнотекстового поиска).
+        """
+        ...
+
+
+class SynonymIndex(Protocol):
+    """Порт словаря синонимов значений атрибутов."""
+
+    generation: int | None
+
+    def resolve(self, text: str) -> tuple[tuple[str, str], ...]:
+        """Пары (код атрибута, slug значения), упомянутые в тексте."""
+        ...
+
+
+class SuggestIndex(Protocol):
+    """Порт индекса подсказок поисковой строки."""
+
+    generation: int | None
+
+    def suggest(self, text: str, limit: int) -> list[Suggestion]:
+        """Лучшие подсказки, у которых какое-то слово начинается с text."""
+        ...
@@ -8,4 +8,5 @@ class CategoryReader(Protocol):
         ...
 
     async def list_categories(self) -> Sequence[CategoryEntity]:
+        """Все категории по sort_order, с числом активных продуктов."""
         ...
@@ -9,15 +9,18 @@ from leaf_flow.domain.entities.order import (
 class OrderReader(Protocol):
     async def get_order_with_items(
         self,
-        order_id: str
+        order_id: str,
+        with_items: bool = True
     ) -> OrderEntity | None:
+        """with_items=False — позиции не читаются, items пуст."""
         ...
 
     async def list_orders_by_user(
         self,
         user_id: int,
         limit: int,
-        offset: int
+        offset: int,
+        with_items: bool = True
     ) -> Sequence[OrderEntity]:
         ...
 
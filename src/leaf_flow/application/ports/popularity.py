@@ -0,0 +1,40 @@
+from typing import Protocol, Sequence
+
+from leaf_flow.application.dto.catalog import ProductStatsDelta
+
+
+class PopularityCounters(Protocol):
+    """
+    Порт счётчиков активности по продуктам.
+
+    События копятся по интервалам (бакетам); закрытый бакет забирается
+    целиком и удаляется после того, как его данные сохранены.
+    """
+
+    async def record_view(self, product_id: str, visitor: str) -> None:
+        ...
+
+    async def record_add_to_cart(self, product_id: str, visitor: str) -> None:
+        ...
+
+    async def closed_buckets(self) -> list[int]:
+        """Закрытые, ещё не сброшенные бакеты, от старых к новым."""
+        ...
+
+    async def read_bucket(self, bucket: int) -> Sequence[ProductStatsDelta]:
+        ...
+
+    async def delete_bucket(self, bucket: int, product_ids: Sequence[str]) -> None:
+        ...
+
+    def bucket_started_at(self, bucket: int) -> float:
+        """Начало бакета, unix time."""
+        ...
+
+
+class ProductStatsWriter(Protocol):
+    """Порт записи накопленной статистики продуктов."""
+
+    async def apply(self, deltas: Sequence[ProductStatsDelta]) -> None:
+        """Прибавить приросты и обновить популярность в product_stats и products."""
+        ...
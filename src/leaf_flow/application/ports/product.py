@@ -1,18 +1,38 @@
-from typing import Protocol, Sequence
+from typing import AsyncIterator, Collection, Protocol
 
+from leaf_flow.application.dto.catalog import ProductListQuery, ProductPage
 from leaf_flow.domain.entities.product import (
-    ProductEntity, ProductDetailEntity, ProductVariantEntity
+    ProductDetailEntity, ProductEntity, ProductVariantEntity
 )
 
 
 class ProductsReader(Protocol):
     async def get_list_products(
         self,
-        category_slug: str | None,
-        search: str | None,
-        limit: int,
-        offset: int
-    ) -> tuple[int, Sequence[ProductEntity]]:
+        query: ProductListQuery,
+        product_ids: Collection[str] | None = None,
+        search_product_ids: Collection[str] | None = None
+    ) -> ProductPage:
+        """
+        product_ids дополнительно ограничивает выборку (результат индекса
+        фасетов), search_product_ids расширяет совпадения поиска
+        (продукты со значениями атрибутов, найденными по синонимам).
+        """
+        ...
+
+    async def get_list_product_ids(
+        self,
+        query: ProductListQuery,
+        search_product_ids: Collection[str] | None = None
+    ) -> list[str]:
+        """id всех продуктов под фильтры query, без пагинации и атрибутов."""
+        ...
+
+    def stream_products(self, batch_size: int) -> AsyncIterator[list[ProductEntity]]:
+        """
+        Все активные продукты (с вариантами и изображениями) пачками
+        по batch_size, в порядке id, через серверный курсор.
+        """
         ...
 
     async def get_with_variants(
@@ -21,6 +41,13 @@ class ProductsReader(Protocol):
     ) -> ProductDetailEntity | None:
         ...
 
+    async def get_details(
+        self,
+        product_ids: Collection[str]
+    ) -> list[ProductDetailEntity]:
+        """Карточки активных продуктов из product_ids (порядок не гарантируется)."""
+        ...
+
     async def get_for_product_variant(
             self,
             product_id: str,
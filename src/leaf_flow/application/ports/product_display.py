@@ -0,0 +1,11 @@
+from typing import Collection, Protocol
+
+from leaf_flow.application.dto.catalog import ProductDisplay
+
+
+class ProductDisplayReader(Protocol):
+    """Порт данных продуктов для отображения строк корзины и заказа."""
+
+    async def get_many(self, product_ids: Collection[str]) -> dict[str, ProductDisplay]:
+        """Данные продуктов по id; несуществующих в ответе нет."""
+        ...
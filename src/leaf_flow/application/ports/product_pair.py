@@ -0,0 +1,34 @@
+from typing import AsyncIterator, Collection, Mapping, Protocol, Sequence
+
+from leaf_flow.application.dto.catalog import ProductPairScore
+
+
+class ProductPairReader(Protocol):
+    """Порт чтения «С этим покупают» и истории заказов для его расчёта."""
+
+    async def list_paired(self, product_id: str, limit: int) -> list[str]:
+        """id продуктов, которые покупают вместе с product_id, от самой сильной связи."""
+        ...
+
+    async def get_many(
+        self,
+        product_ids: Collection[str],
+        limit: int
+    ) -> dict[str, list[ProductPairScore]]:
+        """До limit пар на каждый из product_ids."""
+        ...
+
+    def stream_baskets(self, batch_size: int) -> AsyncIterator[list[list[str]]]:
+        """
+        Продукты неотменённых заказов, пачками корзин; корзина —
+        id продуктов одного заказа. Читает серверным курсором.
+        """
+        ...
+
+
+class ProductPairWriter(Protocol):
+    """Порт записи «С этим покупают»."""
+
+    async def replace_all(self, pairs: Mapping[str, Sequence[ProductPairScore]]) -> int:
+        """Заменить все пары; возвращает число записанных строк."""
+        ...
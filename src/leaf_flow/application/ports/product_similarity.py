@@ -0,0 +1,31 @@
+from typing import Collection, Mapping, Protocol, Sequence
+
+from leaf_flow.application.dto.catalog import ProductFeatures, ProductNeighbour
+
+
+class ProductSimilarityReader(Protocol):
+    """Порт чтения похожих продуктов и данных для их расчёта."""
+
+    async def list_similar(self, product_id: str, limit: int) -> list[str]:
+        """id похожих продуктов, от самого близкого."""
+        ...
+
+    async def list_features(self) -> Sequence[ProductFeatures]:
+        """Значения активных атрибутов и теги всех активных продуктов."""
+        ...
+
+    async def list_product_ids(self) -> set[str]:
+        """Продукты, у которых есть сохранённый список похожих."""
+        ...
+
+    async def list_referencing(self, product_ids: Collection[str]) -> set[str]:
+        """Продукты, в списках похожих у которых есть кто-то из product_ids."""
+        ...
+
+
+class ProductSimilarityWriter(Protocol):
+    """Порт записи похожих продуктов."""
+
+    async def replace(self, neighbours: Mapping[str, Sequence[ProductNeighbour]]) -> None:
+        """Заменить списки похожих у продуктов-ключей (пустой список — очистить)."""
+        ...
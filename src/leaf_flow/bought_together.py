@@ -0,0 +1,47 @@
+"""
+Пересчёт «С этим покупают» (product_pairs) по истории заказов.
+
+Запуск (например, раз в сутки из cron):
+    python -m leaf_flow.bought_together rebuild
+"""
+import argparse
+import asyncio
+import logging
+
+from leaf_flow.infrastructure.db.uow import get_uow
+from leaf_flow.infrastructure.externals.redis.client import create_redis, set_redis
+from leaf_flow.services import bought_together_service
+
+logger = logging.getLogger("leaf_flow.bought_together")
+
+
+async def rebuild(batch_size: int) -> None:
+    # Redis нужен, чтобы сбросить кэш каталога во всех воркерах API
+    redis = create_redis()
+    set_redis(redis)
+    try:
+        async for uow in get_uow():
+            await bought_together_service.rebuild_pairs(uow, batch_size)
+    finally:
+        set_redis(None)
+        await redis.aclose()
+
+
+def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+
+    parser = argparse.ArgumentParser(prog="python -m leaf_flow.bought_together")
+    parser.add_argument(
+        "--batch-size", type=int, default=10_000, help="Строк order_items за чтение курсора"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("rebuild", help="Пересчитать пары по всем заказам")
+
+    asyncio.run(rebuild(parser.parse_args().batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Запись корзин из Redis в carts/cart_items (CART_STORE=redis).
+
+Запуск (в одном экземпляре):
+    python -m leaf_flow.cart_sync_worker
+"""
+import asyncio
+import logging
+
+from leaf_flow.config import settings
+from leaf_flow.infrastructure.db.uow import get_uow
+from leaf_flow.infrastructure.externals.redis.client import create_redis, set_redis
+
+logger = logging.getLogger("leaf_flow.cart_sync_worker")
+
+
+async def run() -> None:
+    redis = create_redis()
+    set_redis(redis)
+    try:
+        while True:
+            synced = 0
+            try:
+                async for uow in get_uow():
+                    synced = await uow.cart_sync.sync_dirty(settings.CART_SYNC_BATCH_SIZE)
+                    if synced:
+                        logger.info(f"Carts synced: {synced}")
+            except Exception as e:
+                logger.exception(f"Cart sync failed: {e}")
+            # Полная пачка — изменённые корзины ещё остались, без паузы
+            if synced < settings.CART_SYNC_BATCH_SIZE:
+                await asyncio.sleep(settings.CART_SYNC_INTERVAL)
+    finally:
+        set_redis(None)
+        await redis.aclose()
+
+
+def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
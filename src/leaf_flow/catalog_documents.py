@@ -0,0 +1,90 @@
+"""
+Обслуживание read-модели каталога (catalog_product_documents).
+
+Запуск:
+    python -m leaf_flow.catalog_documents rebuild   # полная перестройка
+    python -m leaf_flow.catalog_documents check     # сверка с основными таблицами
+    python -m leaf_flow.catalog_documents check --fix
+
+check завершается с кодом 1, если найдены расхождения (и не указан --fix).
+"""
+import argparse
+import asyncio
+import logging
+import sys
+
+from leaf_flow.infrastructure.db.uow import get_uow
+from leaf_flow.infrastructure.externals.redis.client import create_redis, set_redis
+from leaf_flow.services import catalog_document_service
+
+logger = logging.getLogger("leaf_flow.catalog_documents")
+
+
+async def rebuild(batch_size: int) -> int:
+    async for uow in get_uow():
+        built = await catalog_document_service.rebuild_all_documents(uow, batch_size)
+        logger.info(f"Catalog documents rebuilt: {built}")
+    return 0
+
+
+async def check(batch_size: int, fix: bool) -> int:
+    async for uow in get_uow():
+        report = await catalog_document_service.check_documents(uow, batch_size)
+        logger.info(
+            f"Checked {report.checked} products: missing={len(report.missing)}, "
+            f"orphaned={len(report.orphaned)}, stale={len(report.stale)}"
+        )
+        for title, product_ids in (
+            ("Missing", report.missing),
+            ("Orphaned", report.orphaned),
+            ("Stale", report.stale),
+        ):
+            if product_ids:
+                logger.warning(f"{title}: {', '.join(product_ids)}")
+
+        if report.ok:
+            return 0
+        if not fix:
+            return 1
+
+        await catalog_document_service.rebuild_documents(
+            uow, [*report.missing, *report.orphaned, *report.stale]
+        )
+        await uow.commit()
+        logger.info("Discrepancies fixed")
+    return 0
+
+
+async def run(args: argparse.Namespace) -> int:
+    # Redis нужен, чтобы сбросить кэш каталога во всех воркерах API
+    redis = create_redis()
+    set_redis(redis)
+    try:
+        if args.command == "rebuild":
+            return await rebuild(args.batch_size)
+        return await check(args.batch_size, args.fix)
+    finally:
+        set_redis(None)
+        await redis.aclose()
+
+
+def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+
+    parser = argparse.ArgumentParser(prog="python -m leaf_flow.catalog_documents")
+    parser.add_argument("--batch-size", type=int, default=200)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("rebuild", help="Полностью перестроить документы")
+    check_parser = commands.add_parser("check", help="Сверить документы с основными таблицами")
+    check_parser.add_argument(
+        "--fix", action="store_true", help="Перестроить расходящиеся документы"
+    )
+
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
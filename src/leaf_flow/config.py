@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 from pydantic import ConfigDict
 
@@ -34,6 +36,51 @@ class Settings(BaseSettings):
     REDIS_HOST: str
     REDIS_PORT: int
 
+    # --- Кэш каталога ---
+    CATALOG_CACHE_LOCAL_SIZE: int = 512
+    CATALOG_CACHE_TTL: int = 60 * 60
+    CATALOG_CACHE_GENERATION_TTL: float = 1.0
+    # Продуктов в кэше данных для строк корзины и заказа (в воркере)
+    PRODUCT_DISPLAY_CACHE_SIZE: int = 5000
+    CATALOG_CHANGELOG_SIZE: int = 1000
+    CATALOG_INDEX_REFRESH_INTERVAL: float = 2.0
+    CATALOG_INDEX_REBUILD_INTERVAL: float = 600.0
+    # Отдавать карточку продукта из read-модели catalog_product_documents
+    CATALOG_DOCUMENTS_ENABLED: bool = True
+    # Максимум id в одном запросе /catalog/products:batch
+    CATALOG_BATCH_MAX_IDS: int = 100
+    # Строк за одно чтение серверного курсора в /catalog/products:export
+    CATALOG_EXPORT_BATCH_SIZE: int = 200
+    # Похожие продукты: сколько соседей хранить и вес тегов относительно атрибутов
+    SIMILAR_PRODUCTS_K: int = 12
+    SIMILAR_PRODUCTS_TAG_WEIGHT: float = 0.5
+    # «С этим покупают»: пар на продукт, минимум совместных заказов
+    # и предел уникальных пар в памяти при расчёте
+    BOUGHT_TOGETHER_K: int = 12
+    BOUGHT_TOGETHER_MIN_SUPPORT: int = 3
+    BOUGHT_TOGETHER_MAX_PAIRS: int = 5_000_000
+    # Популярность: интервал сброса счётчиков из Redis (он же длина бакета),
+    # срок жизни несброшенного бакета, вес добавления в корзину
+    # и период полураспада оценки
+    POPULARITY_FLUSH_INTERVAL: int = 60
+    POPULARITY_BUCKET_TTL: int = 24 * 60 * 60
+    POPULARITY_CART_WEIGHT: float = 5.0
+    POPULARITY_HALF_LIFE_DAYS: float = 7.0
+    # Чтение каталога: orm (selectinload), json_agg (список одним запросом)
+    # или core (строки-кортежи без ORM-объектов, список и карточки)
+    CATALOG_READER: Literal["orm", "json_agg", "core"] = "orm"
+    # Чтение корзины и заказов: orm, core или cached (строки позиций без
+    # джойнов, данные продуктов — из кэша PRODUCT_DISPLAY_CACHE_SIZE)
+    CART_READER: Literal["orm", "core", "cached"] = "orm"
+    ORDER_READER: Literal["orm", "core", "cached"] = "orm"
+    # Хранилище живых корзин: db (carts/cart_items) или redis (хэш на
+    # пользователя с отложенной записью в БД); срок жизни корзины в Redis,
+    # интервал и размер пачки записи в БД
+    CART_STORE: Literal["db", "redis"] = "db"
+    CART_STORE_TTL: int = 30 * 24 * 60 * 60
+    CART_SYNC_INTERVAL: float = 5.0
+    CART_SYNC_BATCH_SIZE: int = 200
+
     # --- Outbox Processor ---
     OUTBOX_POLL_INTERVAL: float = 1.0
     OUTBOX_BATCH_SIZE: int = 100
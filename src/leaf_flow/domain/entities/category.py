@@ -5,4 +5,6 @@ from dataclasses import dataclass
 class CategoryEntity:
     slug: str
     label: str
-    sort_order: int = 0
\ No newline at end of file
+    sort_order: int = 0
+    # Активные продукты категории (только в публичном списке)
+    product_count: int = 0
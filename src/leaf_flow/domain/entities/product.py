@@ -31,6 +31,8 @@ class ProductImageEntity:
     variants: List[ProductImageVariantEntity]
     # устарело
     image_url: str | None = None
+    # «url 320w, url 640w» по вариантам; None — не собран при записи
+    srcset: str | None = None
 
 
 @dataclass(slots=True)
@@ -117,3 +119,6 @@ class ProductEntity:
     updated_at: datetime
     sort_order: int
     images: List[ProductImageEntity]
+    # Диапазон цен активных вариантов
+    min_price: Decimal | None = None
+    max_price: Decimal | None = None
@@ -0,0 +1,29 @@
+"""
+Доменные события каталога.
+
+Создаются при коммите транзакции, изменившей данные продуктов;
+по ним перестраивается read-модель каталога (документы продуктов).
+"""
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogProductsChangedEvent:
+    """
+    Событие изменения продуктов каталога.
+
+    Attributes:
+        product_ids: ID продуктов, чьи данные (сам продукт, варианты,
+            изображения, атрибуты, профили заваривания) изменились.
+    """
+    product_ids: tuple[str, ...]
+
+    def to_payload(self) -> dict[str, Any]:
+        """Сериализация в JSON-совместимый dict."""
+        return {"product_ids": list(self.product_ids)}
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> "CatalogProductsChangedEvent":
+        """Десериализация из payload."""
+        return cls(product_ids=tuple(payload["product_ids"]))
@@ -0,0 +1,463 @@
+"""
+Корзины в Redis с отложенной записью в PostgreSQL (CART_STORE=redis).
+
+Живая корзина пользователя — хэш cart:{user_id}; каждое изменение —
+один Lua-скрипт (атомарно относительно параллельных запросов того же
+пользователя), ответ собирается без запроса в БД. Изменённые корзины
+попадают в ZSET cart:dirty, откуда cart_sync_worker пачками переносит
+их в carts/cart_items; перед оформлением заказа корзина пишется в БД
+синхронно.
+
+Поля хэша:
+    v                  версия корзины (растёт при каждом изменении)
+    seq                счётчик позиций (порядок добавления)
+    u                  время изменения (unix)
+    q:{product}|{variant}  количество
+    p:{product}|{variant}  цена на момент добавления
+    s:{product}|{variant}  номер позиции
+
+Id корзины в этом хранилище — id пользователя: порты работают с cart_id,
+а строка carts нужна только при записи в БД.
+
+Название, изображения и вес варианта не хранятся в корзине: они общие
+для всех пользователей и берутся из ProductDisplayReader.
+"""
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Optional
+
+from redis.asyncio import Redis
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from leaf_flow.application.ports.cart import CartReader, CartWriter
+from leaf_flow.application.ports.cart_sync import CartSynchronizer
+from leaf_flow.application.ports.product_display import ProductDisplayReader
+from leaf_flow.config import settings
+from leaf_flow.domain.entities.cart import CartDetailEntity, CartEntity, CartItemEntity
+from leaf_flow.infrastructure.db.mappers.cart import map_cart_lines_to_detail
+from leaf_flow.infrastructure.db.models.cart import Cart, CartItem
+from leaf_flow.infrastructure.db.models.product import Product, ProductVariant
+from leaf_flow.infrastructure.db.repositories.cart import (
+    CartReaderRepository, CartWriterRepository
+)
+from leaf_flow.infrastructure.externals.redis.client import get_redis
+
+# KEYS: корзина, cart:dirty. ARGV общие: ttl, user_id, now.
+# Скрипты изменения возвращают -1, если корзины в Redis нет (истекла
+# между загрузкой и изменением) — вызывающий загружает её и повторяет.
+_TOUCH = """
+redis.call('HINCRBY', KEYS[1], 'v', 1)
+redis.call('HSET', KEYS[1], 'u', ARGV[3])
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+redis.call('ZADD', KEYS[2], 'NX', ARGV[3], ARGV[2])
+"""
+
+_ADD_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then return -1 end
+local f = ARGV[4]
+if redis.call('HEXISTS', KEYS[1], 'q:' .. f) == 0 then
+    local seq = redis.call('HINCRBY', KEYS[1], 'seq', 1)
+    redis.call('HSET', KEYS[1], 'p:' .. f, ARGV[6], 's:' .. f, seq)
+end
+local quantity = redis.call('HINCRBY', KEYS[1], 'q:' .. f, ARGV[5])
+""" + _TOUCH + """
+return quantity
+"""
+
+_SET_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then return -1 end
+local f = ARGV[4]
+if redis.call('HEXISTS', KEYS[1], 'q:' .. f) == 0 then return 0 end
+redis.call('HSET', KEYS[1], 'q:' .. f, ARGV[5])
+""" + _TOUCH + """
+return 1
+"""
+
+_REMOVE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then return -1 end
+local f = ARGV[4]
+redis.call('HDEL', KEYS[1], 'q:' .. f, 'p:' .. f, 's:' .. f)
+""" + _TOUCH + """
+return 1
+"""
+
+# ARGV[4..]: тройки field, quantity, price; пустой список — очистка
+_REPLACE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then return -1 end
+local version = redis.call('HGET', KEYS[1], 'v')
+redis.call('DEL', KEYS[1])
+redis.call('HSET', KEYS[1], 'v', version, 'seq', 0)
+for i = 4, #ARGV, 3 do
+    local seq = redis.call('HINCRBY', KEYS[1], 'seq', 1)
+    redis.call('HSET', KEYS[1],
+        'q:' .. ARGV[i], ARGV[i + 1], 'p:' .. ARGV[i], ARGV[i + 2], 's:' .. ARGV[i], seq)
+end
+""" + _TOUCH + """
+return 1
+"""
+
+# Загрузка корзины из БД: только если в Redis её ещё нет (без пометки dirty)
+_INSTALL_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then return 0 end
+redis.call('HSET', KEYS[1], 'v', 0, 'seq', 0, 'u', ARGV[3])
+for i = 4, #ARGV, 3 do
+    local seq = redis.call('HINCRBY', KEYS[1], 'seq', 1)
+    redis.call('HSET', KEYS[1],
+        'q:' .. ARGV[i], ARGV[i + 1], 'p:' .. ARGV[i], ARGV[i + 2], 's:' .. ARGV[i], seq)
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+# Корзина записана в БД в версии ARGV[2]: снять пометку, если с тех пор не менялась
+_MARK_CLEAN_SCRIPT = """
+local version = redis.call('HGET', KEYS[1], 'v')
+if version == false or version == ARGV[2] then
+    redis.call('ZREM', KEYS[2], ARGV[1])
+    return 1
+end
+return 0
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class CartLine:
+    product_id: str
+    variant_id: str
+    quantity: int
+    price: Decimal
+
+
+@dataclass(frozen=True, slots=True)
+class CartSnapshot:
+    version: int
+    updated_at: float
+    lines: list[CartLine]
+
+
+def _field(product_id: str, variant_id: str) -> str:
+    return f"{product_id}|{variant_id}"
+
+
+class RedisCartStore:
+    def __init__(self, ttl: int, prefix: str = "cart"):
+        """
+        Args:
+            ttl: Время жизни корзины в Redis без обращений (секунды);
+                должно с запасом превышать интервал записи в БД.
+            prefix: Префикс ключей Redis.
+        """
+        self._ttl = ttl
+        self._prefix = prefix
+        self.dirty_key = f"{prefix}:dirty"
+
+    @staticmethod
+    def _redis() -> Redis:
+        redis = get_redis()
+        if redis is None:
+            raise RuntimeError("Redis is required for CART_STORE=redis")
+        return redis
+
+    def _key(self, user_id: int) -> str:
+        return f"{self._prefix}:{user_id}"
+
+    async def _run(self, script: str, user_id: int, *args: object) -> Any:
+        return await self._redis().eval(
+            script, 2, self._key(user_id), self.dirty_key,
+            self._ttl, user_id, time.time(), *args,
+        )
+
+    async def snapshot(self, user_id: int) -> CartSnapshot | None:
+        """Корзина из Redis или None, если её там нет."""
+        redis = self._redis()
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.hgetall(self._key(user_id))
+            pipe.expire(self._key(user_id), self._ttl)
+            raw, _ = await pipe.execute()
+        if not raw:
+            return None
+
+        fields = {key.decode(): value.decode() for key, value in raw.items()}
+        lines: list[tuple[int, CartLine]] = []
+        for name, quantity in fields.items():
+            if not name.startswith("q:"):
+                continue
+            field = name[2:]
+            product_id, variant_id = field.split("|", 1)
+            lines.append((
+                int(fields.get(f"s:{field}", 0)),
+                CartLine(product_id, variant_id, int(quantity), Decimal(fields[f"p:{field}"])),
+            ))
+        lines.sort(key=lambda line: line[0])
+        return CartSnapshot(
+            version=int(fields.get("v", 0)),
+            updated_at=float(fields.get("u", 0)),
+            lines=[line for _, line in lines],
+        )
+
+    async def install(self, user_id: int, lines: list[CartLine]) -> None:
+        await self._run(_INSTALL_SCRIPT, user_id, *self._flatten(lines))
+
+    async def add(
+        self, user_id: int, product_id: str, variant_id: str, quantity: int, price: Decimal
+    ) -> int:
+        return await self._run(
+            _ADD_SCRIPT, user_id, _field(product_id, variant_id), quantity, str(price)
+        )
+
+    async def set_quantity(
+        self, user_id: int, product_id: str, variant_id: str, quantity: int
+    ) -> int:
+        """0 — позиции в корзине нет."""
+        return await self._run(_SET_SCRIPT, user_id, _field(product_id, variant_id), quantity)
+
+    async def remove(self, user_id: int, product_id: str, variant_id: str) -> int:
+        return await self._run(_REMOVE_SCRIPT, user_id, _field(product_id, variant_id))
+
+    async def replace(self, user_id: int, lines: list[CartLine]) -> int:
+        return await self._run(_REPLACE_SCRIPT, user_id, *self._flatten(lines))
+
+    async def delete(self, user_id: int) -> None:
+        redis = self._redis()
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.delete(self._key(user_id))
+            pipe.zrem(self.dirty_key, user_id)
+            await pipe.execute()
+
+    async def dirty_users(self, limit: int) -> list[int]:
+        """Пользователи с незаписанными корзинами, начиная с давно изменённых."""
+        members = await self._redis().zrange(self.dirty_key, 0, limit - 1)
+        return [int(member) for member in members]
+
+    async def mark_clean(self, user_id: int, version: int) -> bool:
+        return bool(await self._redis().eval(
+            _MARK_CLEAN_SCRIPT, 2, self._key(user_id), self.dirty_key, user_id, version
+        ))
+
+    @staticmethod
+    def _flatten(lines: list[CartLine]) -> list[object]:
+        args: list[object] = []
+        for line in lines:
+            args += [_field(line.product_id, line.variant_id), line.quantity, str(line.price)]
+        return args
+
+
+redis_cart_store = RedisCartStore(ttl=settings.CART_STORE_TTL)
+
+
+async def _load_db_lines(session: AsyncSession, user_id: int) -> list[CartLine] | None:
+    """Позиции корзины из БД; None — корзины в БД нет."""
+    cart_id = await session.scalar(select(Cart.id).where(Cart.user_id == user_id))
+    if cart_id is None:
+        return None
+    rows = (
+        await session.execute(
+            select(CartItem.product_id, CartItem.variant_id, CartItem.quantity, CartItem.price)
+            .where(CartItem.cart_id == cart_id)
+            .order_by(CartItem.id)
+        )
+    ).all()
+    return [CartLine(*row) for row in rows]
+
+
+async def _load_snapshot(
+    session: AsyncSession,
+    store: RedisCartStore,
+    user_id: int,
+) -> CartSnapshot | None:
+    """Корзина из Redis; при промахе — загрузить из БД. None — корзины нет нигде."""
+    snapshot = await store.snapshot(user_id)
+    if snapshot is not None:
+        return snapshot
+    lines = await _load_db_lines(session, user_id)
+    if lines is None:
+        return None
+    await store.install(user_id, lines)
+    return await store.snapshot(user_id)
+
+
+def _line_entities(snapshot: CartSnapshot | None) -> list[CartItemEntity]:
+    return [
+        CartItemEntity(
+            product_id=line.product_id,
+            variant_id=line.variant_id,
+            quantity=line.quantity,
+            price=line.price,
+        )
+        for line in (snapshot.lines if snapshot else [])
+    ]
+
+
+def _cart_entity(user_id: int, snapshot: CartSnapshot | None) -> CartEntity:
+    updated_at = snapshot.updated_at if snapshot and snapshot.updated_at else time.time()
+    return CartEntity(
+        id=user_id,
+        user_id=user_id,
+        updated_at=datetime.fromtimestamp(updated_at, tz=timezone.utc),
+    )
+
+
+class RedisCartReader(CartReader):
+    def __init__(
+        self,
+        session: AsyncSession,
+        store: RedisCartStore,
+        displays: ProductDisplayReader,
+    ):
+        self.session = session
+        self._store = store
+        self._displays = displays
+
+    async def _detail(self, snapshot: CartSnapshot | None) -> CartDetailEntity:
+        lines = _line_entities(snapshot)
+        displays = await self._displays.get_many({line.product_id for line in lines})
+        return map_cart_lines_to_detail(lines, displays)
+
+    async def get_cart(self, cart_id: int) -> CartDetailEntity:
+        return await self._detail(await _load_snapshot(self.session, self._store, cart_id))
+
+    async def get_cart_by_user(self, user_id: int) -> Optional[CartEntity]:
+        snapshot = await _load_snapshot(self.session, self._store, user_id)
+        return _cart_entity(user_id, snapshot) if snapshot is not None else None
+
+    async def get_cart_items_by_user(self, user_id: int) -> CartDetailEntity:
+        return await self.get_cart(user_id)
+
+
+class RedisCartWriter(CartWriter):
+    def __init__(self, session: AsyncSession, store: RedisCartStore):
+        self.session = session
+        self._store = store
+
+    async def _retry(self, user_id: int, call: Callable[[], Awaitable[Any]]) -> Any:
+        result = await call()
+        if result == -1:
+            # Корзина истекла в Redis между чтением и изменением
+            await self._store.install(user_id, await _load_db_lines(self.session, user_id) or [])
+            result = await call()
+        return result
+
+    async def create_cart(self, user_id: int) -> CartEntity:
+        await self._store.install(user_id, [])
+        return _cart_entity(user_id, None)
+
+    async def clear(self, cart_id: int) -> None:
+        await self._retry(cart_id, lambda: self._store.replace(cart_id, []))
+
+    async def _lines(self, user_id: int) -> list[CartItemEntity]:
+        return _line_entities(await self._store.snapshot(user_id))
+
+    async def upsert_item(
+        self, cart_id: int,
+        product_id: str,
+        variant_id: str,
+        quantity: int,
+        price: Decimal
+    ) -> list[CartItemEntity]:
+        await self._retry(
+            cart_id,
+            lambda: self._store.add(cart_id, product_id, variant_id, quantity, price),
+        )
+        return await self._lines(cart_id)
+
+    async def replace_items(
+        self,
+        cart_id: int,
+        items: list[tuple[str, str, int, Decimal]]
+    ) -> list[CartItemEntity]:
+        lines = [CartLine(*item) for item in items]
+        await self._retry(cart_id, lambda: self._store.replace(cart_id, lines))
+        return await self._lines(cart_id)
+
+    async def set_quantity(
+        self,
+        cart_id: int,
+        product_id: str,
+        variant_id: str,
+        quantity: int
+    ) -> list[CartItemEntity] | None:
+        found = await self._retry(
+            cart_id,
+            lambda: self._store.set_quantity(cart_id, product_id, variant_id, quantity),
+        )
+        if not found:
+            return None
+        return await self._lines(cart_id)
+
+    async def remove_item(
+        self,
+        cart_id: int,
+        product_id: str,
+        variant_id: str
+    ) -> list[CartItemEntity]:
+        await self._retry(
+            cart_id, lambda: self._store.remove(cart_id, product_id, variant_id)
+        )
+        return await self._lines(cart_id)
+
+    async def delete_by_user_id(self, user_id: int) -> bool:
+        await self._store.delete(user_id)
+        return await CartWriterRepository(self.session).delete_by_user_id(user_id)
+
+
+class RedisCartSynchronizer(CartSynchronizer):
+    """Запись корзин из Redis в carts/cart_items."""
+
+    def __init__(self, session: AsyncSession, store: RedisCartStore):
+        self.session = session
+        self._store = store
+
+    async def _write(self, user_id: int, snapshot: CartSnapshot) -> None:
+        lines = snapshot.lines
+        if lines:
+            # Позиции снятых с продажи вариантов в БД не пишутся
+            active = set(
+                (
+                    await self.session.execute(
+                        select(ProductVariant.product_id, ProductVariant.id)
+                        .join(Product, Product.id == ProductVariant.product_id)
+                        .where(
+                            tuple_(ProductVariant.product_id, ProductVariant.id).in_(
+                                [(line.product_id, line.variant_id) for line in lines]
+                            ),
+                            Product.is_active.is_(True),
+                            ProductVariant.is_active.is_(True),
+                        )
+                    )
+                ).tuples().all()
+            )
+            lines = [line for line in lines if (line.product_id, line.variant_id) in active]
+
+        cart = await CartReaderRepository(self.session).get_cart_by_user(user_id)
+        writer = CartWriterRepository(self.session)
+        if cart is None:
+            cart = await writer.create_cart(user_id)
+        await writer.replace_items(
+            cart.id,
+            [(line.product_id, line.variant_id, line.quantity, line.price) for line in lines],
+        )
+
+    async def sync(self, user_id: int) -> None:
+        snapshot = await self._store.snapshot(user_id)
+        if snapshot is not None:
+            await self._write(user_id, snapshot)
+
+    async def sync_dirty(self, limit: int) -> int:
+        written: list[tuple[int, int]] = []
+        for user_id in await self._store.dirty_users(limit):
+            snapshot = await self._store.snapshot(user_id)
+            if snapshot is not None:
+                await self._write(user_id, snapshot)
+                written.append((user_id, snapshot.version))
+            else:
+                # Корзина истекла в Redis: в БД остаётся последняя записанная
+                written.append((user_id, -1))
+
+        await self.session.commit()
+        # Пометка снимается только после коммита и только с записанной версии
+        for user_id, version in written:
+            await self._store.mark_clean(user_id, version)
+        return len(written)
@@ -0,0 +1,343 @@
+"""
+Двухуровневый кэш чтения каталога.
+
+Уровень 1 — LRU в памяти воркера, уровень 2 — общий Redis.
+Все ключи живут внутри «поколения» каталога: инвалидация увеличивает
+счётчик поколения в Redis, после чего старые ключи перестают читаться
+во всех воркерах (в Redis они доживают до истечения TTL).
+
+Вместе с поколением ведётся журнал изменённых продуктов за последние
+changelog_size поколений — по нему in-memory индексы каталога
+обновляются инкрементально, а не перестраиваются целиком.
+
+Записи Redis — pickle сущностей и DTO, поэтому в их ключ входит отпечаток
+определений этих классов: при выкладке воркеры разных версий не читают
+записи друг друга, а делят только поколение и журнал.
+"""
+import dataclasses
+import enum
+import hashlib
+import importlib
+import logging
+import pickle
+import pkgutil
+import time
+from typing import Any, Iterable, Mapping, Sequence
+
+from redis.exceptions import RedisError
+
+from leaf_flow.application.dto.cache import CacheStats
+from leaf_flow.application.ports.catalog_cache import CatalogCache
+from leaf_flow.config import settings
+from leaf_flow.infrastructure.cache.lru import LRUCache
+from leaf_flow.infrastructure.externals.redis.client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Атомарно: новое поколение + записи журнала «поколение:product_id» с ним же
+_INVALIDATE_SCRIPT = """
+local generation = redis.call('INCR', KEYS[1])
+for i = 2, #ARGV do
+    redis.call('ZADD', KEYS[2], generation, generation .. ':' .. ARGV[i])
+end
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', generation - tonumber(ARGV[1]))
+return generation
+"""
+
+
+def schema_version() -> str:
+    """Отпечаток dataclass'ов и перечислений из domain.entities и application.dto."""
+    import leaf_flow.application.dto
+    import leaf_flow.domain.entities
+
+    parts: list[str] = []
+    for package in (leaf_flow.domain.entities, leaf_flow.application.dto):
+        for info in sorted(pkgutil.iter_modules(package.__path__), key=lambda i: i.name):
+            module = importlib.import_module(f"{package.__name__}.{info.name}")
+            for name, obj in sorted(vars(module).items()):
+                if getattr(obj, "__module__", None) != module.__name__:
+                    continue
+                if dataclasses.is_dataclass(obj):
+                    members = [f"{f.name}:{f.type}" for f in dataclasses.fields(obj)]
+                elif isinstance(obj, type) and issubclass(obj, enum.Enum):
+                    members = [member.name for member in obj]
+                else:
+                    continue
+                parts.append(f"{module.__name__}.{name}({','.join(members)})")
+    return hashlib.sha1("\n".join(parts).encode()).hexdigest()[:12]
+
+
+class TwoTierCatalogCache(CatalogCache):
+    def __init__(
+        self,
+        local_size: int,
+        ttl: int,
+        generation_ttl: float,
+        changelog_size: int,
+        prefix: str = "catalog",
+        version: str = "",
+    ):
+        """
+        Args:
+            local_size: Максимальное число записей в памяти воркера.
+            ttl: Время жизни записи в Redis (секунды).
+            generation_ttl: Как долго воркер доверяет закэшированному
+                номеру поколения, не перечитывая его из Redis (секунды).
+            changelog_size: Сколько последних поколений хранить в журнале
+                изменений продуктов.
+            prefix: Префикс ключей в Redis.
+            version: Версия формата записей — входит в ключи записей
+                (но не поколения и журнала).
+        """
+        self._local: LRUCache[Any] = LRUCache(local_size)
+        self._ttl = ttl
+        self._generation_ttl = generation_ttl
+        self._entries_prefix = f"{prefix}:{version}" if version else prefix
+        self._generation_key = f"{prefix}:generation"
+        self._changelog_key = f"{prefix}:changelog"
+        self._changelog_size = changelog_size
+        self._generation = 0
+        self._generation_checked_at: float | None = None
+        self._redis_hits = 0
+        self._misses = 0
+        self._invalidations = 0
+        self._redis_errors = 0
+
+    async def _current_generation(self) -> int | None:
+        """
+        Текущее поколение каталога.
+
+        Возвращает None, если Redis недоступен: в этом случае кэш
+        обходится целиком, чтобы не отдавать устаревшие данные.
+        """
+        redis = get_redis()
+        if redis is None:
+            return self._generation
+
+        now = time.monotonic()
+        if (
+            self._generation_checked_at is not None
+            and now - self._generation_checked_at < self._generation_ttl
+        ):
+            return self._generation
+
+        try:
+            raw = await redis.get(self._generation_key)
+        except RedisError as e:
+            self._redis_errors += 1
+            logger.warning(f"Catalog cache generation check failed: {e}")
+            return None
+
+        self._set_generation(int(raw or 0))
+        self._generation_checked_at = now
+        return self._generation
+
+    def _set_generation(self, generation: int) -> None:
+        if generation != self._generation:
+            self._local.clear()
+            self._generation = generation
+
+    def _redis_key(self, generation: int, key: str) -> str:
+        return f"{self._entries_prefix}:{generation}:{key}"
+
+    async def get(self, key: str) -> tuple[Any | None, int | None]:
+        """
+        Значение и поколение, в котором его искали. Промах сохраняется
+        через set с этим поколением: если каталог успел измениться,
+        собранное по старым данным значение не записывается.
+        """
+        generation = await self._current_generation()
+        if generation is None:
+            self._misses += 1
+            return None, None
+
+        value = self._local.get(key)
+        if value is not None:
+            return value, generation
+
+        redis = get_redis()
+        if redis is not None:
+            try:
+                raw = await redis.get(self._redis_key(generation, key))
+            except RedisError as e:
+                self._redis_errors += 1
+                logger.warning(f"Catalog cache read failed for {key}: {e}")
+                raw = None
+
+            if raw is not None:
+                self._redis_hits += 1
+                value = pickle.loads(raw)
+                self._local.set(key, value)
+                return value, generation
+
+        self._misses += 1
+        return None, generation
+
+    async def _still_current(self, generation: int | None) -> bool:
+        # Поколение сменилось между чтением и записью — значение могло
+        # быть собрано по данным до изменения, его не сохраняем
+        return generation is not None and await self._current_generation() == generation
+
+    async def set(self, key: str, value: Any, generation: int | None) -> None:
+        if not await self._still_current(generation):
+            return
+
+        self._local.set(key, value)
+
+        redis = get_redis()
+        if redis is None:
+            return
+
+        try:
+            await redis.set(
+                self._redis_key(generation, key),
+                pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+                ex=self._ttl,
+            )
+        except RedisError as e:
+            self._redis_errors += 1
+            logger.warning(f"Catalog cache write failed for {key}: {e}")
+
+    async def get_many(self, keys: Sequence[str]) -> tuple[dict[str, Any], int | None]:
+        """Пакетное чтение: локальный уровень, затем один MGET в Redis."""
+        generation = await self._current_generation()
+        if generation is None:
+            self._misses += len(keys)
+            return {}, None
+
+        found: dict[str, Any] = {}
+        missing: list[str] = []
+        for key in keys:
+            value = self._local.get(key)
+            if value is not None:
+                found[key] = value
+            else:
+                missing.append(key)
+
+        redis = get_redis()
+        if redis is not None and missing:
+            try:
+                raws = await redis.mget([self._redis_key(generation, key) for key in missing])
+            except RedisError as e:
+                self._redis_errors += 1
+                logger.warning(f"Catalog cache batch read failed: {e}")
+                raws = [None] * len(missing)
+
+            for key, raw in zip(missing, raws):
+                if raw is not None:
+                    self._redis_hits += 1
+                    value = pickle.loads(raw)
+                    self._local.set(key, value)
+                    found[key] = value
+
+        self._misses += len(keys) - len(found)
+        return found, generation
+
+    async def set_many(self, values: Mapping[str, Any], generation: int | None) -> None:
+        if not values or not await self._still_current(generation):
+            return
+
+        for key, value in values.items():
+            self._local.set(key, value)
+
+        redis = get_redis()
+        if redis is None:
+            return
+
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                for key, value in values.items():
+                    pipe.set(
+                        self._redis_key(generation, key),
+                        pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+                        ex=self._ttl,
+                    )
+                await pipe.execute()
+        except RedisError as e:
+            self._redis_errors += 1
+            logger.warning(f"Catalog cache batch write failed: {e}")
+
+    async def invalidate(self, product_ids: Iterable[str]) -> None:
+        """Сбросить кэш каталога во всех воркерах."""
+        self._invalidations += 1
+        product_ids = sorted(product_ids)
+        logger.debug(f"Invalidating catalog cache, changed products: {product_ids}")
+
+        redis = get_redis()
+        if redis is None:
+            self._set_generation(self._generation + 1)
+            return
+
+        try:
+            generation = await redis.eval(
+                _INVALIDATE_SCRIPT,
+                2,
+                self._generation_key,
+                self._changelog_key,
+                self._changelog_size,
+                *product_ids,
+            )
+        except RedisError as e:
+            self._redis_errors += 1
+            logger.error(f"Catalog cache invalidation failed: {e}")
+            # Хотя бы локальный уровень этого воркера не должен отдавать старое
+            self._local.clear()
+            self._generation_checked_at = None
+            return
+
+        self._set_generation(int(generation))
+        self._generation_checked_at = time.monotonic()
+
+    async def changes_since(self, generation: int) -> tuple[int, frozenset[str] | None]:
+        """
+        Текущее поколение и продукты, изменённые после generation.
+
+        Вместо множества возвращается None, если журнал не покрывает
+        интервал целиком и читателю нужно перестроить данные полностью.
+
+        Raises:
+            RedisError: если Redis недоступен.
+        """
+        redis = get_redis()
+        if redis is None:
+            current = self._generation
+            return current, (frozenset() if generation == current else None)
+
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.get(self._generation_key)
+            pipe.zrangebyscore(self._changelog_key, f"({generation}", "+inf")
+            raw_generation, entries = await pipe.execute()
+
+        current = int(raw_generation or 0)
+        if generation == current:
+            return current, frozenset()
+        if not current - self._changelog_size <= generation < current:
+            return current, None
+
+        changed = frozenset(
+            (entry.decode() if isinstance(entry, bytes) else entry).split(":", 1)[1]
+            for entry in entries
+        )
+        return current, changed
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            local_hits=self._local.hits,
+            redis_hits=self._redis_hits,
+            misses=self._misses,
+            evictions=self._local.evictions,
+            invalidations=self._invalidations,
+            redis_errors=self._redis_errors,
+            local_size=len(self._local),
+            local_maxsize=self._local.maxsize,
+            generation=self._generation,
+        )
+
+
+catalog_cache = TwoTierCatalogCache(
+    local_size=settings.CATALOG_CACHE_LOCAL_SIZE,
+    ttl=settings.CATALOG_CACHE_TTL,
+    generation_ttl=settings.CATALOG_CACHE_GENERATION_TTL,
+    changelog_size=settings.CATALOG_CHANGELOG_SIZE,
+    version=schema_version(),
+)
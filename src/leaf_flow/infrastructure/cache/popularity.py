@@ -0,0 +1,136 @@
+"""
+Счётчики популярности продуктов в Redis.
+
+Запись события — один pipeline без транзакции: HINCRBY в хэш бакета,
+PFADD посетителя в HyperLogLog продукта и пометка бакета в ZSET.
+Бакет — интервал bucket_seconds; закрытые бакеты забирает и удаляет
+popularity_worker. Ключи бакета живут ttl секунд, чтобы Redis не
+копил данные, если воркер остановлен.
+
+Ключи:
+    {prefix}:buckets                       ZSET бакетов с событиями
+    {prefix}:{bucket}:views                HASH product_id → просмотры
+    {prefix}:{bucket}:carts                HASH product_id → добавления в корзину
+    {prefix}:{bucket}:visitors:{product}   HyperLogLog посетителей
+"""
+import logging
+import time
+from typing import Sequence
+
+from redis.exceptions import RedisError
+
+from leaf_flow.application.dto.catalog import ProductStatsDelta
+from leaf_flow.application.ports.popularity import PopularityCounters
+from leaf_flow.config import settings
+from leaf_flow.infrastructure.externals.redis.client import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+class RedisPopularityCounters(PopularityCounters):
+    def __init__(self, bucket_seconds: int, ttl: int, prefix: str = "popularity"):
+        """
+        Args:
+            bucket_seconds: Длина бакета (секунды).
+            ttl: Время жизни ключей бакета (секунды).
+            prefix: Префикс ключей Redis.
+        """
+        self._bucket_seconds = bucket_seconds
+        self._ttl = ttl
+        self._prefix = prefix
+        self._buckets_key = f"{prefix}:buckets"
+
+    def _current_bucket(self) -> int:
+        return int(time.time() // self._bucket_seconds)
+
+    def bucket_started_at(self, bucket: int) -> float:
+        return float(bucket * self._bucket_seconds)
+
+    def _key(self, bucket: int, name: str) -> str:
+        return f"{self._prefix}:{bucket}:{name}"
+
+    async def _record(self, counter: str, product_id: str, visitor: str) -> None:
+        redis = get_redis()
+        if redis is None:
+            return
+
+        bucket = self._current_bucket()
+        counter_key = self._key(bucket, counter)
+        visitors_key = self._key(bucket, f"visitors:{product_id}")
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.hincrby(counter_key, product_id, 1)
+                pipe.expire(counter_key, self._ttl)
+                pipe.pfadd(visitors_key, visitor)
+                pipe.expire(visitors_key, self._ttl)
+                pipe.zadd(self._buckets_key, {str(bucket): bucket})
+                await pipe.execute()
+        except RedisError as e:
+            # Счётчик — не критичные данные: событие теряется, запрос — нет
+            logger.warning(f"Popularity counter write failed for {product_id}: {e}")
+
+    async def record_view(self, product_id: str, visitor: str) -> None:
+        await self._record("views", product_id, visitor)
+
+    async def record_add_to_cart(self, product_id: str, visitor: str) -> None:
+        await self._record("carts", product_id, visitor)
+
+    async def closed_buckets(self) -> list[int]:
+        redis = get_redis()
+        if redis is None:
+            return []
+        # Бакет закрывается с запасом в один интервал: запрос, начатый
+        # в конце бакета, должен успеть дописать в него событие
+        members = await redis.zrangebyscore(
+            self._buckets_key, "-inf", f"({self._current_bucket() - 1}"
+        )
+        return [int(member) for member in members]
+
+    async def read_bucket(self, bucket: int) -> Sequence[ProductStatsDelta]:
+        redis = get_redis()
+        if redis is None:
+            return []
+
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.hgetall(self._key(bucket, "views"))
+            pipe.hgetall(self._key(bucket, "carts"))
+            raw_views, raw_carts = await pipe.execute()
+        views = {key.decode(): int(value) for key, value in raw_views.items()}
+        carts = {key.decode(): int(value) for key, value in raw_carts.items()}
+
+        product_ids = sorted(views.keys() | carts.keys())
+        if not product_ids:
+            return []
+        async with redis.pipeline(transaction=False) as pipe:
+            for product_id in product_ids:
+                pipe.pfcount(self._key(bucket, f"visitors:{product_id}"))
+            visitors = await pipe.execute()
+
+        return [
+            ProductStatsDelta(
+                product_id=product_id,
+                views=views.get(product_id, 0),
+                add_to_carts=carts.get(product_id, 0),
+                visitors=count,
+            )
+            for product_id, count in zip(product_ids, visitors)
+        ]
+
+    async def delete_bucket(self, bucket: int, product_ids: Sequence[str]) -> None:
+        redis = get_redis()
+        if redis is None:
+            return
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.delete(
+                self._key(bucket, "views"),
+                self._key(bucket, "carts"),
+                *(self._key(bucket, f"visitors:{product_id}") for product_id in product_ids),
+            )
+            pipe.zrem(self._buckets_key, str(bucket))
+            await pipe.execute()
+
+
+popularity_counters = RedisPopularityCounters(
+    bucket_seconds=settings.POPULARITY_FLUSH_INTERVAL,
+    ttl=settings.POPULARITY_BUCKET_TTL,
+)
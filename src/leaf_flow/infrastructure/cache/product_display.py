@@ -0,0 +1,154 @@
+"""
+Данные продуктов для строк корзины и заказа.
+
+Название, изображения и вес вариантов одинаковы для всех пользователей,
+поэтому держатся в ограниченном LRU воркера по id продукта. Версия кэша —
+поколение каталога: при его смене из кэша удаляются только продукты из
+журнала изменений (админские изменения продуктов, вариантов и изображений
+попадают туда через mark_products_changed), а если журнал не покрывает
+интервал — кэш очищается целиком. Промахи загружаются одним запросом.
+"""
+import logging
+import time
+from typing import Collection
+
+from redis.exceptions import RedisError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from leaf_flow.application.dto.catalog import ProductDisplay
+from leaf_flow.application.ports.catalog_cache import CatalogCache
+from leaf_flow.application.ports.product_display import ProductDisplayReader
+from leaf_flow.config import settings
+from leaf_flow.infrastructure.cache.catalog import catalog_cache
+from leaf_flow.infrastructure.cache.lru import LRUCache
+from leaf_flow.infrastructure.db.models.product import Product, ProductVariant
+from leaf_flow.infrastructure.db.repositories.product import _id_in
+from leaf_flow.infrastructure.db.repositories.product_core import load_images
+
+logger = logging.getLogger(__name__)
+
+
+class ProductDisplayCache:
+    def __init__(self, catalog: CatalogCache, maxsize: int, check_interval: float):
+        """
+        Args:
+            catalog: Кэш каталога — источник поколения и журнала изменений.
+            maxsize: Максимальное число продуктов в памяти воркера.
+            check_interval: Как долго не перечитывать поколение (секунды).
+        """
+        self._catalog = catalog
+        self._local: LRUCache[ProductDisplay] = LRUCache(maxsize)
+        self._check_interval = check_interval
+        self._generation: int | None = None
+        self._checked_at: float | None = None
+
+    async def _sync(self) -> bool:
+        """Сверить версию с поколением каталога; False — кэш сейчас не использовать."""
+        now = time.monotonic()
+        if (
+            self._generation is not None
+            and self._checked_at is not None
+            and now - self._checked_at < self._check_interval
+        ):
+            return True
+
+        try:
+            generation, changed = await self._catalog.changes_since(self._generation or 0)
+        except RedisError as e:
+            logger.warning(f"Product display cache version check failed: {e}")
+            self._local.clear()
+            self._generation = None
+            return False
+
+        if self._generation is None or changed is None:
+            self._local.clear()
+        else:
+            for product_id in changed:
+                self._local.pop(product_id)
+        self._generation = generation
+        self._checked_at = now
+        return True
+
+    async def get_many(
+        self, product_ids: Collection[str]
+    ) -> tuple[dict[str, ProductDisplay], int | None]:
+        """Найденные записи и версия, с которой можно сохранить промахи."""
+        if not await self._sync():
+            return {}, None
+        found: dict[str, ProductDisplay] = {}
+        for product_id in product_ids:
+            display = self._local.get(product_id)
+            if display is not None:
+                found[product_id] = display
+        return found, self._generation
+
+    def set_many(self, displays: dict[str, ProductDisplay], generation: int | None) -> None:
+        # Данные прочитаны при другой версии — могли устареть, не сохраняем
+        if generation is None or generation != self._generation:
+            return
+        for product_id, display in displays.items():
+            self._local.set(product_id, display)
+
+
+class CachedProductDisplayReader(ProductDisplayReader):
+    def __init__(self, session: AsyncSession, cache: ProductDisplayCache):
+        self.session = session
+        self._cache = cache
+
+    async def get_many(self, product_ids: Collection[str]) -> dict[str, ProductDisplay]:
+        if not product_ids:
+            return {}
+        displays, generation = await self._cache.get_many(product_ids)
+        missing = [product_id for product_id in product_ids if product_id not in displays]
+        if missing:
+            loaded = await self._load(missing)
+            self._cache.set_many(loaded, generation)
+            displays.update(loaded)
+        return displays
+
+    async def _load(self, product_ids: list[str]) -> dict[str, ProductDisplay]:
+        rows = (
+            await self.session.execute(
+                select(
+                    Product.id, Product.name, Product.image, Product.is_active,
+                    ProductVariant.id, ProductVariant.weight, ProductVariant.is_active,
+                )
+                .outerjoin(ProductVariant, ProductVariant.product_id == Product.id)
+                .where(_id_in(product_ids, Product.id))
+            )
+        ).all()
+        if not rows:
+            return {}
+        images = await load_images(self.session, product_ids)
+
+        products: dict[str, tuple[str, str, bool]] = {}
+        weights: dict[str, dict[str, str]] = {}
+        active_variants: dict[str, set[str]] = {}
+        for product_id, name, image, is_active, variant_id, weight, variant_active in rows:
+            products[product_id] = (name, image, is_active)
+            weights.setdefault(product_id, {})
+            active_variants.setdefault(product_id, set())
+            if variant_id is not None:
+                weights[product_id][variant_id] = weight
+                if variant_active:
+                    active_variants[product_id].add(variant_id)
+
+        return {
+            product_id: ProductDisplay(
+                name=name,
+                image=image,
+                is_active=is_active,
+                images=images.get(product_id, []),
+                weights=weights[product_id],
+                active_variant_ids=frozenset(active_variants[product_id]),
+            )
+            for product_id, (name, image, is_active) in products.items()
+        }
+
+
+product_display_cache = ProductDisplayCache(
+    catalog=catalog_cache,
+    maxsize=settings.PRODUCT_DISPLAY_CACHE_SIZE,
+    check_interval=settings.CATALOG_CACHE_GENERATION_TTL,
+)
@@ -0,0 +1,62 @@
+"""Автомат Ахо–Корасик: поиск всех вхождений набора шаблонов за один проход."""
+from collections import deque
+from typing import Generic, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+
+class AhoCorasick(Generic[T]):
+    def __init__(self, patterns: Iterable[tuple[str, T]]):
+        """
+        Args:
+            patterns: Пары (шаблон, значение); значение возвращается
+                вместе с каждым найденным вхождением шаблона.
+        """
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[tuple[int, T]]] = [[]]
+
+        for pattern, payload in patterns:
+            if pattern:
+                self._insert(pattern, payload)
+        self._link()
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+    def _insert(self, pattern: str, payload: T) -> None:
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[state][char] = next_state
+            state = next_state
+        self._out[state].append((len(pattern), payload))
+
+    def _link(self) -> None:
+        """Суффиксные ссылки обходом в ширину; выходы наследуются по ним."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._out[next_state].extend(self._out[self._fail[next_state]])
+
+    def search(self, text: str) -> Iterator[tuple[int, int, T]]:
+        """Все вхождения шаблонов как (начало, конец, значение)."""
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for length, payload in self._out[state]:
+                yield position + 1 - length, position + 1, payload
@@ -0,0 +1,160 @@
+"""
+Счётчик совместных покупок («С этим покупают»).
+
+Заказы читаются потоком, пары продуктов корзины кодируются в int64
+(номер_a << 32 | номер_b) и копятся в буфере фиксированного размера.
+Заполненный буфер сворачивается np.unique в отсортированный массив
+уникальных пар со счётчиками — разреженную матрицу совместных покупок.
+
+Память ограничена буфером и max_pairs: если уникальных пар больше,
+редкие пары отбрасываются (lossy counting), и счётчик оставшейся пары
+может оказаться занижен не больше чем на pruned_below. Пока этот порог
+заметно ниже min_support, рекомендации практически не меняются.
+"""
+from itertools import combinations
+from typing import Collection, Iterable
+
+import numpy as np
+
+from leaf_flow.application.dto.catalog import ProductPairScore
+
+_SHIFT = np.int64(32)
+_LOW_MASK = np.int64(0xFFFF_FFFF)
+
+
+class CooccurrenceCounter:
+    def __init__(
+        self,
+        buffer_size: int = 1_000_000,
+        max_pairs: int = 5_000_000,
+        max_basket_size: int = 30,
+    ):
+        """
+        Args:
+            buffer_size: Пар в буфере до свёртки.
+            max_pairs: Предел уникальных пар в памяти.
+            max_basket_size: Корзины больше (оптовые заказы) пропускаются —
+                они дают квадратичное число пар и мало говорят о сочетаниях.
+        """
+        self.baskets = 0
+        self.pruned_below = 0
+        self._max_pairs = max_pairs
+        self._max_basket_size = max_basket_size
+        self._ordinals: dict[str, int] = {}
+        self._product_ids: list[str] = []
+        self._product_counts: list[int] = []
+        self._buffer = np.empty(buffer_size, dtype=np.int64)
+        self._buffered = 0
+        self._keys = np.empty(0, dtype=np.int64)
+        self._counts = np.empty(0, dtype=np.int64)
+
+    @property
+    def pairs(self) -> int:
+        self._flush()
+        return len(self._keys)
+
+    def _ordinal(self, product_id: str) -> int:
+        ordinal = self._ordinals.get(product_id)
+        if ordinal is None:
+            ordinal = self._ordinals[product_id] = len(self._product_ids)
+            self._product_ids.append(product_id)
+            self._product_counts.append(0)
+        return ordinal
+
+    def add(self, basket: Iterable[str]) -> None:
+        """Учесть корзину одного заказа (повторы продукта не важны)."""
+        ordinals = sorted({self._ordinal(product_id) for product_id in basket})
+        if not ordinals or len(ordinals) > self._max_basket_size:
+            return
+
+        self.baskets += 1
+        for ordinal in ordinals:
+            self._product_counts[ordinal] += 1
+
+        size = len(ordinals) * (len(ordinals) - 1) // 2
+        if not size:
+            return
+        if self._buffered + size > len(self._buffer):
+            self._flush()
+        self._buffer[self._buffered:self._buffered + size] = np.fromiter(
+            ((a << 32) | b for a, b in combinations(ordinals, 2)), dtype=np.int64, count=size
+        )
+        self._buffered += size
+
+    def _flush(self) -> None:
+        if not self._buffered:
+            return
+        keys, counts = np.unique(self._buffer[:self._buffered], return_counts=True)
+        self._buffered = 0
+
+        merged, inverse = np.unique(
+            np.concatenate((self._keys, keys)), return_inverse=True
+        )
+        self._counts = np.bincount(
+            inverse, weights=np.concatenate((self._counts, counts)), minlength=len(merged)
+        ).astype(np.int64)
+        self._keys = merged
+
+        while len(self._keys) > self._max_pairs:
+            self.pruned_below += 1
+            keep = self._counts > self.pruned_below
+            self._keys, self._counts = self._keys[keep], self._counts[keep]
+
+    def top_pairs(
+        self,
+        k: int,
+        min_support: int = 3,
+        allowed: Collection[str] | None = None,
+    ) -> dict[str, list[ProductPairScore]]:
+        """
+        До k пар на продукт, от самой сильной.
+
+        Для пары a → b: support — число заказов с обоими продуктами,
+        confidence = support / заказов с a, lift = confidence / доля заказов с b.
+        Берутся пары с lift > 1 (b с a покупают чаще, чем вообще), порядок —
+        по confidence, затем по support. allowed ограничивает оба конца пары.
+        """
+        self._flush()
+        if not len(self._keys) or k <= 0:
+            return {}
+
+        keep = self._counts >= min_support
+        first = (self._keys[keep] >> _SHIFT).astype(np.int64)
+        second = (self._keys[keep] & _LOW_MASK).astype(np.int64)
+        support = self._counts[keep]
+
+        # Пара несимметрична по confidence: разворачиваем в обе стороны
+        source = np.concatenate((first, second))
+        target = np.concatenate((second, first))
+        support = np.concatenate((support, support))
+
+        product_counts = np.asarray(self._product_counts, dtype=np.float64)
+        confidence = support / product_counts[source]
+        lift = confidence * self.baskets / product_counts[target]
+
+        mask = lift > 1.0
+        if allowed is not None:
+            allowed_mask = np.isin(self._product_ids, list(allowed))
+            mask &= allowed_mask[source] & allowed_mask[target]
+        source, target = source[mask], target[mask]
+        support, confidence, lift = support[mask], confidence[mask], lift[mask]
+
+        order = np.lexsort((target, -support, -confidence, source))
+        source, target = source[order], target[order]
+        support, confidence, lift = support[order], confidence[order], lift[order]
+
+        # Номер пары внутри группы своего source
+        starts = np.flatnonzero(np.r_[True, source[1:] != source[:-1]])
+        ranks = np.arange(len(source)) - np.repeat(starts, np.diff(np.r_[starts, len(source)]))
+
+        result: dict[str, list[ProductPairScore]] = {}
+        for i in np.flatnonzero(ranks < k):
+            result.setdefault(self._product_ids[source[i]], []).append(
+                ProductPairScore(
+                    product_id=self._product_ids[target[i]],
+                    support=int(support[i]),
+                    confidence=round(float(confidence[i]), 6),
+                    lift=round(float(lift[i]), 6),
+                )
+            )
+        return result
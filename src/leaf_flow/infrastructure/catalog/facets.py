@@ -0,0 +1,196 @@
+"""
+In-memory индекс фасетов каталога.
+
+Каждому активному продукту выдаётся порядковый номер (ordinal), а каждому
+значению атрибута и каждой категории — битсет (Python int) над этими
+номерами. Фильтрация и подсчёт фасетов сводятся к AND/OR над битсетами
+и bit_count() — без join'ов по таблице связей на каждый запрос.
+"""
+from collections import defaultdict
+from typing import Collection, Iterable, Sequence, cast
+
+from leaf_flow.application.dto.catalog import Facet, FacetValue, ProductFacetSource
+from leaf_flow.application.ports.catalog_index import FacetIndex
+from leaf_flow.domain.entities.product import ProductAttributesEntity
+
+
+class BitmapFacetIndex(FacetIndex):
+    def __init__(self) -> None:
+        self.generation: int | None = None
+        self._attributes: list[ProductAttributesEntity] = []
+        self._value_ids: dict[tuple[str, str], int] = {}
+        self._reset_products()
+
+    def _reset_products(self) -> None:
+        self._ordinals: dict[str, int] = {}
+        self._product_ids: list[str | None] = []
+        self._free: list[int] = []
+        self._state: dict[int, tuple[str, frozenset[int]]] = {}
+        self._active = 0
+        self._categories: dict[str, int] = defaultdict(int)
+        self._values: dict[int, int] = defaultdict(int)
+
+    @property
+    def ready(self) -> bool:
+        return self.generation is not None
+
+    @property
+    def size(self) -> int:
+        return len(self._ordinals)
+
+    def set_attributes(self, attributes: Iterable[ProductAttributesEntity]) -> None:
+        self._attributes = [
+            attribute for attribute in attributes if attribute.is_active
+        ]
+        self._value_ids = {
+            (attribute.code, value.slug): value.id
+            for attribute in self._attributes
+            for value in attribute.values
+            if value.is_active
+        }
+
+    def rebuild(
+        self,
+        attributes: Iterable[ProductAttributesEntity],
+        products: Iterable[ProductFacetSource],
+        generation: int,
+    ) -> None:
+        """Построить индекс заново (заодно уплотняет номера продуктов)."""
+        self.set_attributes(attributes)
+        self._reset_products()
+        self.apply(products, (), generation)
+
+    def apply(
+        self,
+        products: Iterable[ProductFacetSource],
+        removed: Iterable[str],
+        generation: int,
+    ) -> None:
+        """Инкрементально обновить индекс по изменившимся продуктам."""
+        for product_id in removed:
+            self._remove(product_id)
+
+        for product in products:
+            self._remove(product.product_id)
+            if product.is_active:
+                self._add(product)
+
+        self.generation = generation
+
+    def _add(self, product: ProductFacetSource) -> None:
+        if self._free:
+            ordinal = self._free.pop()
+            self._product_ids[ordinal] = product.product_id
+        else:
+            ordinal = len(self._product_ids)
+            self._product_ids.append(product.product_id)
+
+        bit = 1 << ordinal
+        self._ordinals[product.product_id] = ordinal
+        self._state[ordinal] = (product.category_slug, product.attribute_value_ids)
+        self._active |= bit
+        self._categories[product.category_slug] |= bit
+        for value_id in product.attribute_value_ids:
+            self._values[value_id] |= bit
+
+    def _remove(self, product_id: str) -> None:
+        ordinal = self._ordinals.pop(product_id, None)
+        if ordinal is None:
+            return
+
+        mask = ~(1 << ordinal)
+        category_slug, value_ids = self._state.pop(ordinal)
+        self._active &= mask
+        self._categories[category_slug] &= mask
+        for value_id in value_ids:
+            self._values[value_id] &= mask
+
+        self._product_ids[ordinal] = None
+        self._free.append(ordinal)
+
+    def _bits(self, product_ids: Collection[str]) -> int:
+        bits = 0
+        for product_id in product_ids:
+            ordinal = self._ordinals.get(product_id)
+            if ordinal is not None:
+                bits |= 1 << ordinal
+        return bits
+
+    def _ids(self, bits: int) -> list[str]:
+        # Поиск единиц по строковому представлению идёт в C и не требует
+        # сдвигов длинного int на каждый найденный бит
+        digits = bin(bits)[:1:-1]
+        result: list[str] = []
+        ordinal = digits.find("1")
+        while ordinal != -1:
+            # Биты стоят только у занятых ordinal, свободные (None) не выставлены
+            result.append(cast(str, self._product_ids[ordinal]))
+            ordinal = digits.find("1", ordinal + 1)
+        return result
+
+    def _base(self, category_slug: str | None) -> int:
+        if category_slug:
+            return self._active & self._categories.get(category_slug, 0)
+        return self._active
+
+    def _selected(self, attributes: Sequence[tuple[str, str]]) -> dict[str, int]:
+        """Битсеты выбранных значений, объединённые по ИЛИ внутри атрибута."""
+        selected: dict[str, int] = defaultdict(int)
+        for code, slug in attributes:
+            value_id = self._value_ids.get((code, slug))
+            # неизвестное значение ничего не добавляет, но атрибут
+            # всё равно участвует в пересечении
+            selected[code] |= self._values.get(value_id, 0) if value_id else 0
+        return selected
+
+    def match(
+        self,
+        category_slug: str | None,
+        attributes: Sequence[tuple[str, str]],
+    ) -> list[str]:
+        bits = self._base(category_slug)
+        for value_bits in self._selected(attributes).values():
+            bits &= value_bits
+        return self._ids(bits)
+
+    def facets(
+        self,
+        category_slug: str | None,
+        attributes: Sequence[tuple[str, str]],
+        product_ids: Collection[str] | None = None,
+    ) -> list[Facet]:
+        base = self._base(category_slug)
+        if product_ids is not None:
+            base &= self._bits(product_ids)
+
+        selected = self._selected(attributes)
+        selected_pairs = set(attributes)
+        facets: list[Facet] = []
+
+        for attribute in self._attributes:
+            # Счётчики атрибута учитывают фильтры по всем остальным атрибутам,
+            # но не по нему самому — иначе нельзя расширить выбор по ИЛИ
+            bits = base
+            for code, value_bits in selected.items():
+                if code != attribute.code:
+                    bits &= value_bits
+
+            values = [
+                FacetValue(
+                    slug=value.slug,
+                    name=value.name,
+                    count=(bits & self._values.get(value.id, 0)).bit_count(),
+                    selected=(attribute.code, value.slug) in selected_pairs,
+                )
+                for value in sorted(attribute.values, key=lambda v: (v.sort_order, v.id))
+                if value.is_active
+            ]
+            values = [value for value in values if value.count or value.selected]
+
+            if values:
+                facets.append(Facet(code=attribute.code, name=attribute.name, values=values))
+
+        return facets
+
+
+facet_index = BitmapFacetIndex()
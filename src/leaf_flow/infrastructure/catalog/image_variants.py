@@ -0,0 +1,55 @@
+"""
+Варианты изображения под ширину на экране клиента.
+
+srcset собирается из вариантов при записи (ImageWriter) и хранится
+в product_images.srcset; для изображений, записанных раньше, он
+собирается на лету при выборе варианта.
+"""
+from dataclasses import replace
+from typing import Iterable
+
+from leaf_flow.domain.entities.product import ProductImageEntity, ProductImageVariantEntity
+
+# При равной ширине — формат, который клиенту дешевле скачать
+_FORMAT_PREFERENCE = {"webp": 0, "jpg": 1, "jpeg": 1, "png": 2}
+
+
+def _preference(variant: ProductImageVariantEntity) -> tuple[int, int]:
+    return _FORMAT_PREFERENCE.get(variant.format, len(_FORMAT_PREFERENCE)), variant.byte_size
+
+
+def _by_width(variants: Iterable[ProductImageVariantEntity]) -> list[ProductImageVariantEntity]:
+    """По одному варианту на ширину, по возрастанию ширины."""
+    best: dict[int, ProductImageVariantEntity] = {}
+    for variant in variants:
+        current = best.get(variant.width)
+        if current is None or _preference(variant) < _preference(current):
+            best[variant.width] = variant
+    return [best[width] for width in sorted(best)]
+
+
+def build_srcset(variants: Iterable[ProductImageVariantEntity]) -> str:
+    """srcset вида «url 320w, url 640w» (storage_key — уже полный URL)."""
+    return ", ".join(f"{variant.storage_key} {variant.width}w" for variant in _by_width(variants))
+
+
+def pick_variant(
+    variants: Iterable[ProductImageVariantEntity],
+    width: int
+) -> ProductImageVariantEntity | None:
+    """Самый узкий вариант не уже width, иначе самый широкий."""
+    candidates = _by_width(variants)
+    for variant in candidates:
+        if variant.width >= width:
+            return variant
+    return candidates[-1] if candidates else None
+
+
+def fit_image(image: ProductImageEntity, width: int) -> ProductImageEntity:
+    """Копия изображения с единственным подходящим вариантом и srcset."""
+    variant = pick_variant(image.variants, width)
+    return replace(
+        image,
+        variants=[variant] if variant else [],
+        srcset=image.srcset or build_srcset(image.variants),
+    )
@@ -0,0 +1,124 @@
+"""
+Фоновое обновление in-memory индексов каталога.
+
+Каждый воркер API держит свою копию индексов и периодически сверяет её
+поколение с поколением каталога в Redis: изменившиеся продукты берутся
+из журнала изменений кэша, при разрыве журнала индекс строится заново.
+
+Атрибуты и синонимы правятся без админского API (миграциями и напрямую
+в БД) и поколение не двигают, поэтому индексы ещё и перестраиваются
+целиком раз в rebuild_interval.
+
+Индекс подсказок небольшой и зависит от названий, поэтому при любом
+изменении каталога строится заново.
+"""
+import asyncio
+import logging
+import time
+
+from leaf_flow.application.ports.catalog_cache import CatalogCache
+from leaf_flow.infrastructure.catalog.facets import BitmapFacetIndex
+from leaf_flow.infrastructure.catalog.suggest import SortedPrefixSuggestIndex
+from leaf_flow.infrastructure.catalog.synonyms import AhoCorasickSynonymIndex
+from leaf_flow.infrastructure.db.uow import get_uow
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogIndexRefresher:
+    def __init__(
+        self,
+        facet_index: BitmapFacetIndex,
+        synonym_index: AhoCorasickSynonymIndex,
+        suggest_index: SortedPrefixSuggestIndex,
+        catalog_cache: CatalogCache,
+        poll_interval: float = 2.0,
+        rebuild_interval: float = 600.0,
+    ):
+        """
+        Args:
+            facet_index: Индекс фасетов, который нужно поддерживать.
+            synonym_index: Словарь синонимов значений атрибутов.
+            suggest_index: Индекс подсказок поисковой строки.
+            catalog_cache: Кэш каталога (источник поколения и журнала изменений).
+            poll_interval: Интервал между проверками поколения (секунды).
+            rebuild_interval: Интервал полной перестройки индексов (секунды).
+        """
+        self._facet_index = facet_index
+        self._synonym_index = synonym_index
+        self._suggest_index = suggest_index
+        self._catalog_cache = catalog_cache
+        self._poll_interval = poll_interval
+        self._rebuild_interval = rebuild_interval
+        self._rebuilt_at: float | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    async def refresh(self) -> None:
+        """Привести индексы к текущему поколению каталога."""
+        since = self._facet_index.generation
+        now = time.monotonic()
+        rebuild = (
+            since is None
+            or self._rebuilt_at is None
+            or now - self._rebuilt_at >= self._rebuild_interval
+        )
+        # Поколение читается до данных: изменения, закоммиченные между
+        # двумя чтениями, придут ещё раз со следующим поколением
+        generation, changed = await self._catalog_cache.changes_since(
+            since if since is not None else -1
+        )
+        if not rebuild and generation == since:
+            return
+
+        async for uow in get_uow():
+            reader = uow.catalog_index_reader
+            attributes = await reader.list_facet_attributes()
+            synonyms = await reader.list_value_synonyms()
+            suggestions = await reader.list_suggestion_sources()
+
+            if rebuild or changed is None:
+                products = await reader.list_product_facets()
+                self._facet_index.rebuild(attributes, products, generation)
+                self._synonym_index.rebuild(synonyms, generation)
+                self._suggest_index.rebuild(suggestions, generation)
+                self._rebuilt_at = now
+                logger.info(
+                    f"Catalog indexes rebuilt: generation={generation}, "
+                    f"products={self._facet_index.size}, synonyms={len(synonyms)}, "
+                    f"suggestions={self._suggest_index.size}"
+                )
+                return
+
+            products = await reader.list_product_facets(changed) if changed else []
+            removed = changed - {product.product_id for product in products}
+            self._facet_index.set_attributes(attributes)
+            self._facet_index.apply(products, removed, generation)
+            self._synonym_index.rebuild(synonyms, generation)
+            self._suggest_index.rebuild(suggestions, generation)
+            logger.debug(
+                f"Catalog indexes updated: generation={generation}, changed={len(changed)}"
+            )
+
+    async def run(self) -> None:
+        """Основной цикл обновления."""
+        while True:
+            await asyncio.sleep(self._poll_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.exception(f"Catalog index refresh failed: {e}")
+
+    async def start(self) -> None:
+        """Построить индексы и запустить фоновое обновление."""
+        await self.refresh()
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
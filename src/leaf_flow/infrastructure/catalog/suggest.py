@@ -0,0 +1,122 @@
+"""
+Индекс подсказок поисковой строки (typeahead).
+
+Каждая фраза подсказки нормализуется и кладётся в отсортированный массив
+ключей вместе со всеми своими «хвостами» от начала каждого слова —
+«шу пуэр 2018» даёт ключи «шу пуэр 2018», «пуэр 2018» и «2018».
+Подсказки по префиксу — это отрезок массива, найденный двумя bisect.
+
+Для коротких префиксов отрезок длинный (на «ч» начинается пол-каталога),
+поэтому для каждого префикса, под которым больше _SCAN_LIMIT ключей,
+лучшие подсказки считаются заранее, при построении. Индекс строится целиком и подменяется
+одним присваиванием — читатели видят либо старое, либо новое состояние.
+"""
+import heapq
+from bisect import bisect_left
+from dataclasses import dataclass
+from itertools import groupby
+from typing import Iterable, Sequence
+
+from leaf_flow.application.dto.catalog import Suggestion, SuggestionKind, SuggestionSource
+from leaf_flow.application.ports.catalog_index import SuggestIndex
+from leaf_flow.infrastructure.catalog.synonyms import normalize_phrase
+
+# Предел limit в suggest() — столько подсказок хранится на короткий префикс
+MAX_SUGGESTIONS = 20
+# Больше ключей на префикс запрос не просматривает
+_SCAN_LIMIT = 256
+_KIND_ORDER: dict[SuggestionKind, int] = {
+    "category": 0,
+    "attribute": 1,
+    "product": 2,
+    "tag": 3,
+}
+
+# Ранг совпадения: с начала фразы, вид подсказки, длина фразы, номер подсказки
+_Rank = tuple[bool, int, int, int]
+
+
+@dataclass(frozen=True, slots=True)
+class _State:
+    suggestions: Sequence[Suggestion]
+    keys: Sequence[str]
+    ranks: Sequence[_Rank]
+    top: dict[str, tuple[int, ...]]
+
+
+def _best(ranks: Iterable[_Rank], limit: int) -> tuple[int, ...]:
+    """Номера лучших подсказок; у подсказки с несколькими ключами берётся лучший."""
+    best: dict[int, _Rank] = {}
+    for rank in ranks:
+        ordinal = rank[3]
+        if ordinal not in best or rank < best[ordinal]:
+            best[ordinal] = rank
+    return tuple(rank[3] for rank in heapq.nsmallest(limit, best.values()))
+
+
+class SortedPrefixSuggestIndex(SuggestIndex):
+    def __init__(self) -> None:
+        self.generation: int | None = None
+        self._state = _State(suggestions=(), keys=(), ranks=(), top={})
+
+    @property
+    def size(self) -> int:
+        return len(self._state.suggestions)
+
+    def rebuild(self, sources: Iterable[SuggestionSource], generation: int) -> None:
+        suggestions: list[Suggestion] = []
+        entries: list[tuple[str, _Rank]] = []
+        for source in sources:
+            ordinal = len(suggestions)
+            suggestions.append(source.suggestion)
+            kind = _KIND_ORDER[source.suggestion.kind]
+            for phrase in source.phrases:
+                words = normalize_phrase(phrase).split()
+                for position in range(len(words)):
+                    entries.append(
+                        (" ".join(words[position:]), (position > 0, kind, len(phrase), ordinal))
+                    )
+        entries.sort()
+
+        top: dict[str, tuple[int, ...]] = {}
+        crowded = entries
+        length = 0
+        # Префиксы удлиняются, пока под ними остаются слишком длинные отрезки
+        while crowded:
+            length += 1
+            next_crowded: list[tuple[str, _Rank]] = []
+            for prefix, grouped in groupby(crowded, key=lambda entry: entry[0][:length]):
+                group = list(grouped)
+                # ключи короче length уже учтены под своим полным префиксом
+                if len(prefix) == length and len(group) > _SCAN_LIMIT:
+                    top[prefix] = _best((rank for _, rank in group), MAX_SUGGESTIONS)
+                    next_crowded += group
+            crowded = next_crowded
+
+        self._state = _State(
+            suggestions=suggestions,
+            keys=[key for key, _ in entries],
+            ranks=[rank for _, rank in entries],
+            top=top,
+        )
+        self.generation = generation
+
+    def suggest(self, text: str, limit: int) -> list[Suggestion]:
+        prefix = normalize_phrase(text).strip()
+        if not prefix or limit <= 0:
+            return []
+
+        state = self._state
+        ordinals = state.top.get(prefix)
+        if ordinals is not None:
+            ordinals = ordinals[:limit]
+        else:
+            start = bisect_left(state.keys, prefix)
+            # все ключи с этим префиксом меньше prefix + U+FFFF; их не больше _SCAN_LIMIT
+            end = bisect_left(state.keys, prefix + "\uffff", start)
+            ordinals = _best(state.ranks[start:end], limit)
+
+        return [state.suggestions[ordinal] for ordinal in ordinals]
+
+
+suggest_index = SortedPrefixSuggestIndex()
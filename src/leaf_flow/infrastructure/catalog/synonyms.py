@@ -0,0 +1,66 @@
+"""
+Словарь синонимов значений атрибутов для поиска по каталогу.
+
+Названия значений и их синонимы собираются в автомат Ахо–Корасик,
+поэтому свободный текст запроса разбирается в фильтры по атрибутам
+за один проход по строке, без обращений к БД.
+"""
+import re
+from typing import Iterable
+
+from leaf_flow.application.dto.catalog import AttributeValueSynonym
+from leaf_flow.application.ports.catalog_index import SynonymIndex
+from leaf_flow.infrastructure.catalog.aho_corasick import AhoCorasick
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize_phrase(text: str) -> str:
+    """Нижний регистр, ё → е, слова через один пробел и с пробелами по краям."""
+    words = _NON_WORD.sub(" ", text.lower().replace("ё", "е")).split()
+    # Пробелы по краям шаблона дают совпадение только по границам слов
+    return f" {' '.join(words)} " if words else ""
+
+
+class AhoCorasickSynonymIndex(SynonymIndex):
+    def __init__(self) -> None:
+        self.generation: int | None = None
+        self._automaton: AhoCorasick[frozenset[tuple[str, str]]] = AhoCorasick(())
+
+    def rebuild(self, synonyms: Iterable[AttributeValueSynonym], generation: int) -> None:
+        values: dict[str, set[tuple[str, str]]] = {}
+        for synonym in synonyms:
+            phrase = normalize_phrase(synonym.phrase)
+            if phrase:
+                values.setdefault(phrase, set()).add(
+                    (synonym.attribute_code, synonym.value_slug)
+                )
+
+        self._automaton = AhoCorasick(
+            (phrase, frozenset(pairs)) for phrase, pairs in values.items()
+        )
+        self.generation = generation
+
+    def resolve(self, text: str) -> tuple[tuple[str, str], ...]:
+        text = normalize_phrase(text)
+        if not text:
+            return ()
+
+        # Из пересекающихся вхождений берём самое длинное слева:
+        # «шен пуэр» должен дать шен, а не все пуэры
+        matches = sorted(
+            self._automaton.search(text),
+            key=lambda match: (match[0], match[0] - match[1]),
+        )
+        resolved: set[tuple[str, str]] = set()
+        end = 0
+        for match_start, match_end, pairs in matches:
+            # соседние вхождения делят пробел между словами
+            if match_start >= end - 1:
+                resolved.update(pairs)
+                end = match_end
+
+        return tuple(sorted(resolved))
+
+
+synonym_index = AhoCorasickSynonymIndex()
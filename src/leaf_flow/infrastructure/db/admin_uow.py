@@ -36,8 +36,10 @@ from leaf_flow.application.ports.admin.variant import (
     AdminVariantReader,
     AdminVariantWriter,
 )
+from leaf_flow.application.ports.catalog_cache import CatalogCache
 from leaf_flow.application.ports.image import ImageReader, ImageWriter
 from leaf_flow.application.ports.outbox import OutboxWriter
+from leaf_flow.application.ports.catalog_change_log import CatalogChangeLogWriter
 from leaf_flow.infrastructure.db.repositories.admin import (
     AdminAttributeReaderRepository,
     AdminAttributeValueWriterRepository,
@@ -60,7 +62,15 @@ from leaf_flow.infrastructure.db.repositories.admin.image import (
     ImageReaderRepository,
     ImageWriterRepository,
 )
+from leaf_flow.infrastructure.cache.catalog import catalog_cache
+from leaf_flow.infrastructure.db.catalog_changes import (
+    pop_categories_changed, pop_changed_products, pop_changed_documents
+)
+from leaf_flow.domain.events.catalog import CatalogProductsChangedEvent
 from leaf_flow.infrastructure.db.repositories.outbox import OutboxWriterRepository
+from leaf_flow.infrastructure.db.repositories.catalog_change_log import (
+    CatalogChangeLogWriterRepository
+)
 from leaf_flow.infrastructure.db.session import AsyncSessionLocal
 
 
@@ -109,13 +119,44 @@ class AdminUoW:
     # Outbox
     outbox_writer: OutboxWriter
 
+    # Журнал изменений каталога
+    catalog_changes_writer: CatalogChangeLogWriter
+
+    # Кэш чтения каталога
+    catalog_cache: CatalogCache
+
     async def flush(self) -> None:
         await self.session.flush()
 
     async def commit(self) -> None:
+        """
+        Зафиксировать транзакцию и сбросить кэш каталога по изменённым продуктам.
+
+        В той же транзакции у изменённых продуктов пересчитывается
+        диапазон цен, в outbox ставится catalog.products_changed (по нему
+        перестраивается read-модель каталога), а сами продукты пишутся
+        в журнал для /catalog/changes. Изменение категорий сбрасывает
+        кэш целиком: список категорий лежит в нём же.
+        """
+        changed_products = pop_changed_products(self.session)
+        changed_documents = pop_changed_documents(self.session)
+        changed_categories = pop_categories_changed(self.session)
+        if changed_products:
+            await self.products_writer.refresh_price_range(changed_products)
+            event = CatalogProductsChangedEvent(tuple(sorted(changed_products)))
+            await self.outbox_writer.add_message(
+                event_type="catalog.products_changed",
+                payload=event.to_payload(),
+            )
+            await self.catalog_changes_writer.record(changed_products)
         await self.session.commit()
+        if changed_products or changed_documents or changed_categories:
+            await self.catalog_cache.invalidate(changed_products | changed_documents)
 
     async def rollback(self) -> None:
+        pop_changed_products(self.session)
+        pop_changed_documents(self.session)
+        pop_categories_changed(self.session)
         await self.session.rollback()
 
 
@@ -156,9 +197,13 @@ async def get_admin_uow():
             attribute_values_writer=AdminAttributeValueWriterRepository(s),
             # Outbox
             outbox_writer=OutboxWriterRepository(s),
+            # Журнал изменений каталога
+            catalog_changes_writer=CatalogChangeLogWriterRepository(s),
+            # Кэш чтения каталога
+            catalog_cache=catalog_cache,
         )
         try:
             yield uow
         except Exception:
-            await s.rollback()
+            await uow.rollback()
             raise
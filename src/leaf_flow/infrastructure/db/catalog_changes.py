@@ -0,0 +1,48 @@
+"""
+Учёт изменений каталога в рамках сессии.
+
+Админские репозитории помечают затронутые продукты, а UoW в той же
+транзакции ставит событие catalog.products_changed в outbox и после
+успешного коммита сбрасывает по ним кэши чтения каталога.
+
+Документы read-модели помечаются отдельно: их перестройка требует
+только сброса кэшей, но не нового события. Так же — категории: продукты
+они не меняют, но список категорий в кэше устаревает.
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+
+_CHANGED_PRODUCTS_KEY = "catalog_changed_products"
+_CHANGED_DOCUMENTS_KEY = "catalog_changed_documents"
+_CHANGED_CATEGORIES_KEY = "catalog_changed_categories"
+
+
+def mark_products_changed(session: AsyncSession, *product_ids: str | None) -> None:
+    """Пометить продукты как изменённые в текущей транзакции."""
+    changed: set[str] = session.info.setdefault(_CHANGED_PRODUCTS_KEY, set())
+    changed.update(pid for pid in product_ids if pid)
+
+
+def pop_changed_products(session: AsyncSession) -> set[str]:
+    """Забрать накопленные изменения (после чего они очищаются)."""
+    return session.info.pop(_CHANGED_PRODUCTS_KEY, set())
+
+
+def mark_documents_changed(session: AsyncSession, *product_ids: str | None) -> None:
+    """Пометить документы read-модели как перестроенные в текущей транзакции."""
+    changed: set[str] = session.info.setdefault(_CHANGED_DOCUMENTS_KEY, set())
+    changed.update(pid for pid in product_ids if pid)
+
+
+def pop_changed_documents(session: AsyncSession) -> set[str]:
+    """Забрать накопленные изменения документов (после чего они очищаются)."""
+    return session.info.pop(_CHANGED_DOCUMENTS_KEY, set())
+
+
+def mark_categories_changed(session: AsyncSession) -> None:
+    """Пометить категории как изменённые в текущей транзакции."""
+    session.info[_CHANGED_CATEGORIES_KEY] = True
+
+
+def pop_categories_changed(session: AsyncSession) -> bool:
+    """Забрать признак изменения категорий (после чего он очищается)."""
+    return session.info.pop(_CHANGED_CATEGORIES_KEY, False)
@@ -1,7 +1,9 @@
 from decimal import Decimal
-from typing import Sequence
+from typing import Any, Sequence
 
+from leaf_flow.application.dto.catalog import ProductDisplay
 from leaf_flow.domain.entities.cart import CartItemEntity, CartEntity, CartDetailEntity
+from leaf_flow.domain.entities.product import ProductImageEntity
 from leaf_flow.infrastructure.db.models import (
     CartItem as CartItemModel,
     Cart as CartModel
@@ -81,3 +83,79 @@ def map_cart_detail_to_entities(
         total_count=total_count,
         total_price=total_price
     )
+
+
+def map_cart_item_row_to_entity(
+    row: Any,
+    images: list[ProductImageEntity]
+) -> CartItemEntity:
+    """Строка cart_items с колонками product_name, image и variant_weight."""
+    return CartItemEntity(
+        product_id=row.product_id,
+        variant_id=row.variant_id,
+        quantity=row.quantity,
+        price=row.price,
+        product_name=row.product_name,
+        variant_weight=row.variant_weight,
+        image=row.image,
+        images=images,
+    )
+
+
+def map_cart_item_values_to_entity(row: Any) -> CartItemEntity:
+    """Строка cart_items без данных продукта (RETURNING изменённой позиции)."""
+    return CartItemEntity(
+        product_id=row.product_id,
+        variant_id=row.variant_id,
+        quantity=row.quantity,
+        price=row.price,
+    )
+
+
+def map_cart_item_rows_to_detail(
+    rows: Sequence[Any],
+    images: dict[str, list[ProductImageEntity]]
+) -> CartDetailEntity:
+    items = [
+        map_cart_item_row_to_entity(row, images.get(row.product_id, []))
+        for row in rows
+    ]
+    total_count, total_price = _calc_totals(items)
+    return CartDetailEntity(
+        items=items,
+        total_count=total_count,
+        total_price=total_price
+    )
+
+
+def map_cart_lines_to_detail(
+    lines: Sequence[CartItemEntity],
+    displays: dict[str, ProductDisplay]
+) -> CartDetailEntity:
+    """
+    Позиции корзины (без данных продукта) + данные продуктов.
+    Позиции снятых с продажи продуктов и вариантов не показываются.
+    """
+    items: list[CartItemEntity] = []
+    for line in lines:
+        display = displays.get(line.product_id)
+        if display is None or not display.sells(line.variant_id):
+            continue
+        items.append(
+            CartItemEntity(
+                product_id=line.product_id,
+                variant_id=line.variant_id,
+                quantity=line.quantity,
+                price=line.price,
+                product_name=display.name,
+                variant_weight=display.weights[line.variant_id],
+                image=display.image,
+                images=display.images,
+            )
+        )
+    total_count, total_price = _calc_totals(items)
+    return CartDetailEntity(
+        items=items,
+        total_count=total_count,
+        total_price=total_price
+    )
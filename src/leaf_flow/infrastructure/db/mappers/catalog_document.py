@@ -0,0 +1,106 @@
+"""
+Кодек документа read-модели: ProductDetailEntity ⇄ JSON-совместимый dict.
+
+Decimal хранится строкой (без потери точности), datetime — в ISO 8601.
+"""
+from dataclasses import asdict
+from datetime import datetime
+from decimal import Decimal
+from typing import Any
+
+from leaf_flow.domain.entities.product import (
+    ProductDetailEntity,
+    ProductVariantEntity,
+    ProductAttributesEntity,
+    ProductAttributesValueEntity,
+    BrewProfileEntity,
+    ProductImageEntity,
+    ProductImageVariantEntity
+)
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _to_json(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_to_json(v) for v in value]
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def encode_product_document(product: ProductDetailEntity) -> dict[str, Any]:
+    return _to_json(asdict(product))
+
+
+def _decode_variant(d: dict[str, Any]) -> ProductVariantEntity:
+    return ProductVariantEntity(
+        id=d["id"],
+        product_id=d["product_id"],
+        weight=d["weight"],
+        price=Decimal(d["price"]),
+        is_active=d["is_active"],
+        created_at=datetime.fromisoformat(d["created_at"]),
+        updated_at=datetime.fromisoformat(d["updated_at"]),
+        sort_order=d["sort_order"],
+    )
+
+
+def _decode_attribute(d: dict[str, Any]) -> ProductAttributesEntity:
+    return ProductAttributesEntity(
+        id=d["id"],
+        code=d["code"],
+        name=d["name"],
+        description=d["description"],
+        sort_order=d["sort_order"],
+        is_active=d["is_active"],
+        created_at=datetime.fromisoformat(d["created_at"]),
+        kind=d["kind"],
+        ui_hint=d["ui_hint"],
+        values=[ProductAttributesValueEntity(**v) for v in d["values"]],
+    )
+
+
+def _decode_brew_profile(d: dict[str, Any]) -> BrewProfileEntity:
+    return BrewProfileEntity(
+        **{
+            **d,
+            "created_at": datetime.fromisoformat(d["created_at"]),
+            "updated_at": datetime.fromisoformat(d["updated_at"]),
+        }
+    )
+
+
+def _decode_image(d: dict[str, Any]) -> ProductImageEntity:
+    return ProductImageEntity(
+        id=d["id"],
+        product_id=d["product_id"],
+        title=d["title"],
+        is_active=d["is_active"],
+        sort_order=d["sort_order"],
+        variants=[ProductImageVariantEntity(**v) for v in d["variants"]],
+        image_url=d.get("image_url"),
+        srcset=d.get("srcset"),
+    )
+
+
+def decode_product_document(d: dict[str, Any]) -> ProductDetailEntity:
+    return ProductDetailEntity(
+        id=d["id"],
+        name=d["name"],
+        description=d["description"],
+        category_slug=d["category_slug"],
+        image=d["image"],
+        product_type_code=d["product_type_code"],
+        tags=list(d["tags"]),
+        variants=[_decode_variant(v) for v in d["variants"]],
+        brew_profiles=[_decode_brew_profile(p) for p in d["brew_profiles"]],
+        attribute_values=[_decode_attribute(a) for a in d["attribute_values"]],
+        is_active=d["is_active"],
+        created_at=datetime.fromisoformat(d["created_at"]),
+        updated_at=datetime.fromisoformat(d["updated_at"]),
+        sort_order=d["sort_order"],
+        images=[_decode_image(i) for i in d["images"]],
+    )
@@ -4,9 +4,11 @@ from leaf_flow.infrastructure.db.models import Category as CategoryModel
 
 def map_product_category_model_to_entity(
     category: CategoryModel,
+    product_count: int = 0,
 ) -> CategoryEntity:
     return CategoryEntity(
         slug=category.slug,
         label=category.label,
         sort_order=category.sort_order,
+        product_count=product_count,
     )
@@ -1,3 +1,6 @@
+from typing import Any, Sequence
+
+from leaf_flow.application.dto.catalog import ProductDisplay
 from leaf_flow.domain.entities.order import OrderItemEntity, OrderEntity
 from leaf_flow.infrastructure.db.models import Order as OrderModel
 
@@ -28,3 +31,68 @@ def map_order_model_to_entity(order: OrderModel) -> OrderEntity:
         status=order.status.value,
         created_at=order.created_at,
     )
+
+
+def map_order_item_row_to_entity(row: Any) -> OrderItemEntity:
+    """Строка order_items с колонками product_name, image и variant_weight."""
+    return OrderItemEntity(
+        product_id=row.product_id,
+        variant_id=row.variant_id,
+        quantity=row.quantity,
+        price=row.price,
+        total=row.total,
+        product_name=row.product_name,
+        variant_weight=row.variant_weight,
+        image=row.image
+    )
+
+
+def map_order_item_values_to_entity(
+    row: Any,
+    display: ProductDisplay | None
+) -> OrderItemEntity:
+    """
+    Строка order_items без джойнов + данные продукта из кэша.
+    Продукт и вариант позиции заказа удалить нельзя (ondelete=RESTRICT),
+    поэтому отсутствие данных — ошибка, а не пустые поля.
+    """
+    if display is None or row.variant_id not in display.weights:
+        raise RuntimeError(
+            f"PRODUCT_DISPLAY_NOT_FOUND: {row.product_id}/{row.variant_id}"
+        )
+    return OrderItemEntity(
+        product_id=row.product_id,
+        variant_id=row.variant_id,
+        quantity=row.quantity,
+        price=row.price,
+        total=row.total,
+        product_name=display.name,
+        variant_weight=display.weights[row.variant_id],
+        image=display.image
+    )
+
+
+def map_order_row_and_items_to_entity(
+    row: Any,
+    items: list[OrderItemEntity]
+) -> OrderEntity:
+    return OrderEntity(
+        id=row.id,
+        customer_name=row.customer_name,
+        phone=row.phone,
+        user_id=row.user_id,
+        # Core отдаёт значения колонок Enum как члены enum
+        delivery=row.delivery.value,
+        total=row.total,
+        items=items,
+        address=row.address,
+        comment=row.comment,
+        status=row.status.value,
+        created_at=row.created_at,
+    )
+
+
+def map_order_row_to_entity(row: Any, items: Sequence[Any]) -> OrderEntity:
+    return map_order_row_and_items_to_entity(
+        row, [map_order_item_row_to_entity(it) for it in items]
+    )
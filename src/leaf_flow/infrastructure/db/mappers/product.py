@@ -1,4 +1,8 @@
+from datetime import datetime, timezone
 from itertools import groupby
+from typing import Any
+
+from sqlalchemy import inspect
 
 from leaf_flow.config import settings
 from leaf_flow.domain.entities.product import (
@@ -19,6 +23,22 @@ from leaf_flow.infrastructure.db.models.product import (
     ProductImageVariant as ProductImageVariantModel
 )
 
+# Значения колонок, которые список не читал (ProductListQuery.columns):
+# ответ их не сериализует, но сущность остаётся типизированной
+PRUNED_COLUMN_VALUES: dict[str, Any] = {
+    "name": "",
+    "category_slug": "",
+    "tags": [],
+    "image": "",
+    "product_type_code": "",
+    "is_active": True,
+    "created_at": datetime.fromtimestamp(0, timezone.utc),
+    "updated_at": datetime.fromtimestamp(0, timezone.utc),
+    "sort_order": 0,
+    "min_price": None,
+    "max_price": None,
+}
+
 
 def map_product_image_variant_model_to_entity(
     variant: ProductImageVariantModel
@@ -48,7 +68,8 @@ def map_product_image_model_to_entity(
         variants=[
             map_product_image_variant_model_to_entity(variant)
             for variant in img.variants
-        ]
+        ],
+        srcset=img.srcset,
     )
 
 
@@ -184,17 +205,25 @@ def map_product_model_to_entity(product: ProductModel) -> ProductEntity:
 
     images = [map_product_image_model_to_entity(i) for i in (product.images or [])]
 
+    # Колонки, отсечённые load_only, не трогаем: обращение к ним — ленивая загрузка
+    unloaded = inspect(product).unloaded
+
+    def column(name: str) -> Any:
+        return PRUNED_COLUMN_VALUES[name] if name in unloaded else getattr(product, name)
+
     return ProductEntity(
         id=product.id,
-        name=product.name,
-        category_slug=product.category_slug,
-        tags=list(product.tags or []),
-        image=product.image,
+        name=column("name"),
+        category_slug=column("category_slug"),
+        tags=list(column("tags") or []),
+        image=column("image"),
         variants=variants,
-        product_type_code=product.product_type_code,
-        is_active=product.is_active,
-        created_at=product.created_at,
-        updated_at=product.updated_at,
-        sort_order=getattr(product, "sort_order", 0),
+        product_type_code=column("product_type_code"),
+        is_active=column("is_active"),
+        created_at=column("created_at"),
+        updated_at=column("updated_at"),
+        sort_order=column("sort_order"),
         images=images,
+        min_price=column("min_price"),
+        max_price=column("max_price"),
     )
@@ -0,0 +1,237 @@
+"""
+Маппинг строк без ORM: кортежи колонок и JSON-агрегаты → доменные сущности.
+
+Используется быстрыми путями чтения, которые не материализуют
+ORM-объекты (без identity map и инструментирования атрибутов).
+"""
+from datetime import datetime
+from decimal import Decimal
+from itertools import groupby
+from typing import Any, Iterable
+
+from leaf_flow.config import settings
+from leaf_flow.domain.entities.product import (
+    ProductEntity,
+    ProductDetailEntity,
+    ProductVariantEntity,
+    ProductAttributesEntity,
+    ProductAttributesValueEntity,
+    BrewProfileEntity,
+    ProductImageEntity,
+    ProductImageVariantEntity
+)
+
+
+def _enum_to_str(x: Any) -> Any:
+    # Core отдаёт значения колонок Enum как члены enum
+    return getattr(x, "value", x)
+
+
+def map_variant_json_to_entity(v: dict[str, Any]) -> ProductVariantEntity:
+    return ProductVariantEntity(
+        id=v["id"],
+        product_id=v["product_id"],
+        weight=v["weight"],
+        # цена приходит строкой, чтобы не пройти через float
+        price=Decimal(v["price"]),
+        is_active=v["is_active"],
+        created_at=datetime.fromisoformat(v["created_at"]),
+        updated_at=datetime.fromisoformat(v["updated_at"]),
+        sort_order=v["sort_order"],
+    )
+
+
+def map_image_json_to_entity(img: dict[str, Any]) -> ProductImageEntity:
+    return ProductImageEntity(
+        id=img["id"],
+        product_id=img["product_id"],
+        title=img["title"],
+        image_url=img["image_url"],
+        is_active=img["is_active"],
+        sort_order=img["sort_order"],
+        variants=[
+            ProductImageVariantEntity(
+                id=v["id"],
+                product_image_id=v["product_image_id"],
+                variant=v["variant"],
+                format=v["format"],
+                storage_key=f'{settings.PUBLIC_IMAGE_BASE_URL}/{v["storage_key"]}',
+                width=v["width"],
+                height=v["height"],
+                byte_size=v["byte_size"],
+            )
+            for v in img["variants"]
+        ],
+        srcset=img.get("srcset"),
+    )
+
+
+def map_product_json_row_to_entity(row: Any) -> ProductEntity:
+    """Строка с колонками продукта и JSON-массивами variants и images."""
+    return ProductEntity(
+        id=row.id,
+        name=row.name,
+        category_slug=row.category_slug,
+        tags=list(row.tags or []),
+        image=row.image,
+        variants=[map_variant_json_to_entity(v) for v in row.variants],
+        product_type_code=row.product_type_code,
+        is_active=row.is_active,
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+        sort_order=row.sort_order,
+        images=[map_image_json_to_entity(i) for i in row.images],
+        min_price=row.min_price,
+        max_price=row.max_price,
+    )
+
+
+def map_variant_row_to_entity(row: Any) -> ProductVariantEntity:
+    return ProductVariantEntity(
+        id=row.id,
+        product_id=row.product_id,
+        weight=row.weight,
+        price=row.price,
+        is_active=row.is_active,
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+        sort_order=row.sort_order,
+    )
+
+
+def map_image_rows_to_entities(rows: Iterable[Any]) -> list[ProductImageEntity]:
+    """
+    Строки изображений, соединённые с их вариантами (LEFT JOIN),
+    упорядоченные по изображению: одна строка на вариант.
+    """
+    images: list[ProductImageEntity] = []
+    for _, group in groupby(rows, key=lambda r: r.id):
+        first = next(group)
+        image = ProductImageEntity(
+            id=first.id,
+            product_id=first.product_id,
+            title=first.title,
+            image_url=first.image_url,
+            is_active=first.is_active,
+            sort_order=first.sort_order,
+            variants=[],
+            srcset=first.srcset,
+        )
+        for row in (first, *group):
+            if row.variant_id is None:
+                continue
+            image.variants.append(
+                ProductImageVariantEntity(
+                    id=row.variant_id,
+                    product_image_id=row.id,
+                    variant=_enum_to_str(row.variant),
+                    format=_enum_to_str(row.format),
+                    storage_key=f'{settings.PUBLIC_IMAGE_BASE_URL}/{row.storage_key}',
+                    width=row.width,
+                    height=row.height,
+                    byte_size=row.byte_size,
+                )
+            )
+        images.append(image)
+    return images
+
+
+def map_brew_profile_row_to_entity(row: Any) -> BrewProfileEntity:
+    return BrewProfileEntity(
+        id=row.id,
+        method=row.method,
+        teaware=row.teaware,
+        temperature=row.temperature,
+        brew_time=row.brew_time,
+        weight=row.weight,
+        note=row.note,
+        sort_order=row.sort_order,
+        is_active=row.is_active,
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+    )
+
+
+def map_attribute_rows_to_entities(rows: Iterable[Any]) -> list[ProductAttributesEntity]:
+    """
+    Значения атрибутов вместе с колонками атрибута (attribute_*),
+    упорядоченные так, что значения одного атрибута идут подряд.
+    """
+    attributes: list[ProductAttributesEntity] = []
+    for _, group in groupby(rows, key=lambda r: r.attribute_id):
+        values = list(group)
+        first = values[0]
+        attributes.append(
+            ProductAttributesEntity(
+                id=first.attribute_id,
+                code=first.attribute_code,
+                name=first.attribute_name,
+                description=first.attribute_description,
+                sort_order=first.attribute_sort_order,
+                is_active=first.attribute_is_active,
+                created_at=first.attribute_created_at,
+                kind=_enum_to_str(first.attribute_kind),
+                ui_hint=_enum_to_str(first.attribute_ui_hint),
+                values=[
+                    ProductAttributesValueEntity(
+                        id=v.id,
+                        attribute_id=v.attribute_id,
+                        name=v.name,
+                        slug=v.slug,
+                        sort_order=v.sort_order,
+                        is_active=v.is_active,
+                    )
+                    for v in values
+                ],
+            )
+        )
+    return attributes
+
+
+def map_product_row_to_entity(
+    row: Any,
+    variants: list[ProductVariantEntity],
+    images: list[ProductImageEntity],
+) -> ProductEntity:
+    return ProductEntity(
+        id=row.id,
+        name=row.name,
+        category_slug=row.category_slug,
+        tags=list(row.tags or []),
+        image=row.image,
+        variants=variants,
+        product_type_code=row.product_type_code,
+        is_active=row.is_active,
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+        sort_order=row.sort_order,
+        images=images,
+        min_price=row.min_price,
+        max_price=row.max_price,
+    )
+
+
+def map_product_detail_row_to_entity(
+    row: Any,
+    variants: list[ProductVariantEntity],
+    brew_profiles: list[BrewProfileEntity],
+    attributes: list[ProductAttributesEntity],
+    images: list[ProductImageEntity],
+) -> ProductDetailEntity:
+    return ProductDetailEntity(
+        id=row.id,
+        name=row.name,
+        description=row.description,
+        category_slug=row.category_slug,
+        tags=list(row.tags or []),
+        image=row.image,
+        variants=variants,
+        product_type_code=row.product_type_code,
+        attribute_values=attributes,
+        brew_profiles=brew_profiles,
+        images=images,
+        is_active=row.is_active,
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+        sort_order=row.sort_order,
+    )
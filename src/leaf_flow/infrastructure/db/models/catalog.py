@@ -0,0 +1,166 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import (
+    BigInteger, Identity, String, ForeignKey, DateTime, Float, Integer, SmallInteger, func
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from leaf_flow.infrastructure.db.base import Base
+
+
+class CatalogProductDocument(Base):
+    """
+    Read-модель карточки продукта.
+
+    Один JSONB-документ на активный продукт — ровно то, что отдаёт
+    map_product_detail_model_to_entity (уже отфильтровано и отсортировано).
+    Строится обработчиком события catalog.products_changed.
+    """
+    __tablename__ = "catalog_product_documents"
+
+    product_id: Mapped[str] = mapped_column(
+        String(64),
+        ForeignKey("products.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    document: Mapped[dict[str, Any]] = mapped_column(
+        JSONB, nullable=False
+    )
+    built_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now()
+    )
+
+
+class CatalogChange(Base):
+    """
+    Журнал изменений продуктов каталога для инкрементальной синхронизации.
+
+    Строка на продукт на транзакцию; version монотонно растёт в порядке
+    коммитов (запись сериализуется advisory-блокировкой). Внешнего ключа
+    нет: удаление продукта тоже должно остаться в журнале.
+    """
+    __tablename__ = "catalog_changes"
+
+    version: Mapped[int] = mapped_column(
+        BigInteger, Identity(always=True), primary_key=True
+    )
+    product_id: Mapped[str] = mapped_column(
+        String(64), nullable=False, index=True
+    )
+    changed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now()
+    )
+
+
+class ProductSimilarity(Base):
+    """
+    Похожие продукты: top-K соседей по косинусной близости векторов
+    значений атрибутов и тегов. Строки продукта пересчитываются
+    обработчиком catalog.products_changed и командой product_similarity.
+    """
+    __tablename__ = "product_similarities"
+
+    product_id: Mapped[str] = mapped_column(
+        String(64),
+        ForeignKey("products.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    rank: Mapped[int] = mapped_column(
+        SmallInteger, primary_key=True
+    )
+    # Индекс нужен, чтобы найти списки, в которые попал изменившийся продукт
+    similar_product_id: Mapped[str] = mapped_column(
+        String(64),
+        ForeignKey("products.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+    score: Mapped[float] = mapped_column(
+        Float, nullable=False
+    )
+    built_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now()
+    )
+
+
+class ProductPair(Base):
+    """
+    «С этим покупают»: top-K продуктов из совместных заказов.
+
+    Таблица целиком перестраивается командой bought_together
+    по истории order_items.
+    """
+    __tablename__ = "product_pairs"
+
+    product_id: Mapped[str] = mapped_column(
+        String(64),
+        ForeignKey("products.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    rank: Mapped[int] = mapped_column(
+        SmallInteger, primary_key=True
+    )
+    paired_product_id: Mapped[str] = mapped_column(
+        String(64),
+        ForeignKey("products.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    support: Mapped[int] = mapped_column(
+        Integer, nullable=False
+    )
+    confidence: Mapped[float] = mapped_column(
+        Float, nullable=False
+    )
+    lift: Mapped[float] = mapped_column(
+        Float, nullable=False
+    )
+    built_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now()
+    )
+
+
+class ProductStats(Base):
+    """
+    Счётчики активности по продуктам.
+
+    Копятся в Redis и сбрасываются сюда пачками (popularity_worker).
+    popularity — затухающая оценка в лог-шкале: ln Σ w·e^((t − t0)/τ),
+    поэтому новые события просто добавляются к ней (log-sum-exp),
+    а порядок продуктов по ней совпадает с порядком по затухшей оценке.
+    """
+    __tablename__ = "product_stats"
+
+    product_id: Mapped[str] = mapped_column(
+        String(64),
+        ForeignKey("products.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    views: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, server_default="0"
+    )
+    add_to_carts: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, server_default="0"
+    )
+    # Сумма уникальных посетителей по интервалам сброса (оценка HyperLogLog)
+    visitors: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, server_default="0"
+    )
+    popularity: Mapped[float | None] = mapped_column(
+        Float
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now()
+    )
@@ -11,6 +11,7 @@ class OutboxEventType(str, PyEnum):
     order_created = "order.created"
     order_status_changed = "order.status_changed"
     image_uploaded = "image.uploaded"
+    catalog_products_changed = "catalog.products_changed"
 
 
 class OutboxMessage(Base):
@@ -5,9 +5,9 @@ from datetime import datetime
 
 from sqlalchemy import (
     String, ForeignKey, UniqueConstraint, Boolean, DateTime,
-    Numeric, Index, Text, Enum, CheckConstraint, Integer, func
+    Numeric, Index, Text, Enum, CheckConstraint, Integer, Float, Computed, func, text
 )
-from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from leaf_flow.infrastructure.db.base import Base
@@ -83,6 +83,23 @@ class Product(Base):
     image: Mapped[str] = mapped_column(
         String(1024), nullable=False
     )
+    # Поисковый вектор: название весомее тегов, теги весомее описания.
+    # Название индексируется и русской морфологией, и как есть ('simple'),
+    # чтобы находились сорта и транслитерации, которых нет в словаре.
+    # Теги входят без нормализации (в генерируемой колонке допустимы только
+    # IMMUTABLE-функции, а приведение массива к тексту — STABLE), поэтому
+    # админка сохраняет их в нижнем регистре.
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('russian', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+            "setweight(array_to_tsvector(coalesce(tags, '{}')::text[]), 'B') || "
+            "setweight(to_tsvector('russian', coalesce(description, '')), 'C')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
     product_type: Mapped[ProductType] = relationship()
     is_active: Mapped[bool] = mapped_column(
         Boolean, nullable=False, server_default="true"
@@ -90,6 +107,13 @@ class Product(Base):
     sort_order: Mapped[int] = mapped_column(
         Integer, nullable=False, server_default="0"
     )
+    # Диапазон цен активных вариантов (NULL — активных вариантов нет).
+    # Пересчитывается AdminUoW при коммите изменений продукта
+    min_price: Mapped[Decimal | None] = mapped_column(Numeric(10, 2))
+    max_price: Mapped[Decimal | None] = mapped_column(Numeric(10, 2))
+    # Затухающая популярность в лог-шкале (копия product_stats.popularity,
+    # NULL — активности не было). Обновляется popularity_worker
+    popularity: Mapped[float | None] = mapped_column(Float)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
@@ -137,7 +161,37 @@ class Product(Base):
         # GIN-индекс для быстрого поиска по массиву тегов
         Index("ix_products_tags_gin", "tags", postgresql_using="gin"),
         # Индекс для поиска по названию (lower для case-insensitive)
-        Index("ix_products_name_lower", func.lower("name"))
+        Index("ix_products_name_lower", func.lower("name")),
+        # Полнотекстовый поиск по каталогу
+        Index("ix_products_search_vector", "search_vector", postgresql_using="gin"),
+        # Нечёткий поиск по названию (опечатки), требует расширения pg_trgm
+        Index(
+            "ix_products_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        # Keyset-пагинация публичного списка: ORDER BY name, id в рамках категории
+        Index(
+            "ix_products_active_category_name_id",
+            "is_active", "category_slug", "name", "id"
+        ),
+        # Сортировки price_asc и price_desc (NULLS LAST в обоих направлениях)
+        Index(
+            "ix_products_active_category_min_price_id",
+            "is_active", "category_slug", "min_price", "id"
+        ),
+        Index(
+            "ix_products_active_category_max_price_id",
+            "is_active", "category_slug",
+            text("max_price DESC NULLS LAST"), text("id DESC")
+        ),
+        # Сортировка popular
+        Index(
+            "ix_products_active_category_popularity_id",
+            "is_active", "category_slug",
+            text("popularity DESC NULLS LAST"), text("id DESC")
+        ),
     )
 
 
@@ -447,6 +501,8 @@ class ProductImage(Base):
     image_url: Mapped[str] = mapped_column(
         String(1024), nullable=True
     )
+    # srcset по вариантам (полные URL); пересчитывается при записи варианта
+    srcset: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     sort_order: Mapped[int] = mapped_column(
         Integer, nullable=False, server_default="0"
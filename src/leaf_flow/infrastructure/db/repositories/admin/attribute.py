@@ -6,6 +6,7 @@ from sqlalchemy.orm import selectinload
 
 from leaf_flow.application.ports.admin.attribute import AdminAttributeReader, AdminAttributeValueWriter
 from leaf_flow.domain.entities.product import ProductAttributesEntity, ProductAttributesValueEntity
+from leaf_flow.infrastructure.db.catalog_changes import mark_products_changed
 from leaf_flow.infrastructure.db.mappers.admin.attribute import (
     map_attribute_to_entity, map_attribute_value_to_entity
 )
@@ -82,6 +83,7 @@ class AdminAttributeValueWriterRepository(
         )
         self.session.add(link)
         await self.session.flush()
+        mark_products_changed(self.session, product_id)
         return True
 
     async def remove_from_product(
@@ -95,6 +97,7 @@ class AdminAttributeValueWriterRepository(
         )
         result = await self.session.execute(stmt)
         await self.session.flush()
+        mark_products_changed(self.session, product_id)
         return result.rowcount > 0  # type: ignore[return-value]
 
     async def set_product_values(
@@ -118,4 +121,5 @@ class AdminAttributeValueWriterRepository(
             self.session.add(link)
 
         await self.session.flush()
+        mark_products_changed(self.session, product_id)
         return True
@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from leaf_flow.application.ports.admin.brew_profile import AdminBrewProfileReader, AdminBrewProfileWriter
 from leaf_flow.domain.entities.product import BrewProfileEntity
+from leaf_flow.infrastructure.db.catalog_changes import mark_products_changed
 from leaf_flow.infrastructure.db.mappers.admin.brew_profile import map_brew_profile_model_to_entity
 from leaf_flow.infrastructure.db.models.product import ProductBrewProfile
 from leaf_flow.infrastructure.db.repositories.base import Repository
@@ -67,6 +68,7 @@ class AdminBrewProfileWriterRepository(Repository[ProductBrewProfile], AdminBrew
         self.session.add(profile)
         await self.session.flush()
         await self.session.refresh(profile)
+        mark_products_changed(self.session, product_id)
         return map_brew_profile_model_to_entity(profile)
 
     async def update(
@@ -92,9 +94,15 @@ class AdminBrewProfileWriterRepository(Repository[ProductBrewProfile], AdminBrew
         if profile is None:
             return None
 
+        mark_products_changed(self.session, profile.product_id)
         return map_brew_profile_model_to_entity(profile)
 
     async def delete(self, profile_id: int) -> None:
-        stmt = delete(ProductBrewProfile).where(ProductBrewProfile.id == profile_id)
-        await self.session.execute(stmt)
+        stmt = (
+            delete(ProductBrewProfile)
+            .where(ProductBrewProfile.id == profile_id)
+            .returning(ProductBrewProfile.product_id)
+        )
+        product_id = (await self.session.execute(stmt)).scalar_one_or_none()
         await self.session.flush()
+        mark_products_changed(self.session, product_id)
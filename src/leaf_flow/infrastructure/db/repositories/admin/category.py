@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from leaf_flow.application.ports.admin.category import AdminCategoryReader, AdminCategoryWriter
 from leaf_flow.domain.entities.category import CategoryEntity
+from leaf_flow.infrastructure.db.catalog_changes import mark_categories_changed
 from leaf_flow.infrastructure.db.mappers.category import map_product_category_model_to_entity
 from leaf_flow.infrastructure.db.models.product import Category
 from leaf_flow.infrastructure.db.repositories.base import Repository
@@ -50,6 +51,7 @@ class AdminCategoryWriterRepository(Repository[Category], AdminCategoryWriter):
         )
         self.session.add(category)
         await self.session.flush()
+        mark_categories_changed(self.session)
         return map_product_category_model_to_entity(category)
 
     async def update(self, slug: str, **fields: object) -> CategoryEntity | None:
@@ -71,9 +73,11 @@ class AdminCategoryWriterRepository(Repository[Category], AdminCategoryWriter):
         if category is None:
             return None
 
+        mark_categories_changed(self.session)
         return map_product_category_model_to_entity(category)
 
     async def delete(self, slug: str) -> None:
         stmt = delete(Category).where(Category.slug == slug)
         await self.session.execute(stmt)
         await self.session.flush()
+        mark_categories_changed(self.session)
@@ -1,9 +1,11 @@
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from leaf_flow.application.ports.image import ImageReader, ImageWriter
 from leaf_flow.domain.entities.product import ProductImageEntity, ProductImageVariantEntity
+from leaf_flow.infrastructure.catalog.image_variants import build_srcset
+from leaf_flow.infrastructure.db.catalog_changes import mark_products_changed
 from leaf_flow.infrastructure.db.mappers.product import (
     map_product_image_model_to_entity,
     map_product_image_variant_model_to_entity,
@@ -82,6 +84,7 @@ class ImageWriterRepository(Repository[ProductImage], ImageWriter):
 
         self.session.add(image)
         await self.session.flush()
+        mark_products_changed(self.session, product_id)
 
         return ProductImageEntity(
             id=image.id,
@@ -115,9 +118,31 @@ class ImageWriterRepository(Repository[ProductImage], ImageWriter):
 
         self.session.add(image_variant)
         await self.session.flush()
+
+        # srcset собирается при записи, а не в каждом ответе каталога
+        variants = (
+            await self.session.execute(
+                select(ProductImageVariant)
+                .where(ProductImageVariant.product_image_id == image_id)
+            )
+        ).scalars().all()
+        srcset = build_srcset(map_product_image_variant_model_to_entity(v) for v in variants)
+        product_id = await self.session.scalar(
+            update(ProductImage)
+            .where(ProductImage.id == image_id)
+            .values(srcset=srcset)
+            .returning(ProductImage.product_id)
+            .execution_options(synchronize_session=False)
+        )
+        mark_products_changed(self.session, product_id)
         return map_product_image_variant_model_to_entity(image_variant)
 
     async def delete(self, image_id: int) -> None:
-        stmt = delete(ProductImage).where(ProductImage.id == image_id)
-        await self.session.execute(stmt)
+        stmt = (
+            delete(ProductImage)
+            .where(ProductImage.id == image_id)
+            .returning(ProductImage.product_id)
+        )
+        product_id = (await self.session.execute(stmt)).scalar_one_or_none()
         await self.session.flush()
+        mark_products_changed(self.session, product_id)
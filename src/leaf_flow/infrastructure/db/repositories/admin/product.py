@@ -1,16 +1,18 @@
-from typing import Sequence
+from typing import Collection, Sequence
 
-from sqlalchemy import func, select, or_, update, delete
+from sqlalchemy import and_, func, select, or_, update, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from leaf_flow.application.ports.admin.product import AdminProductReader, AdminProductWriter
 from leaf_flow.domain.entities.product import ProductDetailEntity
+from leaf_flow.infrastructure.db.catalog_changes import mark_products_changed
 from leaf_flow.infrastructure.db.mappers.product import map_product_detail_model_to_entity
 from leaf_flow.infrastructure.db.models.product import (
     Product,
     ProductAttributeValue,
-    ProductImage
+    ProductImage,
+    ProductVariant
 )
 from leaf_flow.infrastructure.db.repositories.base import Repository
 
@@ -20,6 +22,20 @@ def _escape_like(value: str) -> str:
     return value.replace("\\", "\\\\").replace("%", r"\%").replace("_", r"\_")
 
 
+def _normalize_tags(tags: Sequence[str]) -> list[str]:
+    """
+    Теги хранятся в нижнем регистре, без пробелов по краям и повторов:
+    в search_vector они попадают как есть (array_to_tsvector), а запрос
+    websearch_to_tsquery приводится к нижнему регистру.
+    """
+    normalized: list[str] = []
+    for tag in tags:
+        tag = tag.strip().lower()
+        if tag and tag not in normalized:
+            normalized.append(tag)
+    return normalized
+
+
 class AdminProductReaderRepository(Repository[Product], AdminProductReader):
     """Репозиторий для чтения продуктов в админке."""
 
@@ -136,11 +152,12 @@ class AdminProductWriterRepository(Repository[Product], AdminProductWriter):
             category_slug=category_slug,
             image=image,
             product_type_code=product_type_code,
-            tags=tags,
+            tags=_normalize_tags(tags),
             is_active=is_active,
         )
         self.session.add(product)
         await self.session.flush()
+        mark_products_changed(self.session, product.id)
 
         return ProductDetailEntity(
             id=product.id,
@@ -171,10 +188,13 @@ class AdminProductWriterRepository(Repository[Product], AdminProductWriter):
 
         if not values:
             return None
+        if values.get("tags") is not None:
+            values["tags"] = _normalize_tags(values["tags"])
 
         stmt = update(Product).where(Product.id == product_id).values(**values)
         await self.session.execute(stmt)
         await self.session.flush()
+        mark_products_changed(self.session, product_id)
 
         return await self._get_product_with_relations(product_id)
 
@@ -183,6 +203,7 @@ class AdminProductWriterRepository(Repository[Product], AdminProductWriter):
         stmt = delete(Product).where(Product.id == product_id)
         await self.session.execute(stmt)
         await self.session.flush()
+        mark_products_changed(self.session, product_id)
 
     async def set_active(self, product_id: str, is_active: bool) -> None:
         """Установить активность продукта."""
@@ -193,3 +214,40 @@ class AdminProductWriterRepository(Repository[Product], AdminProductWriter):
         )
         await self.session.execute(stmt)
         await self.session.flush()
+        mark_products_changed(self.session, product_id)
+
+    async def refresh_price_range(self, product_ids: Collection[str]) -> None:
+        """Пересчитать диапазон цен активных вариантов; строки без изменений не трогаются."""
+        if not product_ids:
+            return
+        prices = (
+            select(
+                Product.id.label("product_id"),
+                func.min(ProductVariant.price).label("min_price"),
+                func.max(ProductVariant.price).label("max_price"),
+            )
+            .select_from(Product)
+            .outerjoin(
+                ProductVariant,
+                and_(
+                    ProductVariant.product_id == Product.id,
+                    ProductVariant.is_active.is_(True),
+                ),
+            )
+            .where(Product.id.in_(sorted(product_ids)))
+            .group_by(Product.id)
+            .subquery()
+        )
+        stmt = (
+            update(Product)
+            .where(
+                Product.id == prices.c.product_id,
+                or_(
+                    Product.min_price.is_distinct_from(prices.c.min_price),
+                    Product.max_price.is_distinct_from(prices.c.max_price),
+                ),
+            )
+            .values(min_price=prices.c.min_price, max_price=prices.c.max_price)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.execute(stmt)
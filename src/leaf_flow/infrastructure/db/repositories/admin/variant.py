@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from leaf_flow.application.ports.admin.variant import AdminVariantReader, AdminVariantWriter
 from leaf_flow.domain.entities.product import ProductVariantEntity
+from leaf_flow.infrastructure.db.catalog_changes import mark_products_changed
 from leaf_flow.infrastructure.db.mappers.product import map_product_variant_model_to_entity
 from leaf_flow.infrastructure.db.models.product import ProductVariant
 from leaf_flow.infrastructure.db.repositories.base import Repository
@@ -62,6 +63,7 @@ class AdminVariantWriterRepository(Repository[ProductVariant], AdminVariantWrite
         self.session.add(variant)
         await self.session.flush()
         await self.session.refresh(variant)
+        mark_products_changed(self.session, product_id)
         return map_product_variant_model_to_entity(variant)
 
     async def update(
@@ -85,18 +87,26 @@ class AdminVariantWriterRepository(Repository[ProductVariant], AdminVariantWrite
         if variant is None:
             return None
 
+        mark_products_changed(self.session, variant.product_id)
         return map_product_variant_model_to_entity(variant)
 
     async def delete(self, variant_id: str) -> None:
-        stmt = delete(ProductVariant).where(ProductVariant.id == variant_id)
-        await self.session.execute(stmt)
+        stmt = (
+            delete(ProductVariant)
+            .where(ProductVariant.id == variant_id)
+            .returning(ProductVariant.product_id)
+        )
+        product_id = (await self.session.execute(stmt)).scalar_one_or_none()
         await self.session.flush()
+        mark_products_changed(self.session, product_id)
 
     async def set_active(self, variant_id: str, is_active: bool) -> None:
         stmt = (
             update(ProductVariant)
             .where(ProductVariant.id == variant_id)
             .values(is_active=is_active)
+            .returning(ProductVariant.product_id)
         )
-        await self.session.execute(stmt)
-        await self.session.flush()
\ No newline at end of file
+        product_id = (await self.session.execute(stmt)).scalar_one_or_none()
+        await self.session.flush()
+        mark_products_changed(self.session, product_id)
\ No newline at end of file
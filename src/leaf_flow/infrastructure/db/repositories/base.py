@@ -1,4 +1,6 @@
-from typing import Generic, TypeVar, Type
+from typing import Collection, Generic, Sequence, TypeVar, Type
+
+from sqlalchemy import ColumnElement, and_, literal, or_, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 T = TypeVar("T")
@@ -14,3 +16,43 @@ class Repository(Generic[T]):
     async def add(self, obj: T) -> T:
         self.session.add(obj)
         return obj
+
+
+def keyset_after(
+    sort_keys: Sequence[tuple[ColumnElement, bool]],
+    values: Sequence[object],
+    nullable: Collection[int] = (),
+) -> ColumnElement[bool]:
+    """
+    Условие keyset-пагинации: строки строго после values в порядке sort_keys.
+
+    sort_keys — пары (выражение, по убыванию). Если направления совпадают,
+    используется сравнение кортежей (его умеет btree-индекс), иначе —
+    раскрытая цепочка (a > x) OR (a = x AND b > y) OR ...
+
+    nullable — позиции ключей, которые могут быть NULL и отсортированы
+    NULLS LAST: для них NULL идёт после любого значения (только цепочкой).
+    """
+    if len(sort_keys) != len(values):
+        raise ValueError("INVALID_CURSOR")
+
+    directions = {desc for _, desc in sort_keys}
+    if len(directions) == 1 and not nullable:
+        columns = tuple_(*(column for column, _ in sort_keys))
+        bound = tuple_(*(literal(v) for v in values))
+        return columns < bound if directions.pop() else columns > bound
+
+    clauses = []
+    for i, (column, desc) in enumerate(sort_keys):
+        equal_prefix = [
+            sort_keys[j][0].is_(None) if values[j] is None else sort_keys[j][0] == values[j]
+            for j in range(i)
+        ]
+        if values[i] is None:
+            # после NULL в NULLS LAST ничего нет — только равенство префикса
+            continue
+        step = column < values[i] if desc else column > values[i]
+        if i in nullable:
+            step = or_(step, column.is_(None))
+        clauses.append(and_(*equal_prefix, step))
+    return or_(*clauses)
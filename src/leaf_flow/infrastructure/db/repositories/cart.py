@@ -1,11 +1,16 @@
 from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import select, delete
+from sqlalchemy import (
+    CTE, Integer, Numeric, Select, any_, column, delete, false, literal, select, true,
+    update, values
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 from sqlalchemy.orm import selectinload, with_loader_criteria
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from leaf_flow.application.ports.cart import CartWriter, CartReader
+from leaf_flow.application.ports.cart_sync import CartSynchronizer
 from leaf_flow.infrastructure.db.models.cart import Cart, CartItem
 from leaf_flow.infrastructure.db.models.product import ProductImage
 from leaf_flow.infrastructure.db.repositories.base import Repository
@@ -17,10 +22,32 @@ from leaf_flow.domain.entities.cart import (
 from leaf_flow.infrastructure.db.mappers.cart import (
     map_cart_detail_to_entities,
     map_cart_to_entities,
-    map_cart_item_to_entities
+    map_cart_item_values_to_entity,
+)
+
+_RETURNING = (
+    CartItem.id, CartItem.product_id, CartItem.variant_id, CartItem.quantity, CartItem.price
 )
 
 
+def _lines_after(cart_id: int, changed: CTE, with_changed: bool = True) -> Select:
+    """
+    Позиции корзины после изменения — в одном операторе с ним.
+
+    Запрос видит снимок таблицы до изменения, поэтому изменённые строки
+    берутся из RETURNING (changed), а остальные — из cart_items.
+    Колонка changed отличает строки, которые затронуло изменение.
+    """
+    rest = (
+        select(*_RETURNING, false().label("changed"))
+        .where(CartItem.cart_id == cart_id, CartItem.id.not_in(select(changed.c.id)))
+    )
+    if with_changed:
+        rest = select(*changed.c, true().label("changed")).union_all(rest)
+    lines = rest.subquery()
+    return select(lines).order_by(lines.c.id)
+
+
 class CartReaderRepository(Repository[Cart], CartReader):
     def __init__(self, session: AsyncSession):
         super().__init__(session, Cart)
@@ -99,82 +126,108 @@ class CartWriterRepository(Repository[Cart], CartWriter):
         variant_id: str,
         quantity: int,
         price: Decimal
-    ) -> CartItemEntity:
-        from leaf_flow.infrastructure.db.models.product import Product
-        stmt = (
-            select(CartItem)
-            .where(
-                CartItem.cart_id == cart_id,
-                CartItem.product_id == product_id,
-                CartItem.variant_id == variant_id,
-            )
-            .options(
-                selectinload(CartItem.product).selectinload(
-                    Product.images
-                ).selectinload(ProductImage.variants),
-                selectinload(CartItem.variant),
-                with_loader_criteria(
-                    ProductImage,
-                    ProductImage.is_active.is_(True),
-                    include_aliases=True
-                ),
-            )
-            .order_by(CartItem.id)
-        )
-        item = (await self.session.execute(stmt)).scalar_one_or_none()
-
-        if item:
-            item.quantity = item.quantity + quantity
-            await self.session.flush()
-            return map_cart_item_to_entities(item)
-
-        item = CartItem(
+    ) -> list[CartItemEntity]:
+        # Один оператор: параллельные добавления той же позиции
+        # складываются на uq_cart_item_unique, а не падают на нём
+        stmt = insert(CartItem).values(
             cart_id=cart_id,
             product_id=product_id,
             variant_id=variant_id,
             quantity=quantity,
-            price=price
+            price=price,
         )
-        self.session.add(item)
-        await self.session.flush()
-
-        item = (
-            await self.session.scalars(
-                select(CartItem)
-                .where(CartItem.id == item.id)
-                .options(
-                    selectinload(CartItem.product).selectinload(
-                        Product.images
-                    ).selectinload(ProductImage.variants),
-                    selectinload(CartItem.variant),
-                    with_loader_criteria(
-                        ProductImage,
-                        ProductImage.is_active.is_(True),
-                        include_aliases=True
-                    ),
-                )
-            )
-        ).one()
-
-        return map_cart_item_to_entities(item)
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_cart_item_unique",
+            set_={"quantity": CartItem.quantity + stmt.excluded.quantity},
+        ).returning(*_RETURNING)
+        rows = (await self.session.execute(_lines_after(cart_id, stmt.cte("changed")))).all()
+        return [map_cart_item_values_to_entity(row) for row in rows]
 
     async def replace_items(
         self,
         cart_id: int,
         items: list[tuple[str, str, int, Decimal]]
-    ) -> None:
-        await self.clear(cart_id)
-        for product_id, variant_id, quantity, price in items:
-            self.session.add(
-                CartItem(
-                    cart_id=cart_id,
-                    product_id=product_id,
-                    variant_id=variant_id,
+    ) -> list[CartItemEntity]:
+        # Слияние с текущими строками: новые позиции — одним INSERT,
+        # изменённые — одним UPDATE ... FROM (VALUES ...), лишние — одним
+        # DELETE; совпадающие строки не переписываются
+        wanted = {
+            (product_id, variant_id): (quantity, price)
+            for product_id, variant_id, quantity, price in items
+        }
+        current = (
+            await self.session.execute(
+                select(*_RETURNING).where(CartItem.cart_id == cart_id).order_by(CartItem.id)
+            )
+        ).all()
+
+        kept: list[CartItemEntity] = []
+        changed: list[tuple[int, int, Decimal]] = []
+        removed: list[int] = []
+        for row in current:
+            key = (row.product_id, row.variant_id)
+            if key not in wanted:
+                removed.append(row.id)
+                continue
+            quantity, price = wanted.pop(key)
+            if (quantity, price) != (row.quantity, row.price):
+                changed.append((row.id, quantity, price))
+            kept.append(
+                CartItemEntity(
+                    product_id=row.product_id,
+                    variant_id=row.variant_id,
                     quantity=quantity,
                     price=price
                 )
             )
-        await self.session.flush()
+
+        if removed:
+            await self.session.execute(
+                delete(CartItem)
+                .where(CartItem.id == any_(literal(removed, ARRAY(Integer))))
+            )
+        if changed:
+            rows = values(
+                column("id", Integer),
+                column("quantity", Integer),
+                column("price", Numeric(10, 2)),
+                name="changed",
+            ).data(changed)
+            await self.session.execute(
+                update(CartItem)
+                .where(CartItem.id == rows.c.id)
+                .values(quantity=rows.c.quantity, price=rows.c.price)
+                .execution_options(synchronize_session=False)
+            )
+        if wanted:
+            stmt = insert(CartItem).values([
+                {
+                    "cart_id": cart_id,
+                    "product_id": product_id,
+                    "variant_id": variant_id,
+                    "quantity": quantity,
+                    "price": price,
+                }
+                for (product_id, variant_id), (quantity, price) in wanted.items()
+            ])
+            # Позицию мог одновременно добавить другой запрос
+            await self.session.execute(
+                stmt.on_conflict_do_update(
+                    constraint="uq_cart_item_unique",
+                    set_={"quantity": stmt.excluded.quantity, "price": stmt.excluded.price},
+                )
+            )
+
+        # Порядок корзины — по id: оставшиеся строки, затем новые
+        return kept + [
+            CartItemEntity(
+                product_id=product_id,
+                variant_id=variant_id,
+                quantity=quantity,
+                price=price
+            )
+            for (product_id, variant_id), (quantity, price) in wanted.items()
+        ]
 
     async def set_quantity(
         self,
@@ -182,51 +235,42 @@ class CartWriterRepository(Repository[Cart], CartWriter):
         product_id: str,
         variant_id: str,
         quantity: int
-    ) -> CartItemEntity | None:
-        from leaf_flow.infrastructure.db.models.product import Product
+    ) -> list[CartItemEntity] | None:
         stmt = (
-            select(CartItem)
+            update(CartItem)
             .where(
                 CartItem.cart_id == cart_id,
                 CartItem.product_id == product_id,
                 CartItem.variant_id == variant_id
             )
-            .options(
-                selectinload(CartItem.product).selectinload(
-                    Product.images
-                ).selectinload(ProductImage.variants),
-                selectinload(CartItem.variant),
-                with_loader_criteria(
-                    ProductImage,
-                    ProductImage.is_active.is_(True),
-                    include_aliases=True
-                ),
-            )
-            .order_by(CartItem.id)
+            .values(quantity=quantity)
+            .returning(*_RETURNING)
         )
-        item = (await self.session.execute(stmt)).scalar_one_or_none()
-
-        if not item:
+        rows = (await self.session.execute(_lines_after(cart_id, stmt.cte("changed")))).all()
+        if not any(row.changed for row in rows):
             return None
-
-        item.quantity = quantity
-        await self.session.flush()
-        return map_cart_item_to_entities(item)
+        return [map_cart_item_values_to_entity(row) for row in rows]
 
     async def remove_item(
         self,
         cart_id: int,
         product_id: str,
         variant_id: str
-    ) -> None:
-        await self.session.execute(
+    ) -> list[CartItemEntity]:
+        stmt = (
             delete(CartItem)
             .where(
                 CartItem.cart_id == cart_id,
                 CartItem.product_id == product_id,
                 CartItem.variant_id == variant_id,
             )
+            .returning(CartItem.id)
         )
+        removed = stmt.cte("changed")
+        rows = (
+            await self.session.execute(_lines_after(cart_id, removed, with_changed=False))
+        ).all()
+        return [map_cart_item_values_to_entity(row) for row in rows]
 
     async def delete_by_user_id(self, user_id: int) -> bool:
         """
@@ -244,3 +288,13 @@ class CartWriterRepository(Repository[Cart], CartWriter):
             return True
 
         return False
+
+
+class NullCartSynchronizer(CartSynchronizer):
+    """Корзины и так живут в БД (CART_STORE=db): записывать нечего."""
+
+    async def sync(self, user_id: int) -> None:
+        return None
+
+    async def sync_dirty(self, limit: int) -> int:
+        return 0
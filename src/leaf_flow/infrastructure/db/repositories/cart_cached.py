@@ -0,0 +1,41 @@
+"""Чтение корзины без джойнов: строки позиций, данные продуктов — из общего кэша."""
+from sqlalchemy import ColumnElement, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from leaf_flow.application.ports.product_display import ProductDisplayReader
+from leaf_flow.domain.entities.cart import CartDetailEntity
+from leaf_flow.infrastructure.db.mappers.cart import (
+    map_cart_item_values_to_entity, map_cart_lines_to_detail
+)
+from leaf_flow.infrastructure.db.models.cart import Cart, CartItem
+from leaf_flow.infrastructure.db.repositories.cart import CartReaderRepository
+
+_carts = Cart.__table__
+_items = CartItem.__table__
+
+
+class CartCachedReaderRepository(CartReaderRepository):
+    def __init__(self, session: AsyncSession, displays: ProductDisplayReader):
+        super().__init__(session)
+        self._displays = displays
+
+    async def _get_items(self, *where: ColumnElement[bool]) -> CartDetailEntity:
+        it = _items
+        stmt = (
+            select(it.c.product_id, it.c.variant_id, it.c.quantity, it.c.price)
+            .select_from(it.join(_carts, _carts.c.id == it.c.cart_id))
+            .where(*where)
+            .order_by(it.c.id)
+        )
+        lines = [
+            map_cart_item_values_to_entity(row)
+            for row in (await self.session.execute(stmt)).all()
+        ]
+        displays = await self._displays.get_many({line.product_id for line in lines})
+        return map_cart_lines_to_detail(lines, displays)
+
+    async def get_cart(self, cart_id: int) -> CartDetailEntity:
+        return await self._get_items(_items.c.cart_id == cart_id)
+
+    async def get_cart_items_by_user(self, user_id: int) -> CartDetailEntity:
+        return await self._get_items(_carts.c.user_id == user_id)
@@ -0,0 +1,50 @@
+"""Чтение корзины без ORM-объектов: строки-кортежи и изображения одним запросом."""
+from sqlalchemy import ColumnElement, select
+
+from leaf_flow.domain.entities.cart import CartDetailEntity
+from leaf_flow.infrastructure.db.mappers.cart import map_cart_item_rows_to_detail
+from leaf_flow.infrastructure.db.models.cart import Cart, CartItem
+from leaf_flow.infrastructure.db.models.product import Product, ProductVariant
+from leaf_flow.infrastructure.db.repositories.cart import CartReaderRepository
+from leaf_flow.infrastructure.db.repositories.product_core import load_images
+
+_carts = Cart.__table__
+_items = CartItem.__table__
+_products = Product.__table__
+_variants = ProductVariant.__table__
+
+
+class CartCoreReaderRepository(CartReaderRepository):
+    async def _get_items(self, *where: ColumnElement[bool]) -> CartDetailEntity:
+        it = _items
+        stmt = (
+            select(
+                it.c.product_id,
+                it.c.variant_id,
+                it.c.quantity,
+                it.c.price,
+                _products.c.name.label("product_name"),
+                _products.c.image,
+                _variants.c.weight.label("variant_weight"),
+            )
+            .select_from(
+                it
+                .join(_carts, _carts.c.id == it.c.cart_id)
+                .join(_products, _products.c.id == it.c.product_id)
+                .join(_variants, _variants.c.id == it.c.variant_id)
+            )
+            .where(*where)
+            .order_by(it.c.id)
+        )
+        rows = (await self.session.execute(stmt)).all()
+        images = (
+            await load_images(self.session, {row.product_id for row in rows})
+            if rows else {}
+        )
+        return map_cart_item_rows_to_detail(rows, images)
+
+    async def get_cart(self, cart_id: int) -> CartDetailEntity:
+        return await self._get_items(_items.c.cart_id == cart_id)
+
+    async def get_cart_items_by_user(self, user_id: int) -> CartDetailEntity:
+        return await self._get_items(_carts.c.user_id == user_id)
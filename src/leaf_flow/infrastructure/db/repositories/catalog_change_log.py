@@ -0,0 +1,56 @@
+from typing import Collection
+
+from sqlalchemy import String, func, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from leaf_flow.application.dto.catalog import CatalogChangeLogPage
+from leaf_flow.application.ports.catalog_change_log import (
+    CatalogChangeLogReader, CatalogChangeLogWriter
+)
+from leaf_flow.infrastructure.db.models.catalog import CatalogChange
+from leaf_flow.infrastructure.db.repositories.base import Repository
+
+# Ключ advisory-блокировки записи журнала (произвольная константа)
+_CHANGE_LOG_LOCK = 0x1EAF_C4A6
+
+
+class CatalogChangeLogReaderRepository(Repository[CatalogChange], CatalogChangeLogReader):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, CatalogChange)
+
+    async def list_since(self, version: int, limit: int) -> CatalogChangeLogPage:
+        last_version = func.max(CatalogChange.version).label("last_version")
+        stmt = (
+            select(CatalogChange.product_id, last_version)
+            .where(CatalogChange.version > version)
+            .group_by(CatalogChange.product_id)
+            .order_by(last_version)
+            .limit(limit + 1)
+        )
+        rows = (await self.session.execute(stmt)).all()
+        page = rows[:limit]
+        return CatalogChangeLogPage(
+            product_ids=[row.product_id for row in page],
+            version=page[-1].last_version if page else version,
+            has_more=len(rows) > limit,
+        )
+
+
+class CatalogChangeLogWriterRepository(Repository[CatalogChange], CatalogChangeLogWriter):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, CatalogChange)
+
+    async def record(self, product_ids: Collection[str]) -> None:
+        if not product_ids:
+            return
+        # Блокировка держится до конца транзакции: версии выдаются и
+        # коммитятся по очереди, и читатель с since=N не пропустит
+        # версию меньше N, закоммиченную позже
+        await self.session.execute(select(func.pg_advisory_xact_lock(_CHANGE_LOG_LOCK)))
+        await self.session.execute(
+            insert(CatalogChange).from_select(
+                ["product_id"],
+                select(func.unnest(literal(sorted(product_ids), ARRAY(String)))),
+            )
+        )
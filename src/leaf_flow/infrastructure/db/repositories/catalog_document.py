@@ -0,0 +1,85 @@
+from typing import Collection, Sequence
+
+from sqlalchemy import select, delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from leaf_flow.application.ports.catalog_document import (
+    CatalogDocumentReader, CatalogDocumentWriter
+)
+from leaf_flow.domain.entities.product import ProductDetailEntity
+from leaf_flow.infrastructure.db.catalog_changes import mark_documents_changed
+from leaf_flow.infrastructure.db.mappers.catalog_document import (
+    encode_product_document, decode_product_document
+)
+from leaf_flow.infrastructure.db.models.catalog import CatalogProductDocument
+from leaf_flow.infrastructure.db.repositories.base import Repository
+
+
+class CatalogDocumentReaderRepository(
+    Repository[CatalogProductDocument], CatalogDocumentReader
+):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, CatalogProductDocument)
+
+    async def get(self, product_id: str) -> ProductDetailEntity | None:
+        stmt = select(CatalogProductDocument.document).where(
+            CatalogProductDocument.product_id == product_id
+        )
+        document = (await self.session.execute(stmt)).scalar_one_or_none()
+        return decode_product_document(document) if document is not None else None
+
+    async def get_many(
+        self,
+        product_ids: Collection[str]
+    ) -> dict[str, ProductDetailEntity]:
+        if not product_ids:
+            return {}
+        stmt = select(
+            CatalogProductDocument.product_id, CatalogProductDocument.document
+        ).where(CatalogProductDocument.product_id.in_(list(product_ids)))
+        rows = (await self.session.execute(stmt)).all()
+        return {
+            product_id: decode_product_document(document)
+            for product_id, document in rows
+        }
+
+    async def list_product_ids(self) -> set[str]:
+        stmt = select(CatalogProductDocument.product_id)
+        return set((await self.session.execute(stmt)).scalars().all())
+
+
+class CatalogDocumentWriterRepository(
+    Repository[CatalogProductDocument], CatalogDocumentWriter
+):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, CatalogProductDocument)
+
+    async def upsert(self, products: Sequence[ProductDetailEntity]) -> None:
+        if not products:
+            return
+        stmt = insert(CatalogProductDocument).values([
+            {"product_id": product.id, "document": encode_product_document(product)}
+            for product in products
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CatalogProductDocument.product_id],
+            set_={
+                "document": stmt.excluded.document,
+                "built_at": func.now(),
+            },
+        )
+        await self.session.execute(stmt)
+        mark_documents_changed(self.session, *(product.id for product in products))
+
+    async def delete(self, product_ids: Collection[str]) -> int:
+        if not product_ids:
+            return 0
+        stmt = (
+            delete(CatalogProductDocument)
+            .where(CatalogProductDocument.product_id.in_(list(product_ids)))
+            .returning(CatalogProductDocument.product_id)
+        )
+        deleted = (await self.session.execute(stmt)).scalars().all()
+        mark_documents_changed(self.session, *deleted)
+        return len(deleted)
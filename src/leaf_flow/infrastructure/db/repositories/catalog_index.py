@@ -0,0 +1,145 @@
+from typing import Collection, Sequence
+
+from sqlalchemy import select, func, union_all
+from sqlalchemy.orm import selectinload, with_loader_criteria
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from leaf_flow.application.dto.catalog import (
+    AttributeValueSynonym, ProductFacetSource, Suggestion, SuggestionSource
+)
+from leaf_flow.application.ports.catalog_index import CatalogIndexReader
+from leaf_flow.domain.entities.product import ProductAttributesEntity
+from leaf_flow.infrastructure.db.mappers.admin.attribute import map_attribute_to_entity
+from leaf_flow.infrastructure.db.models.product import (
+    Category, Product, ProductAttribute, ProductAttributeValue,
+    ProductAttributeValueLink, ProductAttributeValueSynonym
+)
+
+
+class CatalogIndexReaderRepository(CatalogIndexReader):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def list_facet_attributes(self) -> Sequence[ProductAttributesEntity]:
+        stmt = (
+            select(ProductAttribute)
+            .where(ProductAttribute.is_active.is_(True))
+            .options(
+                selectinload(ProductAttribute.values),
+                with_loader_criteria(
+                    ProductAttributeValue,
+                    ProductAttributeValue.is_active.is_(True),
+                    include_aliases=True
+                ),
+            )
+            .order_by(ProductAttribute.sort_order, ProductAttribute.id)
+        )
+        attributes = (await self.session.execute(stmt)).scalars().all()
+        return [map_attribute_to_entity(attribute) for attribute in attributes]
+
+    async def list_product_facets(
+        self,
+        product_ids: Collection[str] | None = None
+    ) -> Sequence[ProductFacetSource]:
+        value_ids = func.array_remove(
+            func.array_agg(ProductAttributeValueLink.attribute_value_id), None
+        )
+        stmt = (
+            select(Product.id, Product.category_slug, Product.is_active, value_ids)
+            .outerjoin(
+                ProductAttributeValueLink,
+                ProductAttributeValueLink.product_id == Product.id
+            )
+            .group_by(Product.id)
+        )
+        if product_ids is None:
+            stmt = stmt.where(Product.is_active.is_(True))
+        else:
+            stmt = stmt.where(Product.id.in_(list(product_ids)))
+
+        rows = (await self.session.execute(stmt)).all()
+        return [
+            ProductFacetSource(
+                product_id=product_id,
+                category_slug=category_slug,
+                is_active=is_active,
+                attribute_value_ids=frozenset(values or ()),
+            )
+            for product_id, category_slug, is_active, values in rows
+        ]
+
+    async def list_value_synonyms(self) -> Sequence[AttributeValueSynonym]:
+        active = (
+            ProductAttribute.is_active.is_(True),
+            ProductAttributeValue.is_active.is_(True),
+        )
+        names = (
+            select(ProductAttribute.code, ProductAttributeValue.slug, ProductAttributeValue.name)
+            .join(ProductAttributeValue.attribute)
+            .where(*active)
+        )
+        synonyms = (
+            select(
+                ProductAttribute.code,
+                ProductAttributeValue.slug,
+                ProductAttributeValueSynonym.synonym,
+            )
+            .join(ProductAttributeValueSynonym.attribute_value)
+            .join(ProductAttributeValue.attribute)
+            .where(*active)
+        )
+        rows = (await self.session.execute(union_all(names, synonyms))).all()
+        return [
+            AttributeValueSynonym(attribute_code=code, value_slug=slug, phrase=phrase)
+            for code, slug, phrase in rows
+        ]
+
+    async def list_suggestion_sources(self) -> Sequence[SuggestionSource]:
+        categories = (
+            await self.session.execute(select(Category.slug, Category.label))
+        ).all()
+        values = (
+            await self.session.execute(
+                select(
+                    ProductAttribute.code,
+                    ProductAttributeValue.slug,
+                    ProductAttributeValue.name,
+                    func.array_remove(
+                        func.array_agg(ProductAttributeValueSynonym.synonym), None
+                    ),
+                )
+                .join(ProductAttributeValue.attribute)
+                .outerjoin(ProductAttributeValue.synonyms)
+                .where(
+                    ProductAttribute.is_active.is_(True),
+                    ProductAttributeValue.is_active.is_(True),
+                )
+                .group_by(ProductAttribute.code, ProductAttributeValue.id)
+            )
+        ).all()
+        products = (
+            await self.session.execute(
+                select(Product.id, Product.name, Product.tags)
+                .where(Product.is_active.is_(True))
+            )
+        ).all()
+
+        sources = [
+            SuggestionSource(Suggestion("category", label, slug), (label,))
+            for slug, label in categories
+        ]
+        sources += [
+            SuggestionSource(
+                Suggestion("attribute", name, f"{code}:{slug}"), (name, *synonyms)
+            )
+            for code, slug, name, synonyms in values
+        ]
+        sources += [
+            SuggestionSource(Suggestion("product", name, product_id), (name,))
+            for product_id, name, _ in products
+        ]
+        tags = {tag for _, _, product_tags in products for tag in product_tags or ()}
+        sources += [
+            SuggestionSource(Suggestion("tag", tag, tag), (tag,)) for tag in sorted(tags)
+        ]
+        return sources
@@ -1,11 +1,11 @@
 from typing import Sequence
 
-from sqlalchemy import select
+from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from leaf_flow.application.ports.category import CategoryReader
 from leaf_flow.infrastructure.db.mappers.category import map_product_category_model_to_entity
-from leaf_flow.infrastructure.db.models.product import Category
+from leaf_flow.infrastructure.db.models.product import Category, Product
 from leaf_flow.infrastructure.db.repositories.base import Repository
 from leaf_flow.domain.entities.category import CategoryEntity
 
@@ -19,5 +19,18 @@ class CategoryReaderRepository(Repository[Category], CategoryReader):
         return map_product_category_model_to_entity(category.scalar_one_or_none())
 
     async def list_categories(self) -> Sequence[CategoryEntity]:
-        rows = (await self.session.execute(select(Category))).scalars().all()
-        return [map_product_category_model_to_entity(category) for category in rows]
+        # Счётчики — одним группирующим запросом; пустые категории тоже в списке
+        stmt = (
+            select(Category, func.count(Product.id))
+            .outerjoin(
+                Product,
+                and_(Product.category_slug == Category.slug, Product.is_active.is_(True)),
+            )
+            .group_by(Category.slug)
+            .order_by(Category.sort_order, Category.slug)
+        )
+        rows = (await self.session.execute(stmt)).all()
+        return [
+            map_product_category_model_to_entity(category, product_count)
+            for category, product_count in rows
+        ]
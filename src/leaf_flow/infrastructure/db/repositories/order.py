@@ -1,7 +1,7 @@
 from typing import Sequence
 
 from sqlalchemy import select, update
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import noload, selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from leaf_flow.application.ports.order import OrderReader, OrderWriter
@@ -14,21 +14,28 @@ from leaf_flow.infrastructure.db.models.order import (
 from leaf_flow.infrastructure.db.repositories.base import Repository
 
 
+def _items_load_options(with_items: bool) -> list:
+    if not with_items:
+        return [noload(Order.items)]
+    return [
+        selectinload(Order.items),
+        selectinload(Order.items).selectinload(OrderItem.variant),
+        selectinload(Order.items).selectinload(OrderItem.product)
+    ]
+
+
 class OrderReaderRepository(Repository[Order], OrderReader):
     def __init__(self, session: AsyncSession):
         super().__init__(session, Order)
 
     async def get_order_with_items(
         self,
-        order_id: str
+        order_id: str,
+        with_items: bool = True
     ) -> OrderEntity | None:
         stmt = (
             select(Order)
-            .options(
-                selectinload(Order.items),
-                selectinload(Order.items).selectinload(OrderItem.variant),
-                selectinload(Order.items).selectinload(OrderItem.product)
-            )
+            .options(*_items_load_options(with_items))
             .where(Order.id == order_id)
         )
         order = (await self.session.execute(stmt)).scalar_one_or_none()
@@ -42,16 +49,13 @@ class OrderReaderRepository(Repository[Order], OrderReader):
         self,
         user_id: int,
         limit: int,
-        offset: int
+        offset: int,
+        with_items: bool = True
     ) -> Sequence[OrderEntity]:
         stmt = (
             select(Order)
             .where(Order.user_id == user_id)
-            .options(
-                selectinload(Order.items),
-                selectinload(Order.items).selectinload(OrderItem.variant),
-                selectinload(Order.items).selectinload(OrderItem.product)
-            )
+            .options(*_items_load_options(with_items))
             .order_by(Order.created_at.desc())
             .limit(limit)
             .offset(offset)
@@ -0,0 +1,49 @@
+"""Чтение заказов без джойнов с продуктами: данные продуктов — из общего кэша."""
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from leaf_flow.application.ports.product_display import ProductDisplayReader
+from leaf_flow.domain.entities.order import OrderEntity
+from leaf_flow.infrastructure.db.mappers.order import (
+    map_order_item_values_to_entity, map_order_row_and_items_to_entity
+)
+from leaf_flow.infrastructure.db.models.order import OrderItem
+from leaf_flow.infrastructure.db.repositories.order_core import OrderCoreReaderRepository
+from leaf_flow.infrastructure.db.repositories.product import _id_in
+
+_items = OrderItem.__table__
+
+
+class OrderCachedReaderRepository(OrderCoreReaderRepository):
+    def __init__(self, session: AsyncSession, displays: ProductDisplayReader):
+        super().__init__(session)
+        self._displays = displays
+
+    async def _get_orders(self, stmt: Select, with_items: bool) -> list[OrderEntity]:
+        rows = (await self.session.execute(stmt)).all()
+        if not rows:
+            return []
+
+        grouped: dict[str, list] = {}
+        if with_items:
+            it = _items
+            item_rows = (
+                await self.session.execute(
+                    select(
+                        it.c.order_id, it.c.product_id, it.c.variant_id,
+                        it.c.quantity, it.c.price, it.c.total,
+                    )
+                    .where(_id_in([row.id for row in rows], it.c.order_id))
+                    .order_by(it.c.id)
+                )
+            ).all()
+            displays = await self._displays.get_many({row.product_id for row in item_rows})
+            for row in item_rows:
+                grouped.setdefault(row.order_id, []).append(
+                    map_order_item_values_to_entity(row, displays.get(row.product_id))
+                )
+
+        return [
+            map_order_row_and_items_to_entity(row, grouped.get(row.id, []))
+            for row in rows
+        ]
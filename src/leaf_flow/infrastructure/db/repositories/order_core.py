@@ -0,0 +1,91 @@
+"""Чтение заказов без ORM-объектов: заказы и их позиции двумя запросами."""
+from typing import Any, Sequence
+
+from sqlalchemy import Select, select
+
+from leaf_flow.domain.entities.order import OrderEntity
+from leaf_flow.infrastructure.db.mappers.order import map_order_row_to_entity
+from leaf_flow.infrastructure.db.models.order import Order, OrderItem
+from leaf_flow.infrastructure.db.models.product import Product, ProductVariant
+from leaf_flow.infrastructure.db.repositories.order import OrderReaderRepository
+from leaf_flow.infrastructure.db.repositories.product import _id_in
+
+_orders = Order.__table__
+_items = OrderItem.__table__
+_products = Product.__table__
+_variants = ProductVariant.__table__
+
+_ORDER_COLUMNS = (
+    _orders.c.id,
+    _orders.c.customer_name,
+    _orders.c.phone,
+    _orders.c.user_id,
+    _orders.c.delivery,
+    _orders.c.total,
+    _orders.c.address,
+    _orders.c.comment,
+    _orders.c.status,
+    _orders.c.created_at,
+)
+
+
+class OrderCoreReaderRepository(OrderReaderRepository):
+    async def _load_items(self, order_ids: list[str]) -> dict[str, list[Any]]:
+        it = _items
+        stmt = (
+            select(
+                it.c.order_id,
+                it.c.product_id,
+                it.c.variant_id,
+                it.c.quantity,
+                it.c.price,
+                it.c.total,
+                _products.c.name.label("product_name"),
+                _products.c.image,
+                _variants.c.weight.label("variant_weight"),
+            )
+            .select_from(
+                it
+                .join(_products, _products.c.id == it.c.product_id)
+                .join(_variants, _variants.c.id == it.c.variant_id)
+            )
+            .where(_id_in(order_ids, it.c.order_id))
+            .order_by(it.c.id)
+        )
+        grouped: dict[str, list[Any]] = {}
+        for row in (await self.session.execute(stmt)).all():
+            grouped.setdefault(row.order_id, []).append(row)
+        return grouped
+
+    async def _get_orders(self, stmt: Select, with_items: bool) -> list[OrderEntity]:
+        rows = (await self.session.execute(stmt)).all()
+        if not rows:
+            return []
+        items = await self._load_items([row.id for row in rows]) if with_items else {}
+        return [map_order_row_to_entity(row, items.get(row.id, [])) for row in rows]
+
+    async def get_order_with_items(
+        self,
+        order_id: str,
+        with_items: bool = True
+    ) -> OrderEntity | None:
+        orders = await self._get_orders(
+            select(*_ORDER_COLUMNS).where(_orders.c.id == order_id), with_items
+        )
+        return orders[0] if orders else None
+
+    async def list_orders_by_user(
+        self,
+        user_id: int,
+        limit: int,
+        offset: int,
+        with_items: bool = True
+    ) -> Sequence[OrderEntity]:
+        return await self._get_orders(
+            select(*_ORDER_COLUMNS)
+            .where(_orders.c.user_id == user_id)
+            .order_by(_orders.c.created_at.desc())
+            .limit(limit)
+            .offset(offset),
+            with_items,
+        )
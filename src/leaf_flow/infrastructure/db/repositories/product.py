@@ -1,122 +1,361 @@
-from typing import Sequence
+from decimal import Decimal, InvalidOperation
+from typing import Any, AsyncIterator, Collection
 
-from sqlalchemy import select, func, or_, tuple_
-from sqlalchemy.orm import selectinload, with_loader_criteria
+from sqlalchemy import (
+    ColumnElement, Select, String, select, func, or_, tuple_, literal, literal_column, any_
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import load_only, noload, selectinload, with_loader_criteria
+from sqlalchemy.sql.elements import Label
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from leaf_flow.application.dto.catalog import ProductListQuery, ProductPage
 from leaf_flow.application.ports.product import ProductsReader
-from leaf_flow.domain.entities.product import ProductEntity, ProductDetailEntity, ProductVariantEntity
+from leaf_flow.domain.entities.product import (
+    ProductDetailEntity, ProductEntity, ProductVariantEntity
+)
 
 from leaf_flow.infrastructure.db.models.product import (
     Product, ProductVariant, ProductAttributeValue,
     ProductBrewProfile, ProductImage, ProductAttribute
 )
-from leaf_flow.infrastructure.db.repositories.base import Repository
+from leaf_flow.infrastructure.db.repositories.base import Repository, keyset_after
 from leaf_flow.infrastructure.db.mappers.product import (
+    PRUNED_COLUMN_VALUES,
     map_product_model_to_entity,
     map_product_detail_model_to_entity,
     map_product_variant_model_to_entity
 )
 
+_PRICE_SORTS = frozenset({"price_asc", "price_desc"})
+# Сортировки, первый ключ которых может быть NULL (такие продукты — в конце)
+_NULLABLE_SORTS = _PRICE_SORTS | {"popular"}
+
+_TS_RUSSIAN = literal_column("'russian'::regconfig")
+_TS_SIMPLE = literal_column("'simple'::regconfig")
+
+
+def _search_query(search: str) -> ColumnElement:
+    """tsquery по обеим конфигурациям, в которых построен Product.search_vector."""
+    return func.websearch_to_tsquery(_TS_RUSSIAN, search).op("||")(
+        func.websearch_to_tsquery(_TS_SIMPLE, search)
+    )
+
+
+def _search_condition(search: str) -> ColumnElement[bool]:
+    """
+    Совпадение по полнотекстовому индексу либо похожее слово в названии
+    (pg_trgm, порог pg_trgm.word_similarity_threshold) — для опечаток.
+    """
+    return or_(
+        Product.search_vector.op("@@")(_search_query(search)),
+        literal(search).op("<%")(Product.name),
+    )
+
+
+def _id_in(
+    product_ids: Collection[str],
+    column: ColumnElement[str] = Product.id,
+) -> ColumnElement[bool]:
+    # Один параметр-массив вместо IN с параметром на каждый id
+    return column == any_(literal(list(product_ids), ARRAY(String)))
+
+
+def _search_rank(search: str) -> ColumnElement[float]:
+    return (
+        func.ts_rank_cd(Product.search_vector, _search_query(search))
+        + func.word_similarity(search, Product.name)
+    )
+
+
+def _after_values(query: ProductListQuery) -> tuple:
+    """Ключ курсора; цена приходит в курсоре строкой и восстанавливается в Decimal."""
+    after = query.after or ()
+    if query.sort not in _PRICE_SORTS or not after or after[0] is None:
+        return after
+    try:
+        return (Decimal(after[0]), *after[1:])
+    except (InvalidOperation, TypeError):
+        raise ValueError("INVALID_CURSOR")
+
+
 class ProductRepository(Repository[Product], ProductsReader):
     def __init__(self, session: AsyncSession):
         super().__init__(session, Product)
 
+    @staticmethod
+    def _pruned_columns(query: ProductListQuery | None) -> frozenset[str]:
+        """Скалярные колонки списка, которые ответу не нужны."""
+        if query is None or query.columns is None:
+            return frozenset()
+        return frozenset(PRUNED_COLUMN_VALUES.keys() - set(query.columns))
+
+    @classmethod
+    def _list_columns(cls, query: ProductListQuery | None = None) -> list[ColumnElement[Any]]:
+        """Колонки элемента списка; ненужные ответу — константы-заглушки."""
+        pruned = cls._pruned_columns(query)
+        columns: list[ColumnElement[Any]] = [Product.__table__.c.id]
+        for name in PRUNED_COLUMN_VALUES:
+            column = Product.__table__.c[name]
+            columns.append(
+                literal(PRUNED_COLUMN_VALUES[name], column.type).label(name)
+                if name in pruned else column
+            )
+        return columns
+
+    @classmethod
+    def _list_load_options(cls, query: ProductListQuery | None = None) -> list:
+        # Связи, не нужные ответу, не грузятся вовсе: noload даёт пустой список
+        with_variants = query is None or query.with_variants
+        with_images = query is None or query.with_images
+        pruned = cls._pruned_columns(query)
+        # Ненужные скалярные колонки — тоже: маппер подставит заглушки
+        columns = (
+            [load_only(Product.id, *(
+                getattr(Product, name) for name in PRUNED_COLUMN_VALUES if name not in pruned
+            ))]
+            if pruned else []
+        )
+        return [
+            *columns,
+            selectinload(Product.variants) if with_variants else noload(Product.variants),
+            (
+                selectinload(Product.images).selectinload(ProductImage.variants)
+                if with_images else noload(Product.images)
+            ),
+            with_loader_criteria(
+                ProductVariant,
+                ProductVariant.is_active.is_(True),
+                include_aliases=True
+            ),
+            with_loader_criteria(
+                ProductImage,
+                ProductImage.is_active.is_(True),
+                include_aliases=True
+            ),
+        ]
+
+    @staticmethod
+    def _list_filters(
+        query: ProductListQuery,
+        product_ids: Collection[str] | None = None,
+        search_product_ids: Collection[str] | None = None,
+    ) -> list[ColumnElement[bool]]:
+        filters: list[ColumnElement[bool]] = [Product.is_active.is_(True)]
+
+        if query.category_slug:
+            filters.append(Product.category_slug == query.category_slug)
+
+        if query.search:
+            condition = _search_condition(query.search.lower())
+            if search_product_ids:
+                # продукты со значениями атрибутов, названными в запросе синонимом
+                condition = or_(condition, _id_in(search_product_ids))
+            filters.append(condition)
+
+        if product_ids is not None:
+            filters.append(_id_in(product_ids))
+
+        # Диапазоны цен пересекаются; продукты без цены не подходят
+        if query.price_min is not None:
+            filters.append(Product.max_price >= query.price_min)
+        if query.price_max is not None:
+            filters.append(Product.min_price <= query.price_max)
+
+        return filters
+
+    @staticmethod
+    def _sort_keys(query: ProductListQuery) -> list[tuple[ColumnElement, bool]]:
+        """Ключ сортировки: пары (выражение, по убыванию); последним всегда идёт id."""
+        if query.sort == "relevance" and query.search:
+            return [
+                (_search_rank(query.search.lower()).label("relevance"), True),
+                (Product.id, False),
+            ]
+        # id в направлении первого ключа — под индексы ix_products_active_category_*_id
+        if query.sort == "price_asc":
+            return [(Product.min_price, False), (Product.id, False)]
+        if query.sort == "price_desc":
+            return [(Product.max_price, True), (Product.id, True)]
+        if query.sort == "popular":
+            return [(Product.popularity, True), (Product.id, True)]
+        return [(Product.name, False), (Product.id, False)]
+
+
+    @staticmethod
+    def _sort_columns(sort_keys: list[tuple[ColumnElement, bool]]) -> list[ColumnElement]:
+        """
+        Колонки ключа сортировки для выборки рядом с колонками продукта.
+
+        Метки (relevance) выбираются как есть, чтобы ORDER BY ссылался
+        на них по имени; колонки — под своими именами, без конфликта
+        с колонками продукта.
+        """
+        return [
+            column if isinstance(column, Label) else column.label(f"sort_{n}")
+            for n, (column, _) in enumerate(sort_keys)
+        ]
+
+    async def _count(self, filters: list[ColumnElement[bool]]) -> int:
+        count_stmt = select(func.count()).select_from(Product).where(*filters)
+        return (await self.session.execute(count_stmt)).scalar_one()
+
+    @staticmethod
+    def _paginate(
+        stmt: Select,
+        query: ProductListQuery,
+        sort_keys: list[tuple[ColumnElement, bool]],
+    ) -> Select:
+        # Цена бывает NULL (нет активных вариантов), популярность — тоже
+        # (не было активности); такие продукты в конце
+        nullable = {0} if query.sort in _NULLABLE_SORTS else set()
+        order_by = []
+        for i, (column, desc) in enumerate(sort_keys):
+            clause = column.desc() if desc else column.asc()
+            order_by.append(clause.nulls_last() if i in nullable else clause)
+        stmt = (
+            stmt
+            .order_by(*order_by)
+            # лишняя строка говорит о наличии следующей страницы
+            .limit(query.limit + 1)
+        )
+        if query.after is not None:
+            return stmt.where(
+                keyset_after(sort_keys, _after_values(query), nullable)
+            )
+        return stmt.offset(query.offset)
+
+    async def _fetch_list_page(
+        self,
+        query: ProductListQuery,
+        filters: list[ColumnElement[bool]],
+        sort_keys: list[tuple[ColumnElement, bool]],
+    ) -> tuple[list[ProductEntity], list[tuple], int | None]:
+        """
+        Строки страницы (с лишней строкой для проверки продолжения).
+
+        Возвращает сущности, значения ключа сортировки каждой из них
+        и total, если реализация посчитала его попутно (иначе None).
+        """
+        stmt = self._paginate(
+            select(Product, *(column for column, _ in sort_keys))
+            .where(*filters)
+            .options(*self._list_load_options(query)),
+            query,
+            sort_keys,
+        )
+        rows = (await self.session.execute(stmt)).all()
+        return (
+            [map_product_model_to_entity(row[0]) for row in rows],
+            [tuple(row[1:]) for row in rows],
+            None,
+        )
+
     async def get_list_products(
         self,
-        category_slug: str | None,
-        search: str | None,
-        limit: int,
-        offset: int,
-    ) -> tuple[int, Sequence[ProductEntity]]:
+        query: ProductListQuery,
+        product_ids: Collection[str] | None = None,
+        search_product_ids: Collection[str] | None = None,
+    ) -> ProductPage:
+        filters = self._list_filters(query, product_ids, search_product_ids)
+        sort_keys = self._sort_keys(query)
+
+        items, keys, total = await self._fetch_list_page(query, filters, sort_keys)
+        if query.with_total and total is None:
+            total = await self._count(filters)
+
+        has_next = len(items) > query.limit
+        return ProductPage(
+            total=total if query.with_total else None,
+            items=items[:query.limit],
+            next_after=keys[query.limit - 1] if has_next else None,
+        )
+
+    async def get_list_product_ids(
+        self,
+        query: ProductListQuery,
+        search_product_ids: Collection[str] | None = None,
+    ) -> list[str]:
+        stmt = select(Product.id).where(
+            *self._list_filters(query, search_product_ids=search_product_ids)
+        )
+        return list((await self.session.execute(stmt)).scalars().all())
 
+    async def stream_products(self, batch_size: int) -> AsyncIterator[list[ProductEntity]]:
         stmt = (
             select(Product)
             .where(Product.is_active.is_(True))
-            .options(
-                selectinload(Product.variants),
-                selectinload(Product.images).selectinload(ProductImage.variants),
-                with_loader_criteria(
-                    ProductVariant,
-                    ProductVariant.is_active.is_(True),
-                    include_aliases=True
-                ),
-                with_loader_criteria(
-                    ProductImage,
-                    ProductImage.is_active.is_(True),
-                    include_aliases=True
-                ),
-            )
+            .order_by(Product.id)
+            .options(*self._list_load_options())
+            # серверный курсор; selectinload выполняется на каждую пачку
+            .execution_options(yield_per=batch_size)
         )
+        result = await self.session.stream(stmt)
+        async for products in result.scalars().partitions():
+            yield [map_product_model_to_entity(product) for product in products]
 
-        if category_slug:
-            stmt = stmt.where(Product.category_slug == category_slug)
-
-        if search:
-            s = search.lower()
-            like_pattern = f"%{s}%"
-            stmt = stmt.where(
-                or_(
-                    Product.name.ilike(like_pattern),
-                    Product.description.ilike(like_pattern),
-                    Product.tags.contains([s]),
-                )
-            )
-
-        count_stmt = select(func.count()).select_from(stmt.subquery())
-        total = (await self.session.execute(count_stmt)).scalar_one()
-
-        rows = (
-            await self.session.execute(
-                stmt.order_by(Product.name).limit(limit).offset(offset)
-            )
-        ).scalars().all()
+    @staticmethod
+    def _detail_load_options() -> list:
+        return [
+            selectinload(Product.variants),
+            selectinload(
+                Product.attribute_values
+            ).selectinload(
+                ProductAttributeValue.attribute
+            ),
+            selectinload(Product.brew_profiles),
+            selectinload(Product.images).selectinload(ProductImage.variants),
 
-        return total, [map_product_model_to_entity(p) for p in rows]
+            with_loader_criteria(
+                ProductVariant,
+                ProductVariant.is_active.is_(True),
+                include_aliases=True
+            ),
+            with_loader_criteria(
+                ProductBrewProfile,
+                ProductBrewProfile.is_active.is_(True),
+                include_aliases=True
+            ),
+            with_loader_criteria(
+                ProductImage,
+                ProductImage.is_active.is_(True),
+                include_aliases=True
+            ),
+            with_loader_criteria(
+                ProductAttributeValue,
+                ProductAttributeValue.is_active.is_(True),
+                include_aliases=True
+            ),
+            with_loader_criteria(
+                ProductAttribute,
+                ProductAttribute.is_active.is_(True),
+                include_aliases=True
+            ),
+        ]
 
     async def get_with_variants(self, product_id: str) -> ProductDetailEntity | None:
         stmt = (
             select(Product)
             .where(Product.id == product_id, Product.is_active.is_(True))
-            .options(
-                selectinload(Product.variants),
-                selectinload(
-                    Product.attribute_values
-                ).selectinload(
-                    ProductAttributeValue.attribute
-                ),
-                selectinload(Product.brew_profiles),
-                selectinload(Product.images).selectinload(ProductImage.variants),
-
-                with_loader_criteria(
-                    ProductVariant,
-                    ProductVariant.is_active.is_(True),
-                    include_aliases=True
-                ),
-                with_loader_criteria(
-                    ProductBrewProfile,
-                    ProductBrewProfile.is_active.is_(True),
-                    include_aliases=True
-                ),
-                with_loader_criteria(
-                    ProductImage,
-                    ProductImage.is_active.is_(True),
-                    include_aliases=True
-                ),
-                with_loader_criteria(
-                    ProductAttributeValue,
-                    ProductAttributeValue.is_active.is_(True),
-                    include_aliases=True
-                ),
-                with_loader_criteria(
-                    ProductAttribute,
-                    ProductAttribute.is_active.is_(True),
-                    include_aliases=True
-                ),
-            )
+            .options(*self._detail_load_options())
         )
-        result = await self.session.execute(stmt)
-        return map_product_detail_model_to_entity(result.scalar_one_or_none())
+        product = (await self.session.execute(stmt)).scalar_one_or_none()
+
+        if not product:
+            return None
+
+        return map_product_detail_model_to_entity(product)
+
+    async def get_details(self, product_ids: Collection[str]) -> list[ProductDetailEntity]:
+        if not product_ids:
+            return []
+        stmt = (
+            select(Product)
+            .where(_id_in(product_ids), Product.is_active.is_(True))
+            .options(*self._detail_load_options())
+        )
+        products = (await self.session.execute(stmt)).scalars().all()
+        return [map_product_detail_model_to_entity(product) for product in products]
 
     async def get_for_product_variant(
         self,
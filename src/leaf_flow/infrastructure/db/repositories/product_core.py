@@ -0,0 +1,265 @@
+"""
+Чтение каталога без ORM-объектов.
+
+Нужные колонки выбираются из таблиц (SQLAlchemy Core), а строки-кортежи
+собираются в доменные dataclass'ы напрямую — без identity map
+и инструментирования атрибутов. Связанные коллекции грузятся отдельным
+запросом на коллекцию по массиву id продуктов, как и в selectinload.
+"""
+from typing import Any, AsyncIterator, Collection, Sequence
+
+from sqlalchemy import ColumnElement, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from leaf_flow.application.dto.catalog import ProductListQuery
+from leaf_flow.domain.entities.product import (
+    ProductDetailEntity,
+    ProductEntity,
+    ProductVariantEntity,
+    ProductImageEntity,
+    BrewProfileEntity,
+    ProductAttributesEntity
+)
+from leaf_flow.infrastructure.db.mappers.product_rows import (
+    map_variant_row_to_entity,
+    map_image_rows_to_entities,
+    map_brew_profile_row_to_entity,
+    map_attribute_rows_to_entities,
+    map_product_row_to_entity,
+    map_product_detail_row_to_entity
+)
+from leaf_flow.infrastructure.db.models.product import (
+    Product, ProductVariant, ProductImage, ProductImageVariant,
+    ProductBrewProfile, ProductAttribute, ProductAttributeValue,
+    ProductAttributeValueLink
+)
+from leaf_flow.infrastructure.db.repositories.product import ProductRepository, _id_in
+
+_products = Product.__table__
+_variants = ProductVariant.__table__
+_images = ProductImage.__table__
+_image_variants = ProductImageVariant.__table__
+_brew_profiles = ProductBrewProfile.__table__
+_attributes = ProductAttribute.__table__
+_values = ProductAttributeValue.__table__
+_value_links = ProductAttributeValueLink.__table__
+
+_LIST_COLUMNS = (
+    _products.c.id,
+    _products.c.name,
+    _products.c.category_slug,
+    _products.c.tags,
+    _products.c.image,
+    _products.c.product_type_code,
+    _products.c.is_active,
+    _products.c.created_at,
+    _products.c.updated_at,
+    _products.c.sort_order,
+    _products.c.min_price,
+    _products.c.max_price,
+)
+_DETAIL_COLUMNS = (*_LIST_COLUMNS, _products.c.description)
+
+
+def _group_by_product(rows: Sequence[Any]) -> dict[str, list[Any]]:
+    grouped: dict[str, list[Any]] = {}
+    for row in rows:
+        grouped.setdefault(row.product_id, []).append(row)
+    return grouped
+
+
+async def load_variants(
+    session: AsyncSession,
+    product_ids: Collection[str],
+) -> dict[str, list[ProductVariantEntity]]:
+    """Активные варианты по продуктам, в порядке карточки."""
+    v = _variants
+    stmt = (
+        select(
+            v.c.id, v.c.product_id, v.c.weight, v.c.price, v.c.is_active,
+            v.c.created_at, v.c.updated_at, v.c.sort_order,
+        )
+        .where(_id_in(product_ids, v.c.product_id), v.c.is_active.is_(True))
+        .order_by(v.c.sort_order, v.c.weight, v.c.id)
+    )
+    rows = (await session.execute(stmt)).all()
+    return {
+        product_id: [map_variant_row_to_entity(row) for row in group]
+        for product_id, group in _group_by_product(rows).items()
+    }
+
+
+async def load_images(
+    session: AsyncSession,
+    product_ids: Collection[str],
+) -> dict[str, list[ProductImageEntity]]:
+    """Активные изображения по продуктам вместе с вариантами — одним запросом."""
+    i, iv = _images, _image_variants
+    stmt = (
+        select(
+            i.c.id, i.c.product_id, i.c.title, i.c.image_url,
+            i.c.is_active, i.c.sort_order, i.c.srcset,
+            iv.c.id.label("variant_id"), iv.c.variant, iv.c.format,
+            iv.c.storage_key, iv.c.width, iv.c.height, iv.c.byte_size,
+        )
+        .select_from(i.outerjoin(iv, iv.c.product_image_id == i.c.id))
+        .where(_id_in(product_ids, i.c.product_id), i.c.is_active.is_(True))
+        # строки одного изображения должны идти подряд
+        .order_by(i.c.sort_order, i.c.id, iv.c.id)
+    )
+    rows = (await session.execute(stmt)).all()
+    return {
+        product_id: map_image_rows_to_entities(group)
+        for product_id, group in _group_by_product(rows).items()
+    }
+
+
+async def load_brew_profiles(
+    session: AsyncSession,
+    product_ids: Collection[str],
+) -> dict[str, list[BrewProfileEntity]]:
+    p = _brew_profiles
+    stmt = (
+        select(
+            p.c.id, p.c.product_id, p.c.method, p.c.teaware, p.c.temperature,
+            p.c.brew_time, p.c.weight, p.c.note, p.c.sort_order, p.c.is_active,
+            p.c.created_at, p.c.updated_at,
+        )
+        .where(_id_in(product_ids, p.c.product_id), p.c.is_active.is_(True))
+        .order_by(p.c.sort_order, p.c.id)
+    )
+    rows = (await session.execute(stmt)).all()
+    return {
+        product_id: [map_brew_profile_row_to_entity(row) for row in group]
+        for product_id, group in _group_by_product(rows).items()
+    }
+
+
+async def load_attributes(
+    session: AsyncSession,
+    product_ids: Collection[str],
+) -> dict[str, list[ProductAttributesEntity]]:
+    """Выбранные значения активных атрибутов, сгруппированные по атрибуту."""
+    a, v, link = _attributes, _values, _value_links
+    stmt = (
+        select(
+            link.c.product_id,
+            v.c.id, v.c.attribute_id, v.c.name, v.c.slug, v.c.sort_order, v.c.is_active,
+            a.c.code.label("attribute_code"),
+            a.c.name.label("attribute_name"),
+            a.c.description.label("attribute_description"),
+            a.c.sort_order.label("attribute_sort_order"),
+            a.c.is_active.label("attribute_is_active"),
+            a.c.created_at.label("attribute_created_at"),
+            a.c.kind.label("attribute_kind"),
+            a.c.ui_hint.label("attribute_ui_hint"),
+        )
+        .select_from(
+            link
+            .join(v, v.c.id == link.c.attribute_value_id)
+            .join(a, a.c.id == v.c.attribute_id)
+        )
+        .where(
+            _id_in(product_ids, link.c.product_id),
+            v.c.is_active.is_(True),
+            a.c.is_active.is_(True),
+        )
+        # тот же порядок, что у map_product_selected_attributes
+        .order_by(a.c.sort_order, a.c.code, a.c.id, v.c.sort_order, v.c.id)
+    )
+    rows = (await session.execute(stmt)).all()
+    return {
+        product_id: map_attribute_rows_to_entities(group)
+        for product_id, group in _group_by_product(rows).items()
+    }
+
+
+class ProductCoreRepository(ProductRepository):
+    """
+    Список и карточки продуктов из строк-кортежей, без ORM-объектов.
+
+    Фильтры, сортировка и пагинация — общие с базовым классом.
+    """
+
+    async def _fetch_list_page(
+        self,
+        query: ProductListQuery,
+        filters: list[ColumnElement[bool]],
+        sort_keys: list[tuple[ColumnElement, bool]],
+    ) -> tuple[list[ProductEntity], list[tuple], int | None]:
+        columns = self._list_columns(query)
+        keys_start = len(columns)
+        stmt = self._paginate(
+            select(*columns, *self._sort_columns(sort_keys)).where(*filters),
+            query,
+            sort_keys,
+        )
+        rows = (await self.session.execute(stmt)).all()
+        if not rows:
+            return [], [], None
+
+        items = await self._map_list_rows(rows, query)
+        keys = [tuple(row[keys_start:keys_start + len(sort_keys)]) for row in rows]
+        return items, keys, None
+
+    async def _map_list_rows(
+        self,
+        rows: Sequence[Any],
+        query: ProductListQuery | None = None,
+    ) -> list[ProductEntity]:
+        product_ids = [row.id for row in rows]
+        # Связи, не нужные ответу, — без запроса
+        variants = (
+            await load_variants(self.session, product_ids)
+            if query is None or query.with_variants else {}
+        )
+        images = (
+            await load_images(self.session, product_ids)
+            if query is None or query.with_images else {}
+        )
+        return [
+            map_product_row_to_entity(row, variants.get(row.id, []), images.get(row.id, []))
+            for row in rows
+        ]
+
+    async def stream_products(self, batch_size: int) -> AsyncIterator[list[ProductEntity]]:
+        stmt = (
+            select(*_LIST_COLUMNS)
+            .where(_products.c.is_active.is_(True))
+            .order_by(_products.c.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.session.stream(stmt)
+        async for rows in result.partitions():
+            yield await self._map_list_rows(rows)
+
+    async def get_details(self, product_ids: Collection[str]) -> list[ProductDetailEntity]:
+        if not product_ids:
+            return []
+        stmt = select(*_DETAIL_COLUMNS).where(
+            _id_in(product_ids, _products.c.id), _products.c.is_active.is_(True)
+        )
+        rows = (await self.session.execute(stmt)).all()
+        if not rows:
+            return []
+
+        found = [row.id for row in rows]
+        variants = await load_variants(self.session, found)
+        brew_profiles = await load_brew_profiles(self.session, found)
+        attributes = await load_attributes(self.session, found)
+        images = await load_images(self.session, found)
+
+        return [
+            map_product_detail_row_to_entity(
+                row,
+                variants.get(row.id, []),
+                brew_profiles.get(row.id, []),
+                attributes.get(row.id, []),
+                images.get(row.id, []),
+            )
+            for row in rows
+        ]
+
+    async def get_with_variants(self, product_id: str) -> ProductDetailEntity | None:
+        details = await self.get_details([product_id])
+        return details[0] if details else None
@@ -0,0 +1,119 @@
+from sqlalchemy import ColumnElement, Text, cast, func, literal_column, select, type_coerce
+from sqlalchemy.dialects.postgresql import JSON, aggregate_order_by
+
+from leaf_flow.application.dto.catalog import ProductListQuery
+from leaf_flow.domain.entities.product import ProductEntity
+from leaf_flow.infrastructure.db.mappers.product_rows import map_product_json_row_to_entity
+from leaf_flow.infrastructure.db.models.product import (
+    Product, ProductVariant, ProductImage, ProductImageVariant
+)
+from leaf_flow.infrastructure.db.repositories.product import ProductRepository
+
+_EMPTY_JSON_ARRAY = literal_column("'[]'::json")
+_NO_ROWS = type_coerce(_EMPTY_JSON_ARRAY, JSON)
+
+
+def _json_array(obj: ColumnElement, *order_by: ColumnElement) -> ColumnElement:
+    return func.coalesce(func.json_agg(aggregate_order_by(obj, *order_by)), _EMPTY_JSON_ARRAY)
+
+
+def _variants_json() -> ColumnElement:
+    v = ProductVariant
+    obj = func.json_build_object(
+        "id", v.id,
+        "product_id", v.product_id,
+        "weight", v.weight,
+        "price", cast(v.price, Text),
+        "is_active", v.is_active,
+        "created_at", v.created_at,
+        "updated_at", v.updated_at,
+        "sort_order", v.sort_order,
+    )
+    # тот же порядок, что у map_product_model_to_entity
+    return type_coerce(
+        select(_json_array(obj, v.sort_order, v.weight, v.id))
+        .where(v.product_id == Product.id, v.is_active.is_(True))
+        .correlate(Product)
+        .scalar_subquery(),
+        JSON,
+    )
+
+
+def _images_json() -> ColumnElement:
+    i, iv = ProductImage, ProductImageVariant
+    image_variants = (
+        select(
+            _json_array(
+                func.json_build_object(
+                    "id", iv.id,
+                    "product_image_id", iv.product_image_id,
+                    "variant", iv.variant,
+                    "format", iv.format,
+                    "storage_key", iv.storage_key,
+                    "width", iv.width,
+                    "height", iv.height,
+                    "byte_size", iv.byte_size,
+                ),
+                iv.id,
+            )
+        )
+        .where(iv.product_image_id == i.id)
+        .correlate(i)
+        .scalar_subquery()
+    )
+    obj = func.json_build_object(
+        "id", i.id,
+        "product_id", i.product_id,
+        "title", i.title,
+        "image_url", i.image_url,
+        "is_active", i.is_active,
+        "sort_order", i.sort_order,
+        "srcset", i.srcset,
+        "variants", image_variants,
+    )
+    return type_coerce(
+        select(_json_array(obj, i.sort_order, i.id))
+        .where(i.product_id == Product.id, i.is_active.is_(True))
+        .correlate(Product)
+        .scalar_subquery(),
+        JSON,
+    )
+
+
+class ProductJsonAggRepository(ProductRepository):
+    """
+    Список продуктов одним запросом.
+
+    Варианты и изображения собираются в JSON коррелированными подзапросами
+    в списке SELECT — они вычисляются только для строк, прошедших LIMIT.
+    В режиме offset total считается оконной функцией в том же запросе.
+    """
+
+    async def _fetch_list_page(
+        self,
+        query: ProductListQuery,
+        filters: list[ColumnElement[bool]],
+        sort_keys: list[tuple[ColumnElement, bool]],
+    ) -> tuple[list[ProductEntity], list[tuple], int | None]:
+        # В режиме keyset окно посчитало бы только строки после курсора
+        window_total = query.with_total and query.after is None
+
+        columns = [
+            *self._list_columns(query),
+            # Ненужная связь — пустой массив вместо подзапроса
+            (_variants_json() if query.with_variants else _NO_ROWS).label("variants"),
+            (_images_json() if query.with_images else _NO_ROWS).label("images"),
+        ]
+        keys_start = len(columns)
+        columns += self._sort_columns(sort_keys)
+        if window_total:
+            columns.append(func.count().over().label("total"))
+
+        stmt = self._paginate(select(*columns).where(*filters), query, sort_keys)
+        rows = (await self.session.execute(stmt)).all()
+
+        # Пустая страница (offset за концом выборки) total не несёт — его
+        # досчитает базовый класс отдельным запросом
+        total = rows[0].total if window_total and rows else None
+        keys = [tuple(row[keys_start:keys_start + len(sort_keys)]) for row in rows]
+        return [map_product_json_row_to_entity(row) for row in rows], keys, total
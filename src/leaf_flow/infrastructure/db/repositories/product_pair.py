@@ -0,0 +1,112 @@
+from itertools import batched
+from typing import AsyncIterator, Collection, Mapping, Sequence
+
+from sqlalchemy import select, delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from leaf_flow.application.dto.catalog import ProductPairScore
+from leaf_flow.application.ports.product_pair import ProductPairReader, ProductPairWriter
+from leaf_flow.infrastructure.db.catalog_changes import mark_documents_changed
+from leaf_flow.infrastructure.db.models.catalog import ProductPair
+from leaf_flow.infrastructure.db.models.order import Order, OrderItem, OrderStatusEnum
+from leaf_flow.infrastructure.db.repositories.base import Repository
+
+# Строк в одном INSERT при перестройке
+_INSERT_BATCH_SIZE = 5000
+
+
+class ProductPairReaderRepository(Repository[ProductPair], ProductPairReader):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, ProductPair)
+
+    async def list_paired(self, product_id: str, limit: int) -> list[str]:
+        # Чтение по префиксу первичного ключа (product_id, rank)
+        stmt = (
+            select(ProductPair.paired_product_id)
+            .where(ProductPair.product_id == product_id)
+            .order_by(ProductPair.rank)
+            .limit(limit)
+        )
+        return list((await self.session.execute(stmt)).scalars().all())
+
+    async def get_many(
+        self,
+        product_ids: Collection[str],
+        limit: int
+    ) -> dict[str, list[ProductPairScore]]:
+        if not product_ids:
+            return {}
+        stmt = (
+            select(
+                ProductPair.product_id, ProductPair.paired_product_id,
+                ProductPair.support, ProductPair.confidence, ProductPair.lift,
+            )
+            .where(
+                ProductPair.product_id.in_(list(product_ids)),
+                ProductPair.rank < limit,
+            )
+            .order_by(ProductPair.product_id, ProductPair.rank)
+        )
+        pairs: dict[str, list[ProductPairScore]] = {}
+        for product_id, paired_id, support, confidence, lift in await self.session.execute(stmt):
+            pairs.setdefault(product_id, []).append(
+                ProductPairScore(
+                    product_id=paired_id, support=support, confidence=confidence, lift=lift
+                )
+            )
+        return pairs
+
+    async def stream_baskets(self, batch_size: int) -> AsyncIterator[list[list[str]]]:
+        stmt = (
+            select(OrderItem.order_id, OrderItem.product_id)
+            .join(OrderItem.order)
+            .where(Order.status != OrderStatusEnum.cancelled)
+            # строки одного заказа должны идти подряд
+            .order_by(OrderItem.order_id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.session.stream(stmt)
+        order_id: str | None = None
+        basket: list[str] = []
+        async for rows in result.partitions():
+            baskets: list[list[str]] = []
+            for row_order_id, product_id in rows:
+                if row_order_id != order_id:
+                    if basket:
+                        baskets.append(basket)
+                    order_id, basket = row_order_id, []
+                basket.append(product_id)
+            # последняя корзина пачки может продолжиться в следующей
+            yield baskets
+        if basket:
+            yield [basket]
+
+
+class ProductPairWriterRepository(Repository[ProductPair], ProductPairWriter):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, ProductPair)
+
+    async def replace_all(self, pairs: Mapping[str, Sequence[ProductPairScore]]) -> int:
+        previous = (
+            await self.session.execute(select(ProductPair.product_id).distinct())
+        ).scalars().all()
+        await self.session.execute(delete(ProductPair))
+
+        rows = [
+            {
+                "product_id": product_id,
+                "rank": rank,
+                "paired_product_id": pair.product_id,
+                "support": pair.support,
+                "confidence": pair.confidence,
+                "lift": pair.lift,
+            }
+            for product_id, paired in pairs.items()
+            for rank, pair in enumerate(paired)
+        ]
+        for batch in batched(rows, _INSERT_BATCH_SIZE):
+            await self.session.execute(insert(ProductPair), list(batch))
+
+        # Списки закэшированы в ответах API вместе с карточками
+        mark_documents_changed(self.session, *previous, *pairs)
+        return len(rows)
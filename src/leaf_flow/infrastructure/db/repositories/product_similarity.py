@@ -0,0 +1,109 @@
+from typing import Collection, Mapping, Sequence
+
+from sqlalchemy import select, delete, func, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from leaf_flow.application.dto.catalog import ProductFeatures, ProductNeighbour
+from leaf_flow.application.ports.product_similarity import (
+    ProductSimilarityReader, ProductSimilarityWriter
+)
+from leaf_flow.infrastructure.db.catalog_changes import mark_documents_changed
+from leaf_flow.infrastructure.db.models.catalog import ProductSimilarity
+from leaf_flow.infrastructure.db.models.product import (
+    Product, ProductAttribute, ProductAttributeValue, ProductAttributeValueLink
+)
+from leaf_flow.infrastructure.db.repositories.base import Repository
+
+
+class ProductSimilarityReaderRepository(
+    Repository[ProductSimilarity], ProductSimilarityReader
+):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, ProductSimilarity)
+
+    async def list_similar(self, product_id: str, limit: int) -> list[str]:
+        # Чтение по префиксу первичного ключа (product_id, rank)
+        stmt = (
+            select(ProductSimilarity.similar_product_id)
+            .where(ProductSimilarity.product_id == product_id)
+            .order_by(ProductSimilarity.rank)
+            .limit(limit)
+        )
+        return list((await self.session.execute(stmt)).scalars().all())
+
+    async def list_features(self) -> Sequence[ProductFeatures]:
+        active_values = (
+            select(
+                ProductAttributeValueLink.product_id,
+                ProductAttributeValueLink.attribute_value_id,
+            )
+            .join(
+                ProductAttributeValue,
+                ProductAttributeValue.id == ProductAttributeValueLink.attribute_value_id
+            )
+            .join(ProductAttributeValue.attribute)
+            .where(
+                ProductAttribute.is_active.is_(True),
+                ProductAttributeValue.is_active.is_(True),
+            )
+            .subquery()
+        )
+        value_ids = func.array_remove(func.array_agg(active_values.c.attribute_value_id), None)
+        stmt = (
+            select(Product.id, Product.tags, value_ids)
+            .outerjoin(active_values, active_values.c.product_id == Product.id)
+            .where(Product.is_active.is_(True))
+            .group_by(Product.id)
+        )
+        rows = (await self.session.execute(stmt)).all()
+        return [
+            ProductFeatures(
+                product_id=product_id,
+                attribute_value_ids=frozenset(values or ()),
+                tags=frozenset(tags or ()),
+            )
+            for product_id, tags, values in rows
+        ]
+
+    async def list_product_ids(self) -> set[str]:
+        stmt = select(ProductSimilarity.product_id).distinct()
+        return set((await self.session.execute(stmt)).scalars().all())
+
+    async def list_referencing(self, product_ids: Collection[str]) -> set[str]:
+        if not product_ids:
+            return set()
+        stmt = (
+            select(ProductSimilarity.product_id)
+            .where(ProductSimilarity.similar_product_id.in_(list(product_ids)))
+            .distinct()
+        )
+        return set((await self.session.execute(stmt)).scalars().all())
+
+
+class ProductSimilarityWriterRepository(
+    Repository[ProductSimilarity], ProductSimilarityWriter
+):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, ProductSimilarity)
+
+    async def replace(self, neighbours: Mapping[str, Sequence[ProductNeighbour]]) -> None:
+        if not neighbours:
+            return
+        await self.session.execute(
+            delete(ProductSimilarity)
+            .where(ProductSimilarity.product_id.in_(list(neighbours)))
+        )
+        rows = [
+            {
+                "product_id": product_id,
+                "rank": rank,
+                "similar_product_id": neighbour.product_id,
+                "score": neighbour.score,
+            }
+            for product_id, similar in neighbours.items()
+            for rank, neighbour in enumerate(similar)
+        ]
+        if rows:
+            await self.session.execute(insert(ProductSimilarity), rows)
+        # Списки похожих закэшированы в ответах API вместе с карточками
+        mark_documents_changed(self.session, *neighbours)
@@ -0,0 +1,80 @@
+from typing import Sequence
+
+from sqlalchemy import ColumnElement, case, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from leaf_flow.application.dto.catalog import ProductStatsDelta
+from leaf_flow.application.ports.popularity import ProductStatsWriter
+from leaf_flow.infrastructure.db.models.catalog import ProductStats
+from leaf_flow.infrastructure.db.models.product import Product
+from leaf_flow.infrastructure.db.repositories.base import Repository
+
+
+def _log_add_exp(a: ColumnElement, b: ColumnElement) -> ColumnElement:
+    """ln(e^a + e^b) без переполнения; NULL — нулевая оценка."""
+    # exp(-x) при x > ~745 в PostgreSQL — ошибка underflow, а не 0
+    tail = func.ln(1 + func.exp(-func.least(func.abs(a - b), 700)))
+    return case(
+        (a.is_(None), b),
+        (b.is_(None), a),
+        else_=func.greatest(a, b) + tail,
+    )
+
+
+class ProductStatsWriterRepository(Repository[ProductStats], ProductStatsWriter):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, ProductStats)
+
+    async def apply(self, deltas: Sequence[ProductStatsDelta]) -> None:
+        if not deltas:
+            return
+        # Продукт мог быть удалён, пока события ждали сброса
+        existing = set(
+            (
+                await self.session.execute(
+                    select(Product.id).where(
+                        Product.id.in_([delta.product_id for delta in deltas])
+                    )
+                )
+            ).scalars().all()
+        )
+        rows = [
+            {
+                "product_id": delta.product_id,
+                "views": delta.views,
+                "add_to_carts": delta.add_to_carts,
+                "visitors": delta.visitors,
+                "popularity": delta.popularity,
+            }
+            for delta in deltas
+            if delta.product_id in existing
+        ]
+        if not rows:
+            return
+
+        stmt = insert(ProductStats).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ProductStats.product_id],
+            set_={
+                "views": ProductStats.views + stmt.excluded.views,
+                "add_to_carts": ProductStats.add_to_carts + stmt.excluded.add_to_carts,
+                "visitors": ProductStats.visitors + stmt.excluded.visitors,
+                "popularity": _log_add_exp(ProductStats.popularity, stmt.excluded.popularity),
+                "updated_at": func.now(),
+            },
+        )
+        await self.session.execute(stmt)
+
+        # Копия в products — под индекс сортировки popular; updated_at
+        # продукта не трогаем: это не изменение карточки
+        await self.session.execute(
+            update(Product)
+            .where(
+                Product.id == ProductStats.product_id,
+                Product.id.in_(sorted(existing)),
+                Product.popularity.is_distinct_from(ProductStats.popularity),
+            )
+            .values(popularity=ProductStats.popularity, updated_at=Product.updated_at)
+            .execution_options(synchronize_session=False)
+        )
@@ -1,12 +1,22 @@
 from dataclasses import dataclass
+from typing import AsyncIterator
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from leaf_flow.application.ports.order import OrderWriter, OrderReader
 from leaf_flow.infrastructure.db.repositories.user import UserReaderRepository, UserWriterRepository
 from leaf_flow.infrastructure.db.repositories.product import ProductRepository
+from leaf_flow.infrastructure.db.repositories.product_json import ProductJsonAggRepository
+from leaf_flow.infrastructure.db.repositories.product_core import ProductCoreRepository
 from leaf_flow.infrastructure.db.repositories.category import CategoryReaderRepository
-from leaf_flow.infrastructure.db.repositories.cart import CartWriterRepository, CartReaderRepository
+from leaf_flow.infrastructure.db.repositories.cart import (
+    CartWriterRepository, CartReaderRepository, NullCartSynchronizer
+)
 from leaf_flow.infrastructure.db.repositories.order import OrderWriterRepository, OrderReaderRepository
+from leaf_flow.infrastructure.db.repositories.cart_core import CartCoreReaderRepository
+from leaf_flow.infrastructure.db.repositories.order_core import OrderCoreReaderRepository
+from leaf_flow.infrastructure.db.repositories.cart_cached import CartCachedReaderRepository
+from leaf_flow.infrastructure.db.repositories.order_cached import OrderCachedReaderRepository
 from leaf_flow.infrastructure.db.repositories.token import (
     RefreshTokenReaderRepository, RefreshTokenWriterRepository
 )
@@ -19,6 +29,8 @@ from leaf_flow.infrastructure.db.repositories.outbox import (
 )
 from leaf_flow.application.ports.product import ProductsReader
 from leaf_flow.application.ports.cart import CartWriter, CartReader
+from leaf_flow.application.ports.cart_sync import CartSynchronizer
+from leaf_flow.application.ports.product_display import ProductDisplayReader
 from leaf_flow.application.ports.category import CategoryReader
 from leaf_flow.application.ports.review import ExternalReviewReader
 from leaf_flow.application.ports.auth import RefreshTokenReader, RefreshTokenWriter
@@ -26,11 +38,93 @@ from leaf_flow.application.ports.user import UserReader, UserWriter
 from leaf_flow.application.ports.support_topic import SupportTopicReader, SupportTopicWriter
 from leaf_flow.application.ports.outbox import OutboxWriter, OutboxReader
 from leaf_flow.application.ports.image import ImageReader, ImageWriter
+from leaf_flow.application.ports.catalog_cache import CatalogCache
+from leaf_flow.application.ports.catalog_document import (
+    CatalogDocumentReader, CatalogDocumentWriter
+)
+from leaf_flow.infrastructure.db.repositories.catalog_document import (
+    CatalogDocumentReaderRepository, CatalogDocumentWriterRepository
+)
+from leaf_flow.application.ports.catalog_index import (
+    CatalogIndexReader, FacetIndex, SynonymIndex
+)
+from leaf_flow.infrastructure.db.repositories.catalog_index import CatalogIndexReaderRepository
+from leaf_flow.application.ports.catalog_change_log import (
+    CatalogChangeLogReader, CatalogChangeLogWriter
+)
+from leaf_flow.infrastructure.db.repositories.catalog_change_log import (
+    CatalogChangeLogReaderRepository, CatalogChangeLogWriterRepository
+)
+from leaf_flow.application.ports.product_similarity import (
+    ProductSimilarityReader, ProductSimilarityWriter
+)
+from leaf_flow.infrastructure.db.repositories.product_similarity import (
+    ProductSimilarityReaderRepository, ProductSimilarityWriterRepository
+)
+from leaf_flow.application.ports.product_pair import ProductPairReader, ProductPairWriter
+from leaf_flow.infrastructure.db.repositories.product_pair import (
+    ProductPairReaderRepository, ProductPairWriterRepository
+)
+from leaf_flow.application.ports.popularity import ProductStatsWriter
+from leaf_flow.infrastructure.db.repositories.product_stats import ProductStatsWriterRepository
 from leaf_flow.infrastructure.db.repositories.admin.image import (
     ImageReaderRepository, ImageWriterRepository
 )
 from leaf_flow.infrastructure.db.session import AsyncSessionLocal
+from leaf_flow.config import settings
+from leaf_flow.infrastructure.db.catalog_changes import (
+    pop_changed_products, pop_changed_documents
+)
+from leaf_flow.domain.events.catalog import CatalogProductsChangedEvent
+from leaf_flow.infrastructure.cache.catalog import catalog_cache
+from leaf_flow.infrastructure.cache.product_display import (
+    CachedProductDisplayReader, product_display_cache
+)
+from leaf_flow.infrastructure.cache.cart import (
+    RedisCartReader, RedisCartSynchronizer, RedisCartWriter, redis_cart_store
+)
+from leaf_flow.infrastructure.catalog.facets import facet_index
+from leaf_flow.infrastructure.catalog.synonyms import synonym_index
+
+
 
+_PRODUCT_READERS: dict[str, type[ProductRepository]] = {
+    "orm": ProductRepository,
+    "json_agg": ProductJsonAggRepository,
+    "core": ProductCoreRepository,
+}
+_CART_READERS: dict[str, type[CartReaderRepository]] = {
+    "orm": CartReaderRepository,
+    "core": CartCoreReaderRepository,
+}
+_ORDER_READERS: dict[str, type[OrderReaderRepository]] = {
+    "orm": OrderReaderRepository,
+    "core": OrderCoreReaderRepository,
+}
+
+
+def _cart_repositories(
+    s: AsyncSession,
+    displays: ProductDisplayReader,
+) -> tuple[CartWriter, CartReader, CartSynchronizer]:
+    if settings.CART_STORE == "redis":
+        return (
+            RedisCartWriter(s, redis_cart_store),
+            RedisCartReader(s, redis_cart_store, displays),
+            RedisCartSynchronizer(s, redis_cart_store),
+        )
+    reader: CartReader
+    if settings.CART_READER == "cached":
+        reader = CartCachedReaderRepository(s, displays)
+    else:
+        reader = _CART_READERS[settings.CART_READER](s)
+    return CartWriterRepository(s), reader, NullCartSynchronizer()
+
+
+def _order_reader(s: AsyncSession, displays: ProductDisplayReader) -> OrderReader:
+    if settings.ORDER_READER == "cached":
+        return OrderCachedReaderRepository(s, displays)
+    return _ORDER_READERS[settings.ORDER_READER](s)
 
 
 @dataclass
@@ -42,6 +136,8 @@ class UoW:
     categories_reader: CategoryReader
     carts_writer: CartWriter
     carts_reader: CartReader
+    cart_sync: CartSynchronizer
+    product_display: ProductDisplayReader
     orders_writer: OrderWriter
     orders_reader: OrderReader
     outbox_writer: OutboxWriter
@@ -53,23 +149,58 @@ class UoW:
     external_reviews_reader: ExternalReviewReader
     images_reader: ImageReader
     images_writer: ImageWriter
-    async def flush(self): await self.session.flush()
-    async def commit(self): await self.session.commit()
-    async def rollback(self): await self.session.rollback()
+    catalog_cache: CatalogCache
+    catalog_index_reader: CatalogIndexReader
+    facet_index: FacetIndex
+    synonym_index: SynonymIndex
+    catalog_documents_reader: CatalogDocumentReader
+    catalog_documents_writer: CatalogDocumentWriter
+    catalog_changes_reader: CatalogChangeLogReader
+    catalog_changes_writer: CatalogChangeLogWriter
+    product_similarity_reader: ProductSimilarityReader
+    product_similarity_writer: ProductSimilarityWriter
+    product_pairs_reader: ProductPairReader
+    product_pairs_writer: ProductPairWriter
+    product_stats_writer: ProductStatsWriter
+
+    async def flush(self) -> None: await self.session.flush()
+
+    async def commit(self) -> None:
+        changed_products = pop_changed_products(self.session)
+        changed_documents = pop_changed_documents(self.session)
+        if changed_products:
+            event = CatalogProductsChangedEvent(tuple(sorted(changed_products)))
+            await self.outbox_writer.add_message(
+                event_type="catalog.products_changed",
+                payload=event.to_payload(),
+            )
+            await self.catalog_changes_writer.record(changed_products)
+        await self.session.commit()
+        if changed_products or changed_documents:
+            await self.catalog_cache.invalidate(changed_products | changed_documents)
+
+    async def rollback(self) -> None:
+        pop_changed_products(self.session)
+        pop_changed_documents(self.session)
+        await self.session.rollback()
 
 
-async def get_uow():
+async def get_uow() -> AsyncIterator[UoW]:
     async with AsyncSessionLocal() as s:
+        product_display = CachedProductDisplayReader(s, product_display_cache)
+        carts_writer, carts_reader, cart_sync = _cart_repositories(s, product_display)
         yield UoW(
             session=s,
             users_reader=UserReaderRepository(s),
             users_writer=UserWriterRepository(s),
-            products=ProductRepository(s),
+            products=_PRODUCT_READERS[settings.CATALOG_READER](s),
             categories_reader=CategoryReaderRepository(s),
-            carts_writer=CartWriterRepository(s),
-            carts_reader=CartReaderRepository(s),
+            carts_writer=carts_writer,
+            carts_reader=carts_reader,
+            cart_sync=cart_sync,
+            product_display=product_display,
             orders_writer=OrderWriterRepository(s),
-            orders_reader=OrderReaderRepository(s),
+            orders_reader=_order_reader(s, product_display),
             outbox_writer=OutboxWriterRepository(s),
             outbox_reader=OutboxReaderRepository(s),
             refresh_tokens_reader=RefreshTokenReaderRepository(s),
@@ -79,4 +210,17 @@ async def get_uow():
             external_reviews_reader=ExternalReviewReaderRepository(s),
             images_reader=ImageReaderRepository(s),
             images_writer=ImageWriterRepository(s),
+            catalog_cache=catalog_cache,
+            catalog_index_reader=CatalogIndexReaderRepository(s),
+            facet_index=facet_index,
+            synonym_index=synonym_index,
+            catalog_documents_reader=CatalogDocumentReaderRepository(s),
+            catalog_documents_writer=CatalogDocumentWriterRepository(s),
+            catalog_changes_reader=CatalogChangeLogReaderRepository(s),
+            catalog_changes_writer=CatalogChangeLogWriterRepository(s),
+            product_similarity_reader=ProductSimilarityReaderRepository(s),
+            product_similarity_writer=ProductSimilarityWriterRepository(s),
+            product_pairs_reader=ProductPairReaderRepository(s),
+            product_pairs_writer=ProductPairWriterRepository(s),
+            product_stats_writer=ProductStatsWriterRepository(s),
         )
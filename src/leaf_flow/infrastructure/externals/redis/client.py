@@ -0,0 +1,30 @@
+from redis.asyncio import Redis
+
+from leaf_flow.config import settings
+
+
+_redis: Redis | None = None
+
+
+def create_redis() -> Redis:
+    """Новый клиент Redis с настройками приложения."""
+    return Redis(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        db=0,
+        socket_timeout=5,
+        socket_connect_timeout=5,
+        health_check_interval=30,
+        # decode_responses=True,
+    )
+
+
+def set_redis(client: Redis | None) -> None:
+    """Зарегистрировать общий клиент Redis процесса (вызывается при старте процесса)."""
+    global _redis
+    _redis = client
+
+
+def get_redis() -> Redis | None:
+    """Клиент Redis процесса или None, если он не инициализирован."""
+    return _redis
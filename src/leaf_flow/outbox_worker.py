@@ -8,6 +8,7 @@ import asyncio
 import logging
 
 from leaf_flow.config import settings
+from leaf_flow.infrastructure.externals.redis.client import create_redis, set_redis
 from leaf_flow.infrastructure.outbox.processor import OutboxProcessor
 from leaf_flow.application.events.factory import EventHandlerFactory
 
@@ -15,6 +16,18 @@ from leaf_flow.application.events.factory import EventHandlerFactory
 import leaf_flow.services.notification  # noqa: F401
 
 
+async def run(processor: OutboxProcessor) -> None:
+    # Redis нужен, чтобы после перестройки read-модели каталога
+    # сбросить кэш каталога во всех воркерах API
+    redis = create_redis()
+    set_redis(redis)
+    try:
+        await processor.run()
+    finally:
+        set_redis(None)
+        await redis.aclose()
+
+
 def main() -> None:
     logging.basicConfig(
         level=getattr(logging, settings.OUTBOX_LOG_LEVEL),
@@ -28,7 +41,7 @@ def main() -> None:
         poll_interval=settings.OUTBOX_POLL_INTERVAL
     )
 
-    asyncio.run(processor.run())
+    asyncio.run(run(processor))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,46 @@
+"""
+Сброс счётчиков популярности из Redis в product_stats.
+
+Запуск (в одном экземпляре):
+    python -m leaf_flow.popularity_worker
+"""
+import asyncio
+import logging
+
+from leaf_flow.config import settings
+from leaf_flow.infrastructure.cache.popularity import popularity_counters
+from leaf_flow.infrastructure.db.uow import get_uow
+from leaf_flow.infrastructure.externals.redis.client import create_redis, set_redis
+from leaf_flow.services import popularity_service
+
+logger = logging.getLogger("leaf_flow.popularity_worker")
+
+
+async def run() -> None:
+    redis = create_redis()
+    set_redis(redis)
+    try:
+        while True:
+            try:
+                async for uow in get_uow():
+                    flushed = await popularity_service.flush_counters(uow, popularity_counters)
+                    if flushed:
+                        logger.info(f"Product stats flushed: {flushed} rows")
+            except Exception as e:
+                logger.exception(f"Popularity flush failed: {e}")
+            await asyncio.sleep(settings.POPULARITY_FLUSH_INTERVAL)
+    finally:
+        set_redis(None)
+        await redis.aclose()
+
+
+def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
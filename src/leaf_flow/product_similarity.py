@@ -0,0 +1,50 @@
+"""
+Пересчёт похожих продуктов (product_similarities).
+
+Запуск:
+    python -m leaf_flow.product_similarity rebuild   # все активные продукты
+
+Списки изменившихся продуктов пересчитывает обработчик события
+catalog.products_changed; полный пересчёт нужен после первого деплоя,
+правок атрибутов и тегов в обход админского API и смены настроек.
+"""
+import argparse
+import asyncio
+import logging
+
+from leaf_flow.infrastructure.db.uow import get_uow
+from leaf_flow.infrastructure.externals.redis.client import create_redis, set_redis
+from leaf_flow.services import similarity_service
+
+logger = logging.getLogger("leaf_flow.product_similarity")
+
+
+async def rebuild(batch_size: int) -> None:
+    # Redis нужен, чтобы сбросить кэш каталога во всех воркерах API
+    redis = create_redis()
+    set_redis(redis)
+    try:
+        async for uow in get_uow():
+            built = await similarity_service.rebuild_all_similar(uow, batch_size)
+            logger.info(f"Similar products rebuilt: {built}")
+    finally:
+        set_redis(None)
+        await redis.aclose()
+
+
+def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+
+    parser = argparse.ArgumentParser(prog="python -m leaf_flow.product_similarity")
+    parser.add_argument("--batch-size", type=int, default=500)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("rebuild", help="Пересчитать списки всех активных продуктов")
+
+    asyncio.run(rebuild(parser.parse_args().batch_size))
+
+
+if __name__ == "__main__":
+    main()
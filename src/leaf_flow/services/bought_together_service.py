@@ -0,0 +1,46 @@
+"""
+«С этим покупают»: пары продуктов из истории заказов.
+
+Все неотменённые заказы читаются потоком и сворачиваются в разреженную
+матрицу совместных покупок (CooccurrenceCounter), после чего в
+product_pairs записывается top-K пар на продукт. Чтение пар — один
+запрос по первичному ключу.
+"""
+import logging
+
+from leaf_flow.application.dto.catalog import ProductListQuery
+from leaf_flow.config import settings
+from leaf_flow.infrastructure.catalog.cooccurrence import CooccurrenceCounter
+from leaf_flow.infrastructure.db.uow import UoW
+
+logger = logging.getLogger(__name__)
+
+
+async def rebuild_pairs(uow: UoW, batch_size: int = 10_000) -> int:
+    """Пересчитать пары по всем заказам и закоммитить; возвращает число пар."""
+    counter = CooccurrenceCounter(max_pairs=settings.BOUGHT_TOGETHER_MAX_PAIRS)
+    async for baskets in uow.product_pairs_reader.stream_baskets(batch_size):
+        for basket in baskets:
+            counter.add(basket)
+
+    if counter.pruned_below:
+        logger.warning(
+            f"Co-occurrence pairs pruned: counts may be understated by up to "
+            f"{counter.pruned_below} (min support {settings.BOUGHT_TOGETHER_MIN_SUPPORT})"
+        )
+
+    # Рекомендуем только то, что можно купить
+    active = await uow.products.get_list_product_ids(ProductListQuery())
+    pairs = counter.top_pairs(
+        settings.BOUGHT_TOGETHER_K,
+        min_support=settings.BOUGHT_TOGETHER_MIN_SUPPORT,
+        allowed=active,
+    )
+    written = await uow.product_pairs_writer.replace_all(pairs)
+    await uow.commit()
+
+    logger.info(
+        f"Bought-together pairs rebuilt: baskets={counter.baskets}, "
+        f"unique pairs={counter.pairs}, products={len(pairs)}, rows={written}"
+    )
+    return written
@@ -1,7 +1,11 @@
 from decimal import Decimal
 
+from leaf_flow.config import settings
 from leaf_flow.infrastructure.db.uow import UoW
-from leaf_flow.domain.entities.cart import CartDetailEntity, CartEntity
+from leaf_flow.domain.entities.cart import CartDetailEntity, CartEntity, CartItemEntity
+from leaf_flow.domain.entities.product import ProductEntity
+from leaf_flow.infrastructure.db.mappers.cart import map_cart_lines_to_detail
+from leaf_flow.services import catalog_service
 
 
 async def _get_or_create_cart(user_id: int, uow: UoW) -> CartEntity:
@@ -13,6 +17,15 @@ async def _get_or_create_cart(user_id: int, uow: UoW) -> CartEntity:
     return cart
 
 
+async def _cart_detail(lines: list[CartItemEntity], uow: UoW) -> CartDetailEntity:
+    """
+    Ответ на изменение корзины: позиции, которые вернула запись,
+    и данные продуктов из общего кэша — без перечитывания корзины.
+    """
+    displays = await uow.product_display.get_many({line.product_id for line in lines})
+    return map_cart_lines_to_detail(lines, displays)
+
+
 async def get_cart(user_id: int, uow: UoW) -> CartDetailEntity:
     cart = await uow.carts_reader.get_cart_by_user(user_id)
 
@@ -23,6 +36,25 @@ async def get_cart(user_id: int, uow: UoW) -> CartDetailEntity:
     return await uow.carts_reader.get_cart(cart.id)
 
 
+async def get_suggestions(user_id: int, uow: UoW, limit: int) -> list[ProductEntity]:
+    """
+    «Добавьте к заказу»: продукты, которые чаще всего покупают вместе
+    с содержимым корзины. Связи с несколькими позициями складываются.
+    """
+    cart = await uow.carts_reader.get_cart_items_by_user(user_id)
+    in_cart = {item.product_id for item in cart.items}
+    pairs = await uow.product_pairs_reader.get_many(in_cart, settings.BOUGHT_TOGETHER_K)
+
+    scores: dict[str, float] = {}
+    for paired in pairs.values():
+        for pair in paired:
+            if pair.product_id not in in_cart:
+                scores[pair.product_id] = scores.get(pair.product_id, 0.0) + pair.confidence
+
+    best = sorted(scores, key=lambda product_id: (-scores[product_id], product_id))
+    return await catalog_service.list_products_by_ids(uow, best[:limit])
+
+
 async def clear_cart(user_id: int, uow: UoW):
     cart = await _get_or_create_cart(user_id, uow)
     await uow.carts_writer.clear(cart.id)
@@ -42,7 +74,7 @@ async def add_item(
     if not variant:
         raise ValueError("VARIANT_NOT_FOUND")
 
-    await uow.carts_writer.upsert_item(
+    lines = await uow.carts_writer.upsert_item(
         cart.id,
         product_id,
         variant_id,
@@ -50,7 +82,7 @@ async def add_item(
         variant.price
     )
     await uow.commit()
-    return await uow.carts_reader.get_cart(cart.id)
+    return await _cart_detail(lines, uow)
 
 
 async def replace_items(
@@ -81,9 +113,9 @@ async def replace_items(
             )
         )
 
-    await uow.carts_writer.replace_items(cart.id, prepared)
+    lines = await uow.carts_writer.replace_items(cart.id, prepared)
     await uow.commit()
-    return await uow.carts_reader.get_cart(cart.id)
+    return await _cart_detail(lines, uow)
 
 
 async def set_quantity(
@@ -99,20 +131,20 @@ async def set_quantity(
         raise ValueError("INVALID_QUANTITY")
 
     if quantity == 0:
-        await uow.carts_writer.remove_item(
+        lines = await uow.carts_writer.remove_item(
             cart.id, product_id, variant_id
         )
 
     else:
-        item = await uow.carts_writer.set_quantity(
+        lines = await uow.carts_writer.set_quantity(
             cart.id, product_id, variant_id, quantity
         )
 
-        if not item:
+        if lines is None:
             raise ValueError("ITEM_NOT_FOUND")
 
     await uow.commit()
-    return await uow.carts_reader.get_cart(cart.id)
+    return await _cart_detail(lines, uow)
 
 
 async def remove_item(
@@ -124,12 +156,12 @@ async def remove_item(
     cart = await uow.carts_reader.get_cart_by_user(user_id)
 
     if not cart:
-        cart = await uow.carts_writer.create_cart(user_id)
+        await uow.carts_writer.create_cart(user_id)
         await uow.commit()
-        return await uow.carts_reader.get_cart(cart.id)
+        return await _cart_detail([], uow)
 
-    await uow.carts_writer.remove_item(
+    lines = await uow.carts_writer.remove_item(
         cart.id, product_id, variant_id
     )
     await uow.commit()
-    return await uow.carts_reader.get_cart(cart.id)
+    return await _cart_detail(lines, uow)
@@ -0,0 +1,60 @@
+"""
+Read-модель каталога: документы карточек продуктов.
+
+Документ — это ProductDetailEntity в том виде, в каком его собирает
+ProductsReader.get_details (только активные варианты, изображения,
+атрибуты и профили заваривания в нужном порядке). Продукты, которых
+нет среди активных, из read-модели удаляются.
+"""
+from itertools import batched
+from typing import Collection
+
+from leaf_flow.application.dto.catalog import CatalogDocumentsReport, ProductListQuery
+from leaf_flow.infrastructure.db.uow import UoW
+
+
+async def rebuild_documents(uow: UoW, product_ids: Collection[str]) -> int:
+    """Перестроить документы указанных продуктов (без коммита)."""
+    products = await uow.products.get_details(product_ids)
+    await uow.catalog_documents_writer.upsert(products)
+
+    inactive = set(product_ids) - {product.id for product in products}
+    await uow.catalog_documents_writer.delete(inactive)
+    return len(products)
+
+
+async def rebuild_all_documents(uow: UoW, batch_size: int = 200) -> int:
+    """Полностью перестроить read-модель, коммитя пачками."""
+    product_ids = await uow.products.get_list_product_ids(ProductListQuery())
+    built = 0
+
+    for batch in batched(product_ids, batch_size):
+        built += await rebuild_documents(uow, batch)
+        await uow.commit()
+
+    orphaned = await uow.catalog_documents_reader.list_product_ids() - set(product_ids)
+    await uow.catalog_documents_writer.delete(orphaned)
+    await uow.commit()
+    return built
+
+
+async def check_documents(uow: UoW, batch_size: int = 200) -> CatalogDocumentsReport:
+    """Сверить документы со свежей сборкой из основных таблиц."""
+    product_ids = set(await uow.products.get_list_product_ids(ProductListQuery()))
+    document_ids = await uow.catalog_documents_reader.list_product_ids()
+    stale: list[str] = []
+
+    for batch in batched(sorted(product_ids & document_ids), batch_size):
+        documents = await uow.catalog_documents_reader.get_many(batch)
+        for product in await uow.products.get_details(batch):
+            # Продукт мог измениться между запросами — такое расхождение
+            # исправит обработчик события, но в отчёт оно тоже попадёт
+            if documents.get(product.id) != product:
+                stale.append(product.id)
+
+    return CatalogDocumentsReport(
+        checked=len(product_ids | document_ids),
+        missing=sorted(product_ids - document_ids),
+        orphaned=sorted(document_ids - product_ids),
+        stale=sorted(stale),
+    )
@@ -1,23 +1,282 @@
-from typing import Sequence
+import base64
+import binascii
+import json
+from dataclasses import astuple, replace
+from typing import AsyncIterator, Sequence, TypeVar
 
+from leaf_flow.application.dto.catalog import (
+    CatalogChanges, ProductListQuery, ProductPage, ProductSort
+)
+from leaf_flow.config import settings
 from leaf_flow.domain.entities.category import CategoryEntity
 from leaf_flow.infrastructure.db.uow import UoW
-from leaf_flow.domain.entities.product import ProductEntity
+from leaf_flow.domain.entities.product import ProductDetailEntity, ProductEntity
+from leaf_flow.infrastructure.catalog.image_variants import fit_image
+from leaf_flow.services.popularity_service import popularity_version
+
+_P = TypeVar("_P", ProductEntity, ProductDetailEntity)
+
+
+def _cache_key(namespace: str, *parts: object) -> str:
+    # default=str — для Decimal (цены в фильтрах и ключах курсора)
+    return f"{namespace}:{json.dumps(parts, ensure_ascii=False, default=str)}"
+
+
+def encode_cursor(sort: ProductSort, after: tuple) -> str:
+    """Упаковать сортировку и её ключ в непрозрачный токен курсора."""
+    raw = json.dumps(
+        [sort, *after], ensure_ascii=False, separators=(",", ":"), default=str
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: ProductSort) -> tuple | None:
+    """
+    Распаковать токен курсора.
+
+    Пустая строка означает первую страницу в режиме курсора.
+
+    Raises:
+        ValueError: INVALID_CURSOR, если токен повреждён
+            или выдан для другой сортировки.
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        decoded = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("INVALID_CURSOR")
+    if not isinstance(decoded, list) or len(decoded) < 2 or decoded[0] != sort:
+        raise ValueError("INVALID_CURSOR")
+    after = decoded[1:]
+    if not all(v is None or isinstance(v, (str, int, float)) for v in after):
+        raise ValueError("INVALID_CURSOR")
+    return tuple(after)
+
+
+def parse_attribute_filters(values: Sequence[str]) -> tuple[tuple[str, str], ...]:
+    """
+    Разобрать фильтры вида code:slug.
+
+    Raises:
+        ValueError: INVALID_ATTRIBUTE_FILTER, если формат нарушен.
+    """
+    filters = []
+    for value in values:
+        code, _, slug = value.partition(":")
+        if not code or not slug:
+            raise ValueError("INVALID_ATTRIBUTE_FILTER")
+        filters.append((code, slug))
+    return tuple(filters)
+
+
+def parse_product_ids(raw: str) -> tuple[str, ...]:
+    """
+    Разобрать список id через запятую: без пустых и повторов, в исходном порядке.
+
+    Raises:
+        ValueError: EMPTY_PRODUCT_IDS, если id не передано;
+            TOO_MANY_PRODUCT_IDS, если их больше CATALOG_BATCH_MAX_IDS.
+    """
+    product_ids = tuple(dict.fromkeys(filter(None, (i.strip() for i in raw.split(",")))))
+    if not product_ids:
+        raise ValueError("EMPTY_PRODUCT_IDS")
+    if len(product_ids) > settings.CATALOG_BATCH_MAX_IDS:
+        raise ValueError("TOO_MANY_PRODUCT_IDS")
+    return product_ids
 
 
 async def list_categories(uow: UoW) -> Sequence[CategoryEntity]:
     return await uow.categories_reader.list_categories()
 
 
-async def list_products(
+async def list_products(uow: UoW, query: ProductListQuery) -> ProductPage:
+    query = replace(query, attributes=tuple(sorted(set(query.attributes))))
+    uses_index = bool(query.attributes or query.search) or query.with_facets
+    # Индексы догоняют поколение кэша с задержкой: их поколения входят
+    # в ключ, чтобы не закэшировать ответ по отставшему индексу;
+    # популярность меняется без смены поколения — её версия тоже в ключе
+    key = _cache_key(
+        "products:list",
+        *astuple(query),
+        uow.facet_index.generation if uses_index else None,
+        uow.synonym_index.generation if uses_index else None,
+        popularity_version() if query.sort == "popular" else None,
+    )
+    cached, generation = await uow.catalog_cache.get(key)
+
+    if cached is not None:
+        return cached
+
+    product_ids = (
+        uow.facet_index.match(query.category_slug, query.attributes)
+        if query.attributes else None
+    )
+    # Значения атрибутов, названные в запросе (в т. ч. синонимами),
+    # расширяют полнотекстовый поиск
+    synonyms = uow.synonym_index.resolve(query.search) if query.search else ()
+    search_product_ids = uow.facet_index.match(None, synonyms) if synonyms else None
+
+    if product_ids is not None and not product_ids:
+        page = ProductPage(total=0 if query.with_total else None, items=[])
+    else:
+        page = await uow.products.get_list_products(
+            query, product_ids, search_product_ids
+        )
+
+    if query.with_facets:
+        # Поиск и цена в индексе фасетов не учитываются — счётчики
+        # ограничиваются id, прошедшими эти фильтры в БД
+        filtered = query.search or query.price_min is not None or query.price_max is not None
+        search_ids = (
+            await uow.products.get_list_product_ids(query, search_product_ids)
+            if filtered else None
+        )
+        page = replace(
+            page,
+            facets=uow.facet_index.facets(
+                query.category_slug, query.attributes, search_ids
+            ),
+        )
+
+    await uow.catalog_cache.set(key, page, generation)
+    return page
+
+
+async def get_product(uow: UoW, product_id: str) -> ProductDetailEntity | None:
+    key = _cache_key("products:detail", product_id)
+    cached, generation = await uow.catalog_cache.get(key)
+
+    if cached is not None:
+        return cached
+
+    product = None
+    if settings.CATALOG_DOCUMENTS_ENABLED:
+        product = await uow.catalog_documents_reader.get(product_id)
+    if product is None:
+        # Документа ещё нет (событие не обработано) или продукт неактивен
+        product = await uow.products.get_with_variants(product_id)
+
+    if product is not None:
+        await uow.catalog_cache.set(key, product, generation)
+
+    return product
+
+
+async def get_products(
+    uow: UoW,
+    product_ids: Sequence[str]
+) -> list[ProductDetailEntity]:
+    """
+    Карточки продуктов в порядке запроса; ненайденные и неактивные пропускаются.
+
+    Кэш карточек общий с get_product; промахи добираются пакетно —
+    из read-модели и затем из каталога, фиксированным числом запросов.
+    """
+    keys = {product_id: _cache_key("products:detail", product_id) for product_id in product_ids}
+    cached, generation = await uow.catalog_cache.get_many(list(keys.values()))
+    products: dict[str, ProductDetailEntity] = {
+        product_id: cached[key] for product_id, key in keys.items() if key in cached
+    }
+
+    missing = [product_id for product_id in product_ids if product_id not in products]
+    loaded: dict[str, ProductDetailEntity] = {}
+    if missing and settings.CATALOG_DOCUMENTS_ENABLED:
+        loaded.update(await uow.catalog_documents_reader.get_many(missing))
+        missing = [product_id for product_id in missing if product_id not in loaded]
+    if missing:
+        loaded.update(
+            (product.id, product) for product in await uow.products.get_details(missing)
+        )
+
+    if loaded:
+        await uow.catalog_cache.set_many(
+            {keys[product_id]: product for product_id, product in loaded.items()},
+            generation,
+        )
+        products.update(loaded)
+
+    return [products[product_id] for product_id in product_ids if product_id in products]
+
+
+def fit_images(products: Sequence[_P], width: int | None) -> list[_P]:
+    """
+    Оставить у изображений по одному варианту под ширину width (физические px).
+
+    None — без изменений. Продукты копируются: исходные могут лежать в кэше.
+    """
+    if width is None:
+        return list(products)
+    return [
+        replace(product, images=[fit_image(image, width) for image in product.images])
+        for product in products
+    ]
+
+
+async def list_products_by_ids(
+    uow: UoW,
+    product_ids: Sequence[str]
+) -> list[ProductEntity]:
+    """Активные продукты в формате списка, в порядке product_ids."""
+    if not product_ids:
+        return []
+
+    page = await uow.products.get_list_products(
+        ProductListQuery(limit=len(product_ids), with_total=False),
+        product_ids=product_ids,
+    )
+    rank = {product_id: i for i, product_id in enumerate(product_ids)}
+    return sorted(page.items, key=lambda product: rank[product.id])
+
+
+async def get_similar_products(
+    uow: UoW,
+    product_id: str,
+    limit: int
+) -> list[ProductEntity]:
+    """Похожие активные продукты в формате списка, от самого близкого."""
+    product_ids = await uow.product_similarity_reader.list_similar(product_id, limit)
+    return await list_products_by_ids(uow, product_ids)
+
+
+async def get_bought_together(
     uow: UoW,
-    category: str | None,
-    search: str | None,
-    limit: int,
-    offset: int
-) -> tuple[int, Sequence[ProductEntity]]:
-    return await uow.products.get_list_products(category, search, limit, offset)
+    product_id: str,
+    limit: int
+) -> list[ProductEntity]:
+    """Продукты, которые покупают вместе с product_id, от самой сильной связи."""
+    product_ids = await uow.product_pairs_reader.list_paired(product_id, limit)
+    return await list_products_by_ids(uow, product_ids)
+
+
+async def stream_products(uow: UoW) -> AsyncIterator[list[ProductEntity]]:
+    """
+    Весь активный каталог пачками для выгрузки.
+
+    Кэш не используется: выгрузка читает каталог целиком одним
+    серверным курсором, память не растёт с размером каталога.
+    """
+    async for batch in uow.products.stream_products(settings.CATALOG_EXPORT_BATCH_SIZE):
+        yield batch
+
 
+async def get_changes(uow: UoW, since: int, limit: int) -> CatalogChanges:
+    """
+    Продукты, изменённые после версии since, с актуальными карточками.
 
-async def get_product(uow: UoW, product_id: str) -> ProductEntity | None:
-    return await uow.products.get_with_variants(product_id)
+    Карточки читаются из основных таблиц, минуя кэш и read-модель:
+    документ может отставать от журнала на время обработки outbox,
+    а клиент хранит полученное до следующего изменения.
+    """
+    page = await uow.catalog_changes_reader.list_since(since, limit)
+    products = {
+        product.id: product
+        for product in await uow.products.get_details(page.product_ids)
+    }
+    return CatalogChanges(
+        version=page.version,
+        has_more=page.has_more,
+        upserted=[products[pid] for pid in page.product_ids if pid in products],
+        deleted=[pid for pid in page.product_ids if pid not in products],
+    )
@@ -1,3 +1,4 @@
 # Импорт для регистрации обработчиков
 from leaf_flow.services.notification import order_handlers  # noqa: F401
 from leaf_flow.services.notification import image_handlers  # noqa: F401
+from leaf_flow.services.notification import catalog_handlers  # noqa: F401
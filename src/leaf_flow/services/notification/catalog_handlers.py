@@ -0,0 +1,37 @@
+"""
+Обработчики событий каталога.
+
+Перестраивают документы read-модели каталога и списки похожих
+для изменившихся продуктов.
+"""
+import logging
+from typing import Any
+
+from leaf_flow.application.events.base import EventHandler
+from leaf_flow.application.events.factory import EventHandlerFactory
+from leaf_flow.domain.events.catalog import CatalogProductsChangedEvent
+from leaf_flow.services import catalog_document_service, similarity_service
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogProductsChangedHandler(EventHandler):
+    """Обработчик события catalog.products_changed."""
+
+    async def handle(self, payload: dict[str, Any]) -> None:
+        event = CatalogProductsChangedEvent.from_payload(payload)
+
+        built = await catalog_document_service.rebuild_documents(
+            self._uow, event.product_ids
+        )
+
+        similar = await similarity_service.rebuild_similar(self._uow, event.product_ids)
+
+        logger.info(
+            f"Rebuilt catalog documents: {built} of {len(event.product_ids)} products active, "
+            f"similar products lists: {similar}"
+        )
+
+
+# Регистрация обработчика
+EventHandlerFactory.register("catalog.products_changed", CatalogProductsChangedHandler)
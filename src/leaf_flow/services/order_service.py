@@ -52,6 +52,8 @@ async def create_order(
     uow: UoW
 ) -> OrderEntity:
     """Создание заказа."""
+    # Корзина из Redis записывается в БД в транзакции заказа
+    await uow.cart_sync.sync(user_id)
     cart = await get_cart(user_id, uow)
     if not cart.items:
         raise ValueError("CART_EMPTY")
@@ -67,7 +69,6 @@ async def create_order(
         address=address,
         comment=comment
     )
-    await clear_cart(user_id, uow)
 
     if not order:
         raise ValueError("ORDER_NOT_FOUND")
@@ -85,11 +86,14 @@ async def create_order(
     )
     
     await uow.commit()
+    # Корзина очищается только после коммита заказа: корзина в Redis
+    # (CART_STORE=redis) не откатывается вместе с транзакцией
+    await clear_cart(user_id, uow)
     return order
 
 
-async def get_order(order_id: str, uow: UoW) -> OrderEntity | None:
-    order = await uow.orders_reader.get_order_with_items(order_id)
+async def get_order(order_id: str, uow: UoW, with_items: bool = True) -> OrderEntity | None:
+    order = await uow.orders_reader.get_order_with_items(order_id, with_items)
 
     if not order:
         return None
@@ -101,12 +105,14 @@ async def list_orders_for_user(
     user_id: int,
     limit: int,
     offset: int,
-    uow: UoW
+    uow: UoW,
+    with_items: bool = True
 ) -> Sequence[OrderEntity]:
     orders = await uow.orders_reader.list_orders_by_user(
         user_id=user_id,
         limit=limit,
-        offset=offset
+        offset=offset,
+        with_items=with_items
     )
     return orders
 
@@ -0,0 +1,64 @@
+"""
+Популярность продуктов: сброс счётчиков из Redis в product_stats.
+
+Вклад интервала — уникальные посетители плюс добавления в корзину
+с весом POPULARITY_CART_WEIGHT (сырые просмотры только сохраняются:
+один посетитель не должен раскручивать продукт обновлением страницы).
+Оценка затухает с периодом полураспада POPULARITY_HALF_LIFE_DAYS и
+хранится в лог-шкале относительно фиксированной эпохи, поэтому старые
+оценки не нужно пересчитывать по мере старения.
+"""
+import logging
+import math
+import time
+from dataclasses import replace
+from datetime import datetime, timezone
+
+from leaf_flow.application.dto.catalog import ProductStatsDelta
+from leaf_flow.application.ports.popularity import PopularityCounters
+from leaf_flow.config import settings
+from leaf_flow.infrastructure.db.uow import UoW
+
+logger = logging.getLogger(__name__)
+
+_EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc).timestamp()
+
+
+def _log_score(delta: ProductStatsDelta, at: float) -> float | None:
+    weight = delta.visitors + settings.POPULARITY_CART_WEIGHT * delta.add_to_carts
+    if weight <= 0:
+        return None
+    tau = settings.POPULARITY_HALF_LIFE_DAYS * 86400 / math.log(2)
+    return math.log(weight) + (at - _EPOCH) / tau
+
+
+def popularity_version() -> int:
+    """
+    Версия порядка sort=popular для ключей кэша — номер интервала сброса.
+
+    Сброс переписывает products.popularity, не меняя поколение каталога,
+    поэтому страницы popular живут в кэше не дольше одного интервала.
+    """
+    return int(time.time() // settings.POPULARITY_FLUSH_INTERVAL)
+
+
+async def flush_counters(uow: UoW, counters: PopularityCounters) -> int:
+    """
+    Перенести закрытые бакеты в БД, коммитя по бакету; возвращает число строк.
+
+    Бакет удаляется из Redis после коммита: если удаление не удалось,
+    бакет будет учтён повторно (at-least-once).
+    """
+    flushed = 0
+    for bucket in await counters.closed_buckets():
+        at = counters.bucket_started_at(bucket)
+        deltas = [
+            replace(delta, popularity=_log_score(delta, at))
+            for delta in await counters.read_bucket(bucket)
+        ]
+        await uow.product_stats_writer.apply(deltas)
+        await uow.commit()
+        await counters.delete_bucket(bucket, [delta.product_id for delta in deltas])
+        flushed += len(deltas)
+        logger.debug(f"Popularity bucket {bucket} flushed: {len(deltas)} products")
+    return flushed
@@ -0,0 +1,50 @@
+"""
+Похожие продукты («С этим чаем смотрят»).
+
+Списки соседей считаются по всему каталогу (SimilarityModel) и хранятся
+в product_similarities; чтение — один запрос по первичному ключу.
+При изменении продуктов пересчитываются только затронутые списки:
+самих изменённых продуктов, тех, у кого они были в соседях, и тех,
+с кем у них теперь есть общие признаки.
+"""
+from itertools import batched
+from typing import Collection
+
+from leaf_flow.config import settings
+from leaf_flow.infrastructure.catalog.similarity import SimilarityModel
+from leaf_flow.infrastructure.db.uow import UoW
+
+
+async def rebuild_similar(uow: UoW, product_ids: Collection[str]) -> int:
+    """Пересчитать списки, затронутые изменением product_ids (без коммита)."""
+    features = await uow.product_similarity_reader.list_features()
+    model = SimilarityModel(features, settings.SIMILAR_PRODUCTS_TAG_WEIGHT)
+
+    targets = (
+        set(product_ids)
+        | await uow.product_similarity_reader.list_referencing(product_ids)
+        | model.related(product_ids)
+    )
+    # Неактивные и удалённые из product_ids получат пустой список
+    await uow.product_similarity_writer.replace(
+        model.neighbours(targets, settings.SIMILAR_PRODUCTS_K)
+    )
+    return len(targets)
+
+
+async def rebuild_all_similar(uow: UoW, batch_size: int = 500) -> int:
+    """Пересчитать списки всех активных продуктов, коммитя пачками."""
+    features = await uow.product_similarity_reader.list_features()
+    model = SimilarityModel(features, settings.SIMILAR_PRODUCTS_TAG_WEIGHT)
+
+    for batch in batched(model.product_ids, batch_size):
+        await uow.product_similarity_writer.replace(
+            model.neighbours(batch, settings.SIMILAR_PRODUCTS_K)
+        )
+        await uow.commit()
+
+    # Списки неактивных продуктов: самих продуктов в модели нет
+    stale = await uow.product_similarity_reader.list_product_ids() - set(model.product_ids)
+    await uow.product_similarity_writer.replace({product_id: [] for product_id in stale})
+    await uow.commit()
+    return len(model.product_ids)